@@ -0,0 +1,163 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+import typed_input
+from typed_input import (
+  DateTimeSpec,
+  DecimalSpec,
+  InputEventKind,
+  IntSpec,
+  decimal_input,
+  int_input,
+  validate_file,
+)
+
+
+class AllowedValuesTest(unittest.TestCase):
+  def test_intervals_merged_and_sorted(self):
+    spec = IntSpec(allowed=[(8000, 8080), 443, (8070, 8100), (1, 1023)])
+    self.assertEqual(spec.allowed, ((1, 1023), (8000, 8100)))
+    self.assertIsNone(IntSpec().allowed)
+
+  def test_values_in_intervals_accepted(self):
+    spec = IntSpec(allowed=[(1, 1023), (8000, 8100)])
+    for user_input, value in (('1', 1), ('443', 443), ('8100', 8100)):
+      with self.subTest(user_input=user_input):
+        self.assertEqual(spec.parse(user_input), value)
+
+  def test_error_reports_nearest_range(self):
+    spec = IntSpec(allowed=[(1, 1023), (8000, 8100)])
+    for user_input, nearest in (
+      ('0', '1 to 1023'),
+      ('1500', '1 to 1023'),
+      ('5000', '8000 to 8100'),
+      ('9000', '8000 to 8100'),
+    ):
+      with self.subTest(user_input=user_input):
+        with self.assertRaises(ValueError) as context:
+          spec.parse(user_input)
+        self.assertEqual(
+          str(context.exception),
+          'Error: Value is not allowed. '
+          f'The nearest allowed range is {nearest}.',
+        )
+
+  def test_set_of_values(self):
+    spec = IntSpec(allowed={22, 80, 443})
+    self.assertEqual(spec.parse('80'), 80)
+    with self.assertRaises(ValueError) as context:
+      spec.parse('500')
+    self.assertEqual(
+      str(context.exception),
+      'Error: Value is not allowed. The nearest allowed value is 443.',
+    )
+
+  def test_combined_with_min_and_max_value(self):
+    spec = IntSpec(min_value=10, allowed=[(0, 20)])
+    with self.assertRaises(ValueError) as context:
+      spec.parse('5')
+    self.assertEqual(
+      str(context.exception), 'Error: Value must be at least 10.'
+    )
+    self.assertEqual(spec.parse('15'), 15)
+
+  def test_many_intervals(self):
+    spec = DecimalSpec(
+      allowed=[(Decimal(i), Decimal(i) + Decimal('0.5')) for i in range(5000)]
+    )
+    self.assertEqual(spec.parse('4321.25'), Decimal('4321.25'))
+    with self.assertRaises(ValueError) as context:
+      spec.parse('4321.9')
+    self.assertEqual(
+      str(context.exception),
+      'Error: Value is not allowed. The nearest allowed range is 4322 to '
+      '4322.5.',
+    )
+
+  def test_datetime_windows_normalized_to_timezone(self):
+    spec = DateTimeSpec(
+      tz=timezone.utc,
+      allowed=[(datetime(2024, 1, 1, 4), datetime(2024, 1, 1, 6))],
+    )
+    self.assertEqual(
+      spec.parse('2024-01-01T07:00+02:00'),
+      datetime(2024, 1, 1, 5, tzinfo=timezone.utc),
+    )
+    with self.assertRaises(ValueError):
+      spec.parse('2024-01-01T05:00+02:00')
+
+  def test_invalid_configuration(self):
+    for kwargs, message in (
+      ({'allowed': []}, 'At least one allowed value or interval is required.'),
+      (
+        {'allowed': [(5, 1)]},
+        'Allowed interval (5, 1) has its start after its end.',
+      ),
+      (
+        {'allowed': [(1, 3)], 'default_value': 4},
+        '(default_value=4) is not an allowed value.',
+      ),
+    ):
+      with self.subTest(kwargs=kwargs):
+        with self.assertRaises(ValueError) as context:
+          IntSpec(**kwargs)
+        self.assertEqual(str(context.exception), message)
+
+  @mock.patch('builtins.input', side_effect=['1500', '', '8080'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_int_input(self, mock_stdout, unused_mock_input):
+    self.assertEqual(int_input(allowed=[(1, 1023), (8000, 8100)]), 8080)
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      'Error: Value is not allowed. The nearest allowed range is 1 to 1023.\n'
+      'Error: You must enter a valid integer.\n',
+    )
+
+  def test_decimal_input_default_value(self):
+    value = decimal_input(
+      default_value=Decimal('9.99'),
+      allowed=[(Decimal('0.99'), Decimal('9.99'))],
+      stdin=io.StringIO('\n'),
+      stdout=io.StringIO(),
+    )
+    self.assertEqual(value, Decimal('9.99'))
+
+  def test_typed_input_registered_type(self):
+    value = typed_input.typed_input(
+      timedelta,
+      allowed=[(timedelta(0), timedelta(hours=1))],
+      stdin=io.StringIO('2:00:00\n0:30:00\n'),
+      stdout=io.StringIO(),
+    )
+    self.assertEqual(value, timedelta(minutes=30))
+
+  def test_hooks_report_allowed_bound(self):
+    events = []
+    typed_input.add_input_hook(events.append)
+    self.addCleanup(typed_input.remove_input_hook, events.append)
+    int_input(allowed=[1, 2], stdin=io.StringIO('3\n1\n'), stdout=io.StringIO())
+    bounds_events = [
+      event for event in events if event.kind is InputEventKind.BOUNDS_VIOLATED
+    ]
+    self.assertEqual([event.bound for event in bounds_events], ['allowed'])
+
+  def test_validate_file(self):
+    with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'ports.txt')
+      with open(path, 'wb') as f:
+        f.write(b'22\n80\n8080\n')
+      result = validate_file(path, int, allowed=[22, (8000, 8100)])
+    self.assertEqual(result.values, [22, 8080])
+    self.assertEqual(
+      result.errors,
+      [(2, 'Error: Value is not allowed. The nearest allowed value is 22.')],
+    )
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,168 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+  import numpy
+except ImportError:
+  numpy = None  # type: ignore[assignment]
+
+import typed_input
+from typed_input import (
+  InputEventKind,
+  SessionRecorder,
+  SessionReplayer,
+  add_input_hook,
+  float_array_input,
+  int_array_input,
+  remove_input_hook,
+)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class ArrayInputTest(unittest.TestCase):
+  @mock.patch('builtins.input', return_value='1 2 3')
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_valid_input_no_constraints(self, mock_stdout, mock_input):
+    array = int_array_input()
+    self.assertEqual(array.dtype, numpy.int64)
+    self.assertEqual(array.tolist(), [1, 2, 3])
+    mock_input.assert_called_once_with()
+    self.assertEqual(mock_stdout.getvalue().strip(), '')
+
+  @mock.patch('builtins.input', return_value='1.5, 2.5')
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_delimiter_and_prompt(self, unused_mock_stdout, mock_input):
+    array = float_array_input(prompt='Readings: ', delimiter=',')
+    self.assertEqual(array.dtype, numpy.float64)
+    self.assertEqual(array.tolist(), [1.5, 2.5])
+    mock_input.assert_called_once_with('Readings: ')
+
+  @mock.patch('builtins.input', side_effect=['1 2.5', '1 2'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_invalid_input_retry(self, mock_stdout, mock_input):
+    self.assertEqual(int_array_input().tolist(), [1, 2])
+    self.assertEqual(mock_input.call_count, 2)
+    self.assertIn(
+      'Error: You must enter a valid integer.', mock_stdout.getvalue()
+    )
+
+  @mock.patch('builtins.input', side_effect=['5 3 7', '5 12', '5 6'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_min_and_max_value_violation(self, mock_stdout, mock_input):
+    self.assertEqual(
+      int_array_input(min_value=5, max_value=10).tolist(), [5, 6]
+    )
+    self.assertEqual(mock_input.call_count, 3)
+    self.assertIn(
+      'Error: Value at position 2 must be at least 5.', mock_stdout.getvalue()
+    )
+    self.assertIn(
+      'Error: Value at position 2 must be at most 10.', mock_stdout.getvalue()
+    )
+
+  @mock.patch('builtins.input', return_value='')
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_default_value_used_when_input_empty(
+    self, unused_mock_stdout, unused_mock_input
+  ):
+    array = float_array_input(default_value=[0.0, 1.0])
+    self.assertEqual(array.dtype, numpy.float64)
+    self.assertEqual(array.tolist(), [0.0, 1.0])
+
+  @mock.patch('sys.stdin', new_callable=lambda: io.StringIO('5 3\n5 6\n'))
+  def test_prompt_and_errors_written_to_stdout(self, unused_mock_stdin):
+    stdout = io.StringIO()
+    array = int_array_input('Values: ', min_value=5, stdout=stdout)
+    self.assertEqual(array.tolist(), [5, 6])
+    self.assertEqual(
+      stdout.getvalue(),
+      'Values: Error: Value at position 2 must be at least 5.\nValues: ',
+    )
+
+  @mock.patch('builtins.input', side_effect=['1 x', '1 12', '1 2'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_hooks_receive_events(self, unused_mock_stdout, unused_mock_input):
+    events = []
+    add_input_hook(events.append)
+    self.addCleanup(remove_input_hook, events.append)
+    int_array_input('Values: ', max_value=10)
+    outcomes = [
+      (event.kind, event.bound)
+      for event in events
+      if event.kind
+      not in (InputEventKind.PROMPT_SHOWN, InputEventKind.INPUT_RECEIVED)
+    ]
+    self.assertEqual(
+      outcomes,
+      [
+        (InputEventKind.CONVERSION_FAILED, None),
+        (InputEventKind.BOUNDS_VIOLATED, 'max_value'),
+        (InputEventKind.VALUE_ACCEPTED, None),
+      ],
+    )
+    self.assertEqual(events[-1].value.tolist(), [1, 2])
+
+  @mock.patch('builtins.input', side_effect=['1 12', '1 2'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_record_and_replay(self, mock_stdout, mock_input):
+    directory = tempfile.TemporaryDirectory()
+    self.addCleanup(directory.cleanup)
+    path = os.path.join(directory.name, 'session.log')
+    with SessionRecorder(path):
+      int_array_input('Values: ', max_value=10)
+    with SessionReplayer(path, speed=None) as replayer:
+      self.assertEqual(
+        int_array_input('Values: ', max_value=10).tolist(), [1, 2]
+      )
+    self.assertEqual(mock_input.call_count, 2)
+    self.assertEqual(replayer.report().inputs, 2)
+    self.assertTrue(replayer.report().ok)
+
+  def test_stream_read_in_batches(self):
+    data = ''.join(f'{i} {i}\n\n' for i in range(100)).encode()
+    with mock.patch.object(typed_input, '_ARRAY_BATCH_SIZE', 8):
+      array = int_array_input(stdin=io.BytesIO(data))
+    self.assertEqual(array.tolist(), [i for i in range(100) for _ in range(2)])
+
+  def test_stream_invalid_value_reports_line_number(self):
+    with self.assertRaises(ValueError) as context:
+      int_array_input(stdin=io.StringIO('1 2\n3 x\n'))
+    self.assertEqual(
+      str(context.exception), 'Line 2: Error: You must enter a valid integer.'
+    )
+
+  def test_stream_bounds_violation_reports_line_number(self):
+    with self.assertRaises(ValueError) as context:
+      float_array_input(max_value=10.0, stdin=io.StringIO('1\n2\n30\n'))
+    self.assertEqual(
+      str(context.exception), 'Line 3: Error: Value must be at most 10.0.'
+    )
+
+  def test_error_raised_when_default_value_out_of_bounds(self):
+    with self.assertRaises(ValueError) as context:
+      int_array_input(min_value=2, default_value=[3, 1])
+    self.assertEqual(
+      str(context.exception), 'Default value at position 2 must be at least 2.'
+    )
+
+  def test_error_raised_when_min_value_greater_than_max_value(self):
+    with self.assertRaises(ValueError) as context:
+      int_array_input(min_value=2, max_value=1)
+    self.assertEqual(
+      str(context.exception), '(min_value=2) is greater than (max_value=1).'
+    )
+
+
+class ArrayInputWithoutNumpyTest(unittest.TestCase):
+  @mock.patch.dict('sys.modules', {'numpy': None})
+  def test_import_error_when_numpy_missing(self):
+    with self.assertRaises(ImportError) as context:
+      int_array_input()
+    self.assertIn('typed-input[numpy]', str(context.exception))
+
+
+if __name__ == '__main__':
+  unittest.main()
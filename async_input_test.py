@@ -0,0 +1,141 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from typed_input import (
+  async_datetime_input,
+  async_decimal_input,
+  async_float_input,
+  async_int_input,
+)
+
+
+def _run_with_input(coroutine_function, data: bytes, **kwargs):
+  async def main():
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return await coroutine_function(reader=reader, **kwargs)
+
+  return asyncio.run(main())
+
+
+class AsyncInputTest(unittest.TestCase):
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_valid_input_with_prompt(self, mock_stdout):
+    self.assertEqual(
+      _run_with_input(async_int_input, b'42\n', prompt='Enter an integer: '),
+      42,
+    )
+    self.assertEqual(mock_stdout.getvalue(), 'Enter an integer: ')
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_invalid_input_retry(self, mock_stdout):
+    self.assertEqual(_run_with_input(async_float_input, b'abc\n4.5\n'), 4.5)
+    self.assertIn(
+      'Error: You must enter a valid float.', mock_stdout.getvalue()
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_min_value_violation(self, mock_stdout):
+    self.assertEqual(
+      _run_with_input(async_decimal_input, b'1\r\n5\r\n', min_value=Decimal(2)),
+      Decimal(5),
+    )
+    self.assertIn('Error: Value must be at least 2.', mock_stdout.getvalue())
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_default_value_used_when_input_empty(self, unused_mock_stdout):
+    self.assertEqual(
+      _run_with_input(
+        async_datetime_input, b'\n', default_value=datetime(2023, 11, 15)
+      ),
+      datetime(2023, 11, 15),
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_eof_raises_eof_error(self, unused_mock_stdout):
+    with self.assertRaises(EOFError):
+      _run_with_input(async_int_input, b'abc\n')
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_other_tasks_run_while_waiting(self, unused_mock_stdout):
+    async def main():
+      reader = asyncio.StreamReader()
+      ticks = []
+
+      async def ticker():
+        for i in range(3):
+          ticks.append(i)
+          await asyncio.sleep(0)
+        reader.feed_data(b'7\n')
+
+      prompt = asyncio.ensure_future(async_int_input(reader=reader))
+      await ticker()
+      return await prompt, ticks
+
+    self.assertEqual(asyncio.run(main()), (7, [0, 1, 2]))
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_timeout_keeps_later_input(self, unused_mock_stdout):
+    async def main():
+      reader = asyncio.StreamReader()
+      with self.assertRaises(asyncio.TimeoutError):
+        await asyncio.wait_for(async_int_input(reader=reader), 0.01)
+      reader.feed_data(b'8\n')
+      return await async_int_input(reader=reader)
+
+    self.assertEqual(asyncio.run(main()), 8)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_reads_stdin_through_event_loop(self, unused_mock_stdout):
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, 'rb') as stdin, os.fdopen(write_fd, 'wb') as w:
+      w.write(b'1\n2\n')
+      w.flush()
+
+      async def main():
+        return await async_int_input(), await async_int_input()
+
+      with mock.patch('sys.stdin', stdin):
+        self.assertEqual(asyncio.run(main()), (1, 2))
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_stdin_left_blocking(self, unused_mock_stdout):
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd) as stdin, os.fdopen(write_fd, 'wb') as w:
+      w.write(b'1\n2\n')
+      w.flush()
+      with mock.patch('sys.stdin', stdin):
+        self.assertEqual(asyncio.run(async_int_input()), 1)
+        self.assertTrue(os.get_blocking(read_fd))
+        self.assertEqual(input(), '2')
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_reads_stdin_redirected_from_file(self, unused_mock_stdout):
+    with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'input.txt')
+      with open(path, 'w') as f:
+        f.write('x\n1.5\n2.5\n')
+
+      async def main():
+        return await async_float_input(), await async_float_input()
+
+      with open(path) as stdin, mock.patch('sys.stdin', stdin):
+        self.assertEqual(asyncio.run(main()), (1.5, 2.5))
+
+  def test_error_raised_when_min_value_greater_than_max_value(self):
+    with self.assertRaises(ValueError) as context:
+      _run_with_input(async_int_input, b'', min_value=2, max_value=1)
+    self.assertEqual(
+      str(context.exception), '(min_value=2) is greater than (max_value=1).'
+    )
+
+
+if __name__ == '__main__':
+  unittest.main()
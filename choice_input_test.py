@@ -0,0 +1,155 @@
+import io
+import unittest
+from unittest import mock
+
+import typed_input
+from typed_input import ChoiceSpec, InputEventKind, choice_input
+
+_HOSTS = ['web-01', 'web-02', 'db-01', 'cache-01']
+
+
+class ChoiceSpecTest(unittest.TestCase):
+  def test_exact_and_unique_prefix_matches(self):
+    spec = ChoiceSpec(_HOSTS)
+    self.assertEqual(spec.parse('web-02'), 'web-02')
+    self.assertEqual(spec.parse(' db '), 'db-01')
+    self.assertEqual(spec.parse('c'), 'cache-01')
+
+  def test_ambiguous_prefix(self):
+    with self.assertRaises(ValueError) as context:
+      ChoiceSpec(_HOSTS).parse('web')
+    self.assertEqual(
+      str(context.exception),
+      "Error: 'web' matches more than one option: web-01, web-02.",
+    )
+
+  def test_ambiguous_prefix_lists_first_matches(self):
+    spec = ChoiceSpec(f'host-{i:03d}' for i in range(100))
+    with self.assertRaises(ValueError) as context:
+      spec.parse('host-0')
+    self.assertEqual(
+      str(context.exception),
+      "Error: 'host-0' matches more than one option: "
+      'host-000, host-001, host-002, host-003, host-004, ...',
+    )
+
+  def test_no_match(self):
+    for spec, user_input in (
+      (ChoiceSpec(_HOSTS), 'mail'),
+      (ChoiceSpec(_HOSTS), ''),
+      (ChoiceSpec(_HOSTS), 'zzz'),
+      (ChoiceSpec(_HOSTS, prefixes=False), 'db'),
+      (ChoiceSpec(_HOSTS), 'WEB-01'),
+    ):
+      with self.subTest(user_input=user_input):
+        with self.assertRaises(ValueError) as context:
+          spec.parse(user_input)
+        self.assertEqual(
+          str(context.exception), 'Error: You must enter a valid option.'
+        )
+
+  def test_case_insensitive(self):
+    spec = ChoiceSpec(['Web-01', 'DB-01'], case_sensitive=False)
+    self.assertEqual(spec.parse('WEB-01'), 'Web-01')
+    self.assertEqual(spec.parse('db'), 'DB-01')
+
+  def test_default_value(self):
+    spec = ChoiceSpec(_HOSTS, default_value='DB-01', case_sensitive=False)
+    self.assertEqual(spec.default_value, 'db-01')
+    self.assertEqual(spec.parse('  '), 'db-01')
+
+  def test_complete(self):
+    spec = ChoiceSpec(_HOSTS)
+    self.assertEqual(
+      [spec.complete('web', state) for state in range(3)],
+      ['web-01', 'web-02', None],
+    )
+    self.assertEqual(spec.complete('x', 0), None)
+    self.assertEqual(spec.complete('', 4), None)
+
+  def test_options_and_repr(self):
+    spec = ChoiceSpec(['b', 'a', 'b'])
+    self.assertEqual(spec.options, ('a', 'b'))
+    self.assertEqual(repr(spec), 'ChoiceSpec(<2 options>, default_value=None)')
+
+  def test_invalid_configuration(self):
+    for kwargs, message in (
+      ({'options': []}, 'At least one option is required.'),
+      (
+        {'options': ['a', 'A'], 'case_sensitive': False},
+        "Options 'a' and 'A' differ only in case.",
+      ),
+      (
+        {'options': ['a'], 'default_value': 'b'},
+        "(default_value='b') is not an option.",
+      ),
+    ):
+      with self.subTest(kwargs=kwargs):
+        with self.assertRaises(ValueError) as context:
+          ChoiceSpec(**kwargs)
+        self.assertEqual(str(context.exception), message)
+
+  def test_ambiguous_prefix_reported_as_conversion_failure(self):
+    events = []
+    typed_input.add_input_hook(events.append)
+    self.addCleanup(typed_input.remove_input_hook, events.append)
+    choice_input(
+      _HOSTS, stdin=io.StringIO('web\nweb-01\n'), stdout=io.StringIO()
+    )
+    self.assertIn(
+      InputEventKind.CONVERSION_FAILED, [event.kind for event in events]
+    )
+    self.assertNotIn(
+      InputEventKind.BOUNDS_VIOLATED, [event.kind for event in events]
+    )
+
+
+class ChoiceInputTest(unittest.TestCase):
+  @mock.patch('builtins.input', side_effect=['mail', 'web', 'web-02'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_retries_until_option_entered(self, mock_stdout, mock_input):
+    self.assertEqual(choice_input(_HOSTS, 'Host: '), 'web-02')
+    mock_input.assert_called_with('Host: ')
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      'Error: You must enter a valid option.\n'
+      "Error: 'web' matches more than one option: web-01, web-02.\n",
+    )
+
+  def test_streams_and_prebuilt_spec(self):
+    spec = ChoiceSpec(_HOSTS, default_value='db-01')
+    stdout = io.StringIO()
+    self.assertEqual(
+      choice_input(spec, 'Host: ', stdin=io.StringIO('\n'), stdout=stdout),
+      'db-01',
+    )
+    self.assertEqual(stdout.getvalue(), 'Host: ')
+
+  @mock.patch('builtins.input', return_value='db')
+  @mock.patch('sys.stdin', mock.Mock(isatty=lambda: True))
+  def test_tab_completion_installed_on_terminal(self, unused_mock_input):
+    readline = mock.Mock(__doc__='GNU readline')
+    readline.get_completer.return_value = 'previous'
+    readline.get_completer_delims.return_value = ' -'
+    completers = []
+    readline.set_completer.side_effect = completers.append
+    with mock.patch.dict('sys.modules', readline=readline):
+      self.assertEqual(choice_input(_HOSTS), 'db-01')
+    self.assertEqual(completers[0]('cache', 0), 'cache-01')
+    self.assertEqual(completers[1], 'previous')
+    readline.parse_and_bind.assert_called_once_with('tab: complete')
+    readline.set_completer_delims.assert_called_with(' -')
+
+  @mock.patch('builtins.input', return_value='db')
+  @mock.patch('sys.stdin', new_callable=io.StringIO)
+  def test_no_tab_completion_when_not_a_terminal(
+    self, unused_mock_stdin, unused_mock_input
+  ):
+    readline = mock.Mock()
+    with mock.patch.dict('sys.modules', readline=readline):
+      self.assertEqual(choice_input(_HOSTS), 'db-01')
+    readline.set_completer.assert_not_called()
+
+
+if __name__ == '__main__':
+  unittest.main()
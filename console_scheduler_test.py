@@ -0,0 +1,173 @@
+import io
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+import typed_input
+from typed_input import (
+  ChoiceSpec,
+  ConsoleScheduler,
+  IntSpec,
+  Validator,
+  console_scheduler,
+  int_input_future,
+)
+
+
+class ConsoleSchedulerTest(unittest.TestCase):
+  def _queue_without_worker(self, scheduler):
+    # A placeholder thread stops submit() from starting the worker, so a
+    # whole backlog can be queued and then answered by calling _run().
+    scheduler._thread = threading.Thread(target=lambda: None)
+
+  def test_backlog_answered_in_priority_then_submission_order(self):
+    stdout = io.StringIO()
+    scheduler = ConsoleScheduler(io.StringIO('a\nb\nc\nd\n'), stdout)
+    self._queue_without_worker(scheduler)
+    spec = ChoiceSpec(['a', 'b', 'c', 'd'])
+    futures = {
+      name: scheduler.submit(spec, f'{name}: ', priority)
+      for name, priority in (('low', 2), ('high', 0), ('mid', 1), ('mid2', 1))
+    }
+    scheduler.close(wait=False)
+    scheduler._run()
+    self.assertEqual(
+      {name: future.result() for name, future in futures.items()},
+      {'high': 'a', 'mid': 'b', 'mid2': 'c', 'low': 'd'},
+    )
+    self.assertEqual(stdout.getvalue(), 'high: mid: mid2: low: ')
+
+  def test_retries_complete_before_next_prompt(self):
+    stdout = io.StringIO()
+    with ConsoleScheduler(io.StringIO('x\n5\n7\n'), stdout) as scheduler:
+      first = scheduler.submit(IntSpec(), 'a: ')
+      second = scheduler.submit(IntSpec(), 'b: ')
+    self.assertEqual((first.result(), second.result()), (5, 7))
+    self.assertEqual(
+      stdout.getvalue(),
+      'a: Error: You must enter a valid integer.\na: b: ',
+    )
+
+  def test_concurrent_submitters_each_get_one_line(self):
+    stdin = io.StringIO(''.join(f'{i}\n' for i in range(50)))
+    results = []
+    with ConsoleScheduler(stdin, io.StringIO()) as scheduler:
+      threads = [
+        threading.Thread(
+          target=lambda: results.append(scheduler.submit(IntSpec()).result())
+        )
+        for _ in range(50)
+      ]
+      for thread in threads:
+        thread.start()
+      for thread in threads:
+        thread.join()
+    self.assertEqual(sorted(results), list(range(50)))
+
+  def test_exception_set_on_future(self):
+    with ConsoleScheduler(io.StringIO('1\n'), io.StringIO()) as scheduler:
+      answered = scheduler.submit(IntSpec())
+      unanswered = scheduler.submit(IntSpec())
+    self.assertEqual(answered.result(), 1)
+    self.assertIsInstance(unanswered.exception(), EOFError)
+
+  def test_validator_error_fails_only_its_prompt(self):
+    broken = IntSpec(validators=[Validator(lambda value: 1 / 0, 'Unused.')])
+    with ConsoleScheduler(io.StringIO('1\n2\n3\n'), io.StringIO()) as scheduler:
+      failed = scheduler.submit(broken)
+      queued = scheduler.submit(IntSpec())
+      self.assertIsInstance(failed.exception(timeout=5), ZeroDivisionError)
+      later = scheduler.submit(IntSpec())
+      self.assertEqual(queued.result(timeout=5), 2)
+      self.assertEqual(later.result(timeout=5), 3)
+
+  def test_fatal_error_fails_queued_prompts_and_closes(self):
+    def exit_(unused_value):
+      raise SystemExit(1)
+
+    scheduler = ConsoleScheduler(io.StringIO('1\n2\n'), io.StringIO())
+    self._queue_without_worker(scheduler)
+    failed = scheduler.submit(IntSpec(validators=[Validator(exit_, 'x')]))
+    queued = scheduler.submit(IntSpec())
+    with self.assertRaises(SystemExit):
+      scheduler._run()
+    self.assertIsInstance(failed.exception(), SystemExit)
+    self.assertIsInstance(queued.exception(), SystemExit)
+    with self.assertRaises(RuntimeError):
+      scheduler.submit(IntSpec())
+
+  def test_cancelled_prompt_skipped(self):
+    stdout = io.StringIO()
+    scheduler = ConsoleScheduler(io.StringIO('1\n'), stdout)
+    self._queue_without_worker(scheduler)
+    cancelled = scheduler.submit(IntSpec(), 'skipped: ')
+    self.assertTrue(cancelled.cancel())
+    kept = scheduler.submit(IntSpec(), 'kept: ')
+    scheduler.close(wait=False)
+    scheduler._run()
+    self.assertEqual(kept.result(), 1)
+    self.assertEqual(stdout.getvalue(), 'kept: ')
+
+  def test_submit_after_close_raises(self):
+    scheduler = ConsoleScheduler(io.StringIO(), io.StringIO())
+    scheduler.close()
+    with self.assertRaises(RuntimeError):
+      scheduler.submit(IntSpec())
+
+  def test_close_is_idempotent_without_prompts(self):
+    scheduler = ConsoleScheduler()
+    scheduler.close()
+    scheduler.close()
+    self.assertIsNone(scheduler._thread)
+
+
+class InputFutureTest(unittest.TestCase):
+  def setUp(self):
+    patcher = mock.patch.object(typed_input, '_CONSOLE_SCHEDULER', None)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_shared_scheduler_reads_piped_stdin(self, mock_stdout):
+    with mock.patch('sys.stdin', io.StringIO('0\n42\n')):
+      future = int_input_future('n: ', min_value=1)
+      self.assertEqual(future.result(timeout=5), 42)
+      console_scheduler().close()
+    self.assertEqual(
+      mock_stdout.getvalue(), 'n: Error: Value must be at least 1.\nn: '
+    )
+
+  @unittest.skipIf(sys.platform == 'win32', 'select needs POSIX pipes.')
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_shared_scheduler_answers_timed_prompts_from_piped_stdin(
+    self, unused_mock_stdout
+  ):
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b'1\n2\n3\n')
+    os.close(write_fd)
+    stdin = os.fdopen(read_fd, encoding='utf-8')
+    self.addCleanup(stdin.close)
+    with mock.patch('sys.stdin', stdin):
+      # The untimed prompt reads the whole backlog into stdin's buffer.
+      futures = [
+        int_input_future(),
+        *(int_input_future(timeout=1) for _ in range(2)),
+      ]
+      self.assertEqual(
+        [future.result(timeout=5) for future in futures], [1, 2, 3]
+      )
+      console_scheduler().close()
+
+  def test_config_error_raised_in_caller(self):
+    with self.assertRaises(ValueError):
+      int_input_future(min_value=2, max_value=1)
+    self.assertIsNone(typed_input._CONSOLE_SCHEDULER)
+
+  def test_shared_scheduler_is_reused(self):
+    self.assertIs(console_scheduler(), console_scheduler())
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,130 @@
+import io
+import pickle
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from parameterized import parameterized
+
+from typed_input import DateTimeParser, DateTimeSpec, datetime_input
+
+_UTC_PLUS_2 = timezone(timedelta(hours=2))
+
+
+class DateTimeParserTest(unittest.TestCase):
+  @parameterized.expand(
+    [
+      ('date', '2023-11-15'),
+      ('minutes', '2023-11-15T15:30'),
+      ('seconds', '2023-11-15T15:30:59'),
+      ('space_separator', '2023-11-15 15:30:00'),
+      ('milliseconds', '2023-11-15T15:30:00.123'),
+      ('microseconds', '2023-11-15T15:30:00.123456'),
+      ('offset', '2023-11-15T15:30:00-05:00'),
+      ('utc_offset', '2023-11-15T15:30:00+00:00'),
+      ('hours_only', '2023-11-15T15'),
+      ('other_separator', '2023-11-15x15:30'),
+    ]
+  )
+  def test_matches_fromisoformat(self, unused_name, date_string):
+    parsed = DateTimeParser()(date_string)
+    expected = datetime.fromisoformat(date_string)
+    self.assertEqual(parsed, expected)
+    self.assertEqual(parsed.tzinfo, expected.tzinfo)
+
+  @parameterized.expand(
+    [
+      (
+        'z_suffix',
+        '2023-11-15T15:30:00Z',
+        datetime(2023, 11, 15, 15, 30, 0, 0, timezone.utc),
+      ),
+      (
+        'one_digit_fraction',
+        '2023-11-15T15:30:00.1',
+        datetime(2023, 11, 15, 15, 30, 0, 100000),
+      ),
+      (
+        'offset_without_seconds',
+        '2023-11-15T15:30+02:00',
+        datetime(2023, 11, 15, 15, 30, tzinfo=_UTC_PLUS_2),
+      ),
+    ]
+  )
+  def test_same_on_every_python_version(
+    self, unused_name, date_string, expected
+  ):
+    self.assertEqual(DateTimeParser()(date_string), expected)
+
+  @parameterized.expand(
+    [
+      ('empty', ''),
+      ('text', 'invalid'),
+      ('bad_month', '2023-13-15'),
+      ('bad_day', '2023-02-30'),
+      ('signed_field', '2023-+1-15'),
+      ('unicode_digits', '2023-11-1٢'),
+      ('bad_hour', '2023-11-15T24:00'),
+      ('long_fraction_garbage', '2023-11-15T15:30:00.x'),
+      ('trailing_garbage', '2023-11-15T15:30:00 UTC'),
+    ]
+  )
+  def test_invalid_input_raises_value_error(self, unused_name, date_string):
+    with self.assertRaises(ValueError):
+      DateTimeParser()(date_string)
+
+  def test_cache_info(self):
+    parser = DateTimeParser(cache_size=2)
+    for date_string in ['2023-11-15', '2023-11-15', '2023-11-16']:
+      parser(date_string)
+    info = parser.cache_info()
+    self.assertEqual((info.hits, info.misses, info.maxsize), (1, 2, 2))
+    parser.cache_clear()
+    self.assertEqual(parser.cache_info().currsize, 0)
+
+  def test_picklable(self):
+    parser = pickle.loads(pickle.dumps(DateTimeParser(cache_size=7)))
+    self.assertEqual(parser.cache_info().maxsize, 7)
+    self.assertEqual(parser('2023-11-15'), datetime(2023, 11, 15))
+
+
+class DateTimeTimezoneTest(unittest.TestCase):
+  def test_spec_normalizes_input_and_bounds(self):
+    spec = DateTimeSpec(
+      min_value=datetime(2023, 11, 15, 12, tzinfo=timezone.utc),
+      tz=_UTC_PLUS_2,
+    )
+    self.assertEqual(
+      spec.min_value, datetime(2023, 11, 15, 14, tzinfo=_UTC_PLUS_2)
+    )
+    self.assertEqual(
+      spec.parse('2023-11-15T14:00'),
+      datetime(2023, 11, 15, 14, tzinfo=_UTC_PLUS_2),
+    )
+    with self.assertRaises(ValueError):
+      spec.parse('2023-11-15T13:00:00+02:00')
+    self.assertEqual(spec.parse('2023-11-15T12:00:00Z').tzinfo, _UTC_PLUS_2)
+
+  @mock.patch(
+    'builtins.input', side_effect=['2023-11-15T10:00', '2023-11-15T13:00']
+  )
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_datetime_input_mixes_naive_input_with_aware_bounds(
+    self, mock_stdout, mock_input
+  ):
+    self.assertEqual(
+      datetime_input(
+        min_value=datetime(2023, 11, 15, 12, tzinfo=timezone.utc),
+        tz=timezone.utc,
+      ),
+      datetime(2023, 11, 15, 13, tzinfo=timezone.utc),
+    )
+    self.assertEqual(mock_input.call_count, 2)
+    self.assertIn(
+      'Error: Value must be at least 2023-11-15 12:00:00+00:00.',
+      mock_stdout.getvalue(),
+    )
+
+
+if __name__ == '__main__':
+  unittest.main()
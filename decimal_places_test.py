@@ -0,0 +1,205 @@
+import decimal
+import io
+import random
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+import typed_input
+from typed_input import (
+  DecimalSpec,
+  InputEventKind,
+  add_input_hook,
+  decimal_input,
+  remove_input_hook,
+  table_input,
+  try_parse_decimal,
+)
+
+
+class DecimalPlacesTest(unittest.TestCase):
+  def test_values_quantized_to_places(self):
+    spec = DecimalSpec(places=2)
+    self.assertEqual(repr(spec.parse('19.9')), "Decimal('19.90')")
+    self.assertEqual(repr(spec.parse(' -7 ')), "Decimal('-7.00')")
+    self.assertEqual(repr(spec.parse('.5')), "Decimal('0.50')")
+    self.assertEqual(repr(spec.parse('1E+1')), "Decimal('10.00')")
+    self.assertEqual(repr(spec.parse('-0')), "Decimal('-0.00')")
+    self.assertEqual(repr(DecimalSpec(places=0).parse('5.')), "Decimal('5')")
+
+  def test_input_with_too_many_places_rejected(self):
+    spec = DecimalSpec(places=2)
+    for user_input in ('19.999', '1234e-3', '0.001'):
+      with self.assertRaises(ValueError) as context:
+        spec.parse(user_input)
+      self.assertEqual(
+        str(context.exception),
+        'Error: Value must have at most 2 decimal places.',
+      )
+
+  def test_rounding(self):
+    half_up = DecimalSpec(places=2, rounding=decimal.ROUND_HALF_UP)
+    half_even = DecimalSpec(places=2, rounding=decimal.ROUND_HALF_EVEN)
+    down = DecimalSpec(places=0, rounding=decimal.ROUND_DOWN)
+    self.assertEqual(half_up.parse('0.125'), Decimal('0.13'))
+    self.assertEqual(half_even.parse('0.125'), Decimal('0.12'))
+    self.assertEqual(down.parse('-9.99'), Decimal(-9))
+    # Rounding happens before the bounds are checked.
+    spec = DecimalSpec(
+      Decimal('0.01'), places=2, rounding=decimal.ROUND_HALF_UP
+    )
+    self.assertEqual(spec.parse('0.005'), Decimal('0.01'))
+
+  def test_max_digits(self):
+    spec = DecimalSpec(places=2, max_digits=5)
+    self.assertEqual(spec.parse('999.99'), Decimal('999.99'))
+    self.assertEqual(spec.parse('0000.1'), Decimal('0.10'))
+    for user_input in ('1000', '1000.0', '1E+3'):
+      with self.assertRaises(ValueError) as context:
+        spec.parse(user_input)
+      self.assertEqual(
+        str(context.exception), 'Error: Value must have at most 5 digits.'
+      )
+    # A value rounded up past the limit has too many digits.
+    rounded = DecimalSpec(places=0, rounding=decimal.ROUND_UP, max_digits=2)
+    with self.assertRaises(ValueError):
+      rounded.parse('99.1')
+    self.assertEqual(DecimalSpec(max_digits=3).parse('1.23'), Decimal('1.23'))
+    with self.assertRaises(ValueError):
+      DecimalSpec(max_digits=3).parse('1.230')
+
+  def test_bounds(self):
+    spec = DecimalSpec(Decimal('0.01'), Decimal(100), places=2)
+    self.assertEqual(spec.parse('100.00'), Decimal(100))
+    with self.assertRaises(ValueError) as context:
+      spec.parse('0')
+    self.assertEqual(
+      str(context.exception), 'Error: Value must be at least 0.01.'
+    )
+    with self.assertRaises(ValueError):
+      spec.parse('100.01')
+    with self.assertRaises(ValueError):
+      spec.parse('1.0001e2')
+
+  def test_infinities_and_nans_rejected(self):
+    spec = DecimalSpec(places=2)
+    for user_input in ('Infinity', '-inf', 'NaN', 'sNaN'):
+      with self.assertRaises(ValueError) as context:
+        spec.parse(user_input)
+      self.assertEqual(
+        str(context.exception), 'Error: You must enter a valid Decimal.'
+      )
+
+  def test_ambient_context_ignored(self):
+    spec = DecimalSpec(places=2, max_digits=10)
+    with decimal.localcontext() as context:
+      context.prec = 3
+      context.rounding = decimal.ROUND_DOWN
+      context.traps[decimal.InvalidOperation] = False
+      self.assertEqual(spec.parse('12345.67'), Decimal('12345.67'))
+      self.assertEqual(spec.parse('1234567.8e0'), Decimal('1234567.80'))
+      with self.assertRaises(ValueError):
+        spec.parse('abc')
+
+  def test_default_value_quantized(self):
+    spec = DecimalSpec(default_value=Decimal('1.5'), places=2)
+    self.assertEqual(repr(spec.parse('  ')), "Decimal('1.50')")
+    self.assertEqual(spec.default_value, Decimal('1.50'))
+
+  def test_invalid_configuration(self):
+    cases = {
+      "(default_value=Decimal('1.234')) fails: Error: Value must have at "
+      'most 2 decimal places.': {
+        'default_value': Decimal('1.234'),
+        'places': 2,
+      },
+      '(places=-1) must not be negative.': {'places': -1},
+      '(max_digits=0) must be at least 1.': {'max_digits': 0},
+      'rounding requires places.': {'rounding': decimal.ROUND_UP},
+      "Unknown rounding mode: 'UP'.": {'places': 2, 'rounding': 'UP'},
+    }
+    for message, kwargs in cases.items():
+      with self.subTest(kwargs=kwargs):
+        with self.assertRaises(ValueError) as context:
+          DecimalSpec(**kwargs)
+        self.assertEqual(str(context.exception), message)
+
+  def test_plain_and_general_paths_agree(self):
+    rng = random.Random(0)
+    alphabet = '0123456789+-. '
+    user_inputs = [
+      ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 9)))
+      for _ in range(3000)
+    ]
+    for kwargs in (
+      {'places': 2},
+      {'places': 2, 'max_digits': 4, 'min_value': Decimal('-1.005')},
+      {
+        'places': 1,
+        'rounding': decimal.ROUND_HALF_UP,
+        'max_value': Decimal(50),
+      },
+      {'places': 3, 'max_digits': 2},
+    ):
+      spec = DecimalSpec(**kwargs)
+      for user_input in user_inputs:
+        # A trailing exponent of zero sends the same value down the general
+        # path, which converts with Decimal() and then quantizes.
+        general = spec._parse(f'{user_input.strip()}e0')
+        plain = spec._parse(user_input)
+        if isinstance(plain, Decimal) or plain is spec._scale_error:
+          with self.subTest(kwargs=kwargs, user_input=user_input):
+            self.assertEqual(repr(plain), repr(general))
+
+
+class DecimalPlacesFunctionsTest(unittest.TestCase):
+  def test_decimal_input(self):
+    stdout = io.StringIO()
+    value = decimal_input(
+      'Amount: ',
+      min_value=Decimal(0),
+      places=2,
+      max_digits=6,
+      stdin=io.StringIO('1.234\n12345.6\n-1\n12.3\n'),
+      stdout=stdout,
+    )
+    self.assertEqual(repr(value), "Decimal('12.30')")
+    self.assertEqual(
+      stdout.getvalue(),
+      'Amount: Error: Value must have at most 2 decimal places.\n'
+      'Amount: Error: Value must have at most 6 digits.\n'
+      'Amount: Error: Value must be at least 0.\n'
+      'Amount: ',
+    )
+
+  def test_try_parse_codes(self):
+    self.assertEqual(try_parse_decimal('1.234', places=2).code, 'places')
+    self.assertEqual(
+      try_parse_decimal('1000', places=2, max_digits=5).code, 'max_digits'
+    )
+    self.assertEqual(try_parse_decimal('1.5', places=2).value, Decimal('1.50'))
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  @mock.patch('builtins.input', side_effect=['1.234', '1'])
+  def test_hooks_report_bound(self, unused_mock_input, unused_mock_stdout):
+    events = []
+    add_input_hook(events.append)
+    self.addCleanup(remove_input_hook, events.append)
+    decimal_input(places=2)
+    violations = [
+      event for event in events if event.kind is InputEventKind.BOUNDS_VIOLATED
+    ]
+    self.assertEqual([event.bound for event in violations], ['places'])
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_table_column_uses_places(self, unused_mock_stdout):
+    with mock.patch.object(typed_input, '_ARRAY_BATCH_SIZE', 1):
+      table = table_input(
+        [('amount', Decimal, {'places': 2})], stdin=io.StringIO('1\n2.5\n')
+      )
+    self.assertEqual(list(table['amount'].data), [100, 250])
+    self.assertEqual(table['amount'][0], Decimal('1.00'))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,252 @@
+import asyncio
+import io
+import unittest
+from unittest import mock
+
+from typed_input import (
+  DecimalSpec,
+  InputEvent,
+  InputEventKind,
+  MetricsAggregator,
+  OpenTelemetryHook,
+  Validator,
+  add_input_hook,
+  async_int_input,
+  int_input,
+  remove_input_hook,
+)
+
+
+class _FakeInstrument:
+  def __init__(self):
+    self.calls = []
+
+  def add(self, amount, attributes):
+    self.calls.append((amount, attributes))
+
+  def record(self, amount, attributes):
+    self.calls.append((amount, attributes))
+
+
+class _FakeMeter:
+  def __init__(self):
+    self.instruments = {}
+
+  def create_counter(self, name, unit, description):
+    return self.instruments.setdefault(name, _FakeInstrument())
+
+  def create_histogram(self, name, unit, description):
+    return self.instruments.setdefault(name, _FakeInstrument())
+
+
+class InputHooksTest(unittest.TestCase):
+  def setUp(self):
+    self.events = []
+    add_input_hook(self.events.append)
+    self.addCleanup(remove_input_hook, self.events.append)
+
+  @mock.patch('builtins.input', side_effect=['abc', '-1', '12', '5'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_events_emitted_in_order(self, unused_mock_stdout, unused_mock_input):
+    self.assertEqual(int_input('Age: ', min_value=0, max_value=10), 5)
+    self.assertEqual(
+      [(event.kind, event.raw_input) for event in self.events],
+      [
+        (InputEventKind.PROMPT_SHOWN, None),
+        (InputEventKind.INPUT_RECEIVED, 'abc'),
+        (InputEventKind.CONVERSION_FAILED, 'abc'),
+        (InputEventKind.PROMPT_SHOWN, None),
+        (InputEventKind.INPUT_RECEIVED, '-1'),
+        (InputEventKind.BOUNDS_VIOLATED, '-1'),
+        (InputEventKind.PROMPT_SHOWN, None),
+        (InputEventKind.INPUT_RECEIVED, '12'),
+        (InputEventKind.BOUNDS_VIOLATED, '12'),
+        (InputEventKind.PROMPT_SHOWN, None),
+        (InputEventKind.INPUT_RECEIVED, '5'),
+        (InputEventKind.VALUE_ACCEPTED, '5'),
+      ],
+    )
+    self.assertTrue(all(event.prompt == 'Age: ' for event in self.events))
+    self.assertEqual(
+      [event.bound for event in self.events if event.bound],
+      ['min_value', 'max_value'],
+    )
+    self.assertEqual(
+      self.events[2].message, 'Error: You must enter a valid integer.'
+    )
+    self.assertEqual(self.events[-1].value, 5)
+    self.assertTrue(
+      all(
+        event.duration >= 0
+        for event in self.events
+        if event.kind is not InputEventKind.PROMPT_SHOWN
+      )
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_async_events(self, unused_mock_stdout):
+    async def main():
+      reader = asyncio.StreamReader()
+      reader.feed_data(b'x\n7\n')
+      return await async_int_input(reader=reader)
+
+    self.assertEqual(asyncio.run(main()), 7)
+    self.assertEqual(
+      [event.kind for event in self.events],
+      [
+        InputEventKind.PROMPT_SHOWN,
+        InputEventKind.INPUT_RECEIVED,
+        InputEventKind.CONVERSION_FAILED,
+        InputEventKind.PROMPT_SHOWN,
+        InputEventKind.INPUT_RECEIVED,
+        InputEventKind.VALUE_ACCEPTED,
+      ],
+    )
+
+  @mock.patch('builtins.input', return_value='1')
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_removed_hook_not_called(self, unused_mock_stdout, unused_mock_in):
+    remove_input_hook(self.events.append)
+    self.addCleanup(add_input_hook, self.events.append)
+    int_input()
+    self.assertEqual(self.events, [])
+
+
+class MetricsAggregatorTest(unittest.TestCase):
+  @mock.patch('builtins.input', side_effect=['abc', '-1', '5'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_report(self, unused_mock_stdout, unused_mock_input):
+    metrics = MetricsAggregator()
+    add_input_hook(metrics)
+    self.addCleanup(remove_input_hook, metrics)
+    int_input(min_value=0)
+    report = metrics.report()
+    self.assertEqual(
+      report['counters'],
+      {
+        'prompt_shown': 3,
+        'input_received': 3,
+        'conversion_failed': 1,
+        'bounds_violated': 1,
+        'value_accepted': 1,
+        'input_timed_out': 0,
+      },
+    )
+    self.assertEqual(
+      report['bounds_violated'], {'min_value': 1, 'max_value': 0}
+    )
+    self.assertEqual(report['think_time']['count'], 3)
+    self.assertEqual(report['parse_time']['count'], 3)
+    self.assertEqual(
+      sum(count for _, count in report['parse_time']['buckets']), 3
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_report_counts_other_bounds(self, unused_mock_stdout):
+    metrics = MetricsAggregator()
+    add_input_hook(metrics)
+    self.addCleanup(remove_input_hook, metrics)
+    with mock.patch('builtins.input', side_effect=['3', '1']):
+      int_input(allowed=[1, 2])
+    self.assertEqual(
+      metrics.report()['bounds_violated'],
+      {'min_value': 0, 'max_value': 0, 'allowed': 1},
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_report_counts_every_kind_of_rejection(self, unused_mock_stdout):
+    metrics = MetricsAggregator()
+    add_input_hook(metrics)
+    self.addCleanup(remove_input_hook, metrics)
+    even = Validator(lambda value: value % 2 == 0, 'Error: Must be even.')
+    with mock.patch('builtins.input', side_effect=['3', '5', '-1', '2']):
+      int_input(min_value=0, allowed=[(0, 4)], validators=[even])
+    with mock.patch('builtins.input', side_effect=['1.234', '1.23']):
+      DecimalSpec(places=2).prompt()
+    self.assertEqual(
+      metrics.report()['bounds_violated'],
+      {
+        'min_value': 1,
+        'max_value': 0,
+        'allowed': 1,
+        'validator': 1,
+        'places': 1,
+      },
+    )
+
+  def test_empty_report(self):
+    report = MetricsAggregator().report()
+    self.assertEqual(report['think_time']['count'], 0)
+    self.assertIsNone(report['think_time']['mean'])
+
+
+class OpenTelemetryHookTest(unittest.TestCase):
+  def test_records_to_meter(self):
+    meter = _FakeMeter()
+    hook = OpenTelemetryHook(meter)
+    hook(InputEvent(InputEventKind.PROMPT_SHOWN, None))
+    hook(InputEvent(InputEventKind.INPUT_RECEIVED, None, '9', duration=2.0))
+    hook(
+      InputEvent(
+        InputEventKind.BOUNDS_VIOLATED,
+        None,
+        '9',
+        bound='max_value',
+        duration=0.5,
+      )
+    )
+    self.assertEqual(
+      meter.instruments['typed_input.events'].calls,
+      [
+        (1, {'event': 'prompt_shown'}),
+        (1, {'event': 'input_received'}),
+        (1, {'event': 'bounds_violated', 'bound': 'max_value'}),
+      ],
+    )
+    self.assertEqual(
+      meter.instruments['typed_input.think_time'].calls,
+      [(2.0, {'event': 'input_received'})],
+    )
+    self.assertEqual(
+      meter.instruments['typed_input.parse_time'].calls,
+      [(0.5, {'event': 'bounds_violated', 'bound': 'max_value'})],
+    )
+
+  @mock.patch('builtins.input', return_value='3')
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_opentelemetry_sdk_in_memory_reader(
+    self, unused_mock_stdout, unused_mock_input
+  ):
+    try:
+      from opentelemetry.sdk.metrics import (  # type: ignore[import-not-found]
+        MeterProvider,
+      )
+      from opentelemetry.sdk.metrics.export import (  # type: ignore[import-not-found]
+        InMemoryMetricReader,
+      )
+    except ImportError:
+      self.skipTest('The OpenTelemetry SDK is not installed.')
+    reader = InMemoryMetricReader()
+    meter = MeterProvider(metric_readers=[reader]).get_meter('test')
+    hook = OpenTelemetryHook(meter)
+    add_input_hook(hook)
+    self.addCleanup(remove_input_hook, hook)
+    int_input()
+    metrics = reader.get_metrics_data().resource_metrics[0]
+    names = {
+      metric.name
+      for scope_metrics in metrics.scope_metrics
+      for metric in scope_metrics.metrics
+    }
+    self.assertEqual(
+      names,
+      {
+        'typed_input.events',
+        'typed_input.think_time',
+        'typed_input.parse_time',
+      },
+    )
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,159 @@
+import io
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from typed_input import DateTimeSpec, DecimalSpec, FloatSpec, IntSpec
+
+
+class InputSpecTest(unittest.TestCase):
+  def test_parse_valid_input(self):
+    self.assertEqual(IntSpec().parse('42'), 42)
+    self.assertEqual(FloatSpec().parse('4.5'), 4.5)
+    self.assertEqual(DecimalSpec().parse('1.10'), Decimal('1.10'))
+    self.assertEqual(DateTimeSpec().parse('2023-11-15'), datetime(2023, 11, 15))
+
+  def test_parse_default_value_when_input_empty(self):
+    self.assertEqual(IntSpec(default_value=5).parse('  '), 5)
+
+  def test_parse_invalid_input_raises_type_error_message(self):
+    with self.assertRaises(ValueError) as context:
+      IntSpec().parse('abc')
+    self.assertEqual(
+      str(context.exception), 'Error: You must enter a valid integer.'
+    )
+
+  def test_parse_custom_type_error_message(self):
+    with self.assertRaises(ValueError) as context:
+      FloatSpec(type_error_message='Must provide a valid weight.').parse('x')
+    self.assertEqual(str(context.exception), 'Must provide a valid weight.')
+
+  def test_parse_bounds_violations(self):
+    spec = IntSpec(min_value=0, max_value=100)
+    with self.assertRaises(ValueError) as context:
+      spec.parse('-1')
+    self.assertEqual(str(context.exception), 'Error: Value must be at least 0.')
+    with self.assertRaises(ValueError) as context:
+      spec.parse('101')
+    self.assertEqual(
+      str(context.exception), 'Error: Value must be at most 100.'
+    )
+
+  def test_parse_decimal_nan_is_invalid_with_bounds(self):
+    with self.assertRaises(ValueError) as context:
+      DecimalSpec(min_value=Decimal(0)).parse('NaN')
+    self.assertEqual(
+      str(context.exception), 'Error: You must enter a valid Decimal.'
+    )
+
+  def test_parse_many(self):
+    spec = IntSpec(min_value=0, default_value=5)
+    self.assertEqual(list(spec.parse_many(['1', '', '3'])), [1, 5, 3])
+
+  def test_parse_many_reports_line_number(self):
+    values = IntSpec(min_value=0).parse_many(['1', '2', '-3'])
+    with self.assertRaises(ValueError) as context:
+      list(values)
+    self.assertEqual(
+      str(context.exception), 'Line 3: Error: Value must be at least 0.'
+    )
+
+  def test_parse_bytes(self):
+    self.assertEqual(IntSpec().parse_bytes(b' 12\r\n'), 12)
+    self.assertEqual(FloatSpec().parse_bytes(memoryview(b'1.5\n')), 1.5)
+    self.assertEqual(IntSpec(default_value=5).parse_bytes(b'\n'), 5)
+    self.assertEqual(DecimalSpec().parse_bytes(b'1.50\n'), Decimal('1.50'))
+    self.assertEqual(
+      DateTimeSpec().parse_bytes(bytearray(b'2023-11-15\r\n')),
+      datetime(2023, 11, 15),
+    )
+
+  def test_parse_bytes_invalid_input(self):
+    for spec, raw in (
+      (IntSpec(), b'abc\n'),
+      (IntSpec(), b'\n'),
+      (FloatSpec(), b'\xff\n'),
+      (DecimalSpec(), b'\xff\n'),
+    ):
+      with self.subTest(raw=raw), self.assertRaises(ValueError) as context:
+        spec.parse_bytes(raw)
+      self.assertEqual(str(context.exception), spec.type_error_message)
+    with self.assertRaises(ValueError) as context:
+      IntSpec(max_value=10).parse_bytes(b'11\n')
+    self.assertEqual(str(context.exception), 'Error: Value must be at most 10.')
+
+  def test_parse_bytes_matches_parse_for_non_ascii_input(self):
+    specs = (
+      IntSpec(max_value=5),
+      IntSpec(default_value=0),
+      FloatSpec(),
+      FloatSpec(default_value=0.0),
+      DecimalSpec(),
+    )
+    for spec in specs:
+      for text in (
+        '\u0663',
+        '\uff11\uff12',
+        ' \u0663.5 ',
+        '\xa0',
+        '9\u0663',
+        'é',
+      ):
+        with self.subTest(spec=spec, text=text):
+          try:
+            expected = spec.parse(text)
+          except ValueError as e:
+            expected = str(e)
+          try:
+            actual = spec.parse_bytes(f'{text}\n'.encode())
+          except ValueError as e:
+            actual = str(e)
+          self.assertEqual(actual, expected)
+
+  @mock.patch('builtins.input', side_effect=['abc', '150', '42'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_prompt(self, mock_stdout, mock_input):
+    spec = IntSpec(min_value=0, max_value=100)
+    self.assertEqual(spec.prompt('Enter a percentage: '), 42)
+    self.assertEqual(mock_input.call_count, 3)
+    mock_input.assert_called_with('Enter a percentage: ')
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      'Error: You must enter a valid integer.\n'
+      'Error: Value must be at most 100.\n',
+    )
+
+  def test_properties_and_repr(self):
+    spec = IntSpec(min_value=0, max_value=100, default_value=5)
+    self.assertEqual(spec.min_value, 0)
+    self.assertEqual(spec.max_value, 100)
+    self.assertEqual(spec.default_value, 5)
+    self.assertEqual(
+      spec.type_error_message, 'Error: You must enter a valid integer.'
+    )
+    self.assertEqual(
+      repr(spec), 'IntSpec(min_value=0, max_value=100, default_value=5)'
+    )
+
+  def test_uses_slots(self):
+    with self.assertRaises(AttributeError):
+      IntSpec().extra = 1
+
+  def test_error_raised_when_min_value_greater_than_max_value(self):
+    with self.assertRaises(ValueError) as context:
+      IntSpec(min_value=2, max_value=1)
+    self.assertEqual(
+      str(context.exception), '(min_value=2) is greater than (max_value=1).'
+    )
+
+  def test_error_raised_when_default_value_out_of_bounds(self):
+    with self.assertRaises(ValueError) as context:
+      IntSpec(min_value=2, default_value=1)
+    self.assertEqual(
+      str(context.exception), '(default_value=1) is less than (min_value=2).'
+    )
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,101 @@
+import io
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+import typed_input
+from typed_input import (
+  iter_datetime_input,
+  iter_decimal_input,
+  iter_float_input,
+  iter_int_input,
+)
+
+
+class IterInputTest(unittest.TestCase):
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_reads_from_stdin_buffer_by_default(self, mock_stdout):
+    with mock.patch('sys.stdin', mock.Mock(buffer=io.BytesIO(b'1\n2\n3\n'))):
+      self.assertEqual(list(iter_int_input()), [1, 2, 3])
+    self.assertEqual(mock_stdout.getvalue(), '')
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_text_stream(self, unused_mock_stdout):
+    self.assertEqual(
+      list(iter_float_input(stdin=io.StringIO('1.5\n2.5'))), [1.5, 2.5]
+    )
+
+  @mock.patch('sys.stderr', new_callable=io.StringIO)
+  def test_invalid_lines_reported_with_line_numbers(self, mock_stderr):
+    values = iter_int_input(stdin=io.BytesIO(b'1\nabc\n3\n4.0\n'))
+    self.assertEqual(list(values), [1, 3])
+    self.assertEqual(
+      mock_stderr.getvalue(),
+      'Line 2: Error: You must enter a valid integer.\n'
+      'Line 4: Error: You must enter a valid integer.\n',
+    )
+
+  @mock.patch('sys.stderr', new_callable=io.StringIO)
+  def test_undecodable_lines_reported_with_line_numbers(self, mock_stderr):
+    values = iter_int_input(stdin=io.BytesIO(b'1\n\xff\n3\r\n'))
+    self.assertEqual(list(values), [1, 3])
+    self.assertEqual(
+      mock_stderr.getvalue(), 'Line 2: Error: You must enter a valid integer.\n'
+    )
+
+  @mock.patch('sys.stderr', new_callable=io.StringIO)
+  def test_bounds_violations_reported_with_line_numbers(self, mock_stderr):
+    values = iter_int_input(
+      min_value=5, max_value=10, stdin=io.BytesIO(b'2\n7\n12\n')
+    )
+    self.assertEqual(list(values), [7])
+    self.assertEqual(
+      mock_stderr.getvalue(),
+      'Line 1: Error: Value must be at least 5.\n'
+      'Line 3: Error: Value must be at most 10.\n',
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_default_value_used_for_empty_lines(self, unused_mock_stdout):
+    values = iter_decimal_input(
+      default_value=Decimal(0), stdin=io.BytesIO(b'1.5\n\n2.5\n')
+    )
+    self.assertEqual(list(values), [Decimal('1.5'), Decimal(0), Decimal('2.5')])
+
+  @mock.patch('sys.stderr', new_callable=io.StringIO)
+  def test_split_whitespace(self, mock_stderr):
+    values = iter_int_input(
+      split_whitespace=True, stdin=io.BytesIO(b'1 2  3\n\n4 x\n')
+    )
+    self.assertEqual(list(values), [1, 2, 3, 4])
+    self.assertIn(
+      'Line 3: Error: You must enter a valid integer.', mock_stderr.getvalue()
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_windows_line_endings(self, unused_mock_stdout):
+    values = iter_datetime_input(
+      stdin=io.BytesIO(b'2023-11-15\r\n2023-11-16\r\n')
+    )
+    self.assertEqual(
+      list(values), [datetime(2023, 11, 15), datetime(2023, 11, 16)]
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_lines_spanning_blocks(self, unused_mock_stdout):
+    data = ''.join(f'{i}\n' for i in range(1000)).encode()
+    with mock.patch.object(typed_input, '_STREAM_BLOCK_SIZE', 7):
+      values = list(iter_int_input(stdin=io.BytesIO(data)))
+    self.assertEqual(values, list(range(1000)))
+
+  def test_error_raised_before_iteration_when_bounds_invalid(self):
+    with self.assertRaises(ValueError) as context:
+      iter_int_input(min_value=2, max_value=1, stdin=io.BytesIO(b''))
+    self.assertEqual(
+      str(context.exception), '(min_value=2) is greater than (max_value=1).'
+    )
+
+
+if __name__ == '__main__':
+  unittest.main()
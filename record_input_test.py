@@ -0,0 +1,166 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from typed_input import (
+  InputEventKind,
+  RecordSpec,
+  SessionRecorder,
+  SessionReplayer,
+  add_input_hook,
+  iter_record_input,
+  record_input,
+  remove_input_hook,
+)
+
+_SCHEMA = (
+  ('qty', int, {'min_value': 1}),
+  ('price', Decimal, {'default_value': Decimal('0.00')}),
+  ('ts', datetime),
+)
+
+
+class RecordSpecTest(unittest.TestCase):
+  def test_parse(self):
+    spec = RecordSpec(_SCHEMA, delimiter=',')
+    self.assertEqual(
+      spec.parse('3, 9.99 ,2023-11-15'),
+      {'qty': 3, 'price': Decimal('9.99'), 'ts': datetime(2023, 11, 15)},
+    )
+    self.assertEqual(spec.parse('3,,2023-11-15')['price'], Decimal('0.00'))
+    self.assertEqual(spec.field_names, ('qty', 'price', 'ts'))
+
+  def test_whitespace_delimiter(self):
+    spec = RecordSpec([('x', float), ('y', float)])
+    self.assertEqual(spec.parse(' 1.5\t-2 '), {'x': 1.5, 'y': -2.0})
+
+  def test_field_errors_use_default_messages(self):
+    spec = RecordSpec(_SCHEMA, delimiter=',')
+    cases = {
+      '0,1,2023-11-15': 'qty: Error: Value must be at least 1.',
+      '1,abc,2023-11-15': 'price: Error: You must enter a valid Decimal.',
+      '1,2': 'Error: Expected 3 fields but got 2.',
+    }
+    for line, message in cases.items():
+      with self.subTest(line=line):
+        with self.assertRaises(ValueError) as context:
+          spec.parse(line)
+        self.assertEqual(str(context.exception), message)
+    with self.assertRaises(ValueError) as context:
+      spec.parse('1,2,x')
+    self.assertTrue(
+      str(context.exception).startswith('ts: Error: You must enter a valid')
+    )
+
+  def test_parse_many(self):
+    spec = RecordSpec([('n', int, {'max_value': 5})])
+    self.assertEqual(list(spec.parse_many(['1', '2'])), [{'n': 1}, {'n': 2}])
+    with self.assertRaises(ValueError) as context:
+      list(spec.parse_many(['1', '6']))
+    self.assertEqual(
+      str(context.exception), 'Line 2: n: Error: Value must be at most 5.'
+    )
+
+  def test_invalid_schema(self):
+    with self.assertRaises(TypeError):
+      RecordSpec([('name', str)])
+    with self.assertRaises(ValueError) as context:
+      RecordSpec([('n', int), ('n', float)])
+    self.assertEqual(str(context.exception), "Duplicate field name: 'n'.")
+    with self.assertRaises(ValueError) as context:
+      RecordSpec([('n', int, {'min_value': 2, 'max_value': 1})])
+    self.assertEqual(
+      str(context.exception), 'n: (min_value=2) is greater than (max_value=1).'
+    )
+
+
+class RecordInputTest(unittest.TestCase):
+  @mock.patch(
+    'builtins.input', side_effect=['1 x 2023-11-15', '1 2 2023-11-15']
+  )
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_reprompts_whole_line(self, mock_stdout, unused_mock_input):
+    self.assertEqual(
+      record_input(_SCHEMA),
+      {'qty': 1, 'price': Decimal(2), 'ts': datetime(2023, 11, 15)},
+    )
+    self.assertEqual(
+      mock_stdout.getvalue(), 'price: Error: You must enter a valid Decimal.\n'
+    )
+
+  def test_streams_and_compiled_spec(self):
+    spec = RecordSpec(_SCHEMA, delimiter=',')
+    stdout = io.StringIO()
+    stdin = io.StringIO('0,1,2023-11-15\n2,,2023-11-16\n')
+    record = record_input(spec, 'Row: ', stdin=stdin, stdout=stdout)
+    self.assertEqual(record['qty'], 2)
+    self.assertEqual(
+      stdout.getvalue(),
+      'Row: qty: Error: Value must be at least 1.\nRow: ',
+    )
+
+  @mock.patch(
+    'builtins.input', side_effect=['0 1 2023-11-15', '2 1 2023-11-15']
+  )
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_hooks_receive_events(self, unused_mock_stdout, unused_mock_input):
+    events = []
+    add_input_hook(events.append)
+    self.addCleanup(remove_input_hook, events.append)
+    record_input(_SCHEMA, 'Row: ')
+    self.assertEqual(
+      [(event.kind, event.bound) for event in events],
+      [
+        (InputEventKind.PROMPT_SHOWN, None),
+        (InputEventKind.INPUT_RECEIVED, None),
+        (InputEventKind.BOUNDS_VIOLATED, 'min_value'),
+        (InputEventKind.PROMPT_SHOWN, None),
+        (InputEventKind.INPUT_RECEIVED, None),
+        (InputEventKind.VALUE_ACCEPTED, None),
+      ],
+    )
+    self.assertEqual(events[-1].value['qty'], 2)
+
+  @mock.patch(
+    'builtins.input', side_effect=['1 x 2023-11-15', '1 2 2023-11-15']
+  )
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_record_and_replay(self, mock_stdout, mock_input):
+    directory = tempfile.TemporaryDirectory()
+    self.addCleanup(directory.cleanup)
+    path = os.path.join(directory.name, 'session.log')
+    with SessionRecorder(path):
+      record_input(_SCHEMA, 'Row: ')
+    output = mock_stdout.getvalue()
+    with SessionReplayer(path, speed=None) as replayer:
+      self.assertEqual(record_input(_SCHEMA, 'Row: ')['price'], Decimal(2))
+    self.assertEqual(mock_input.call_count, 2)
+    self.assertEqual(mock_stdout.getvalue(), output)
+    self.assertEqual(replayer.report().inputs, 2)
+    self.assertTrue(replayer.report().ok)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  @mock.patch('sys.stderr', new_callable=io.StringIO)
+  def test_iter_record_input(self, mock_stderr, mock_stdout):
+    data = b'1,2,2023-11-15\n1\n5,,2023-11-16\n'
+    records = list(iter_record_input(_SCHEMA, ',', stdin=io.BytesIO(data)))
+    self.assertEqual([record['qty'] for record in records], [1, 5])
+    self.assertEqual(
+      mock_stderr.getvalue(), 'Line 2: Error: Expected 3 fields but got 1.\n'
+    )
+    self.assertEqual(mock_stdout.getvalue(), '')
+
+  @mock.patch('sys.stderr', new_callable=io.StringIO)
+  def test_iter_record_input_undecodable_line(self, mock_stderr):
+    data = b'1,2,2023-11-15\n1,\xff,2023-11-15\n5,,2023-11-16\n'
+    records = list(iter_record_input(_SCHEMA, ',', stdin=io.BytesIO(data)))
+    self.assertEqual([record['qty'] for record in records], [1, 5])
+    self.assertTrue(mock_stderr.getvalue().startswith('Line 2: price: '))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import typed_input
+from typed_input import DateTimeSpec, FormField, IntSpec, serve
+
+_FORM = (
+  FormField('count', IntSpec(min_value=0), 'Count: '),
+  FormField('at', DateTimeSpec(default_value=datetime(2023, 1, 1)), 'At: '),
+)
+
+
+class ServeTest(unittest.IsolatedAsyncioTestCase):
+  async def asyncSetUp(self):
+    self.submitted = []
+    self.server = await serve(_FORM, on_submit=self.submitted.append)
+    self.addAsyncCleanup(self._close_server)
+    self.port = self.server.sockets[0].getsockname()[1]
+
+  async def _close_server(self):
+    self.server.close()
+    await self.server.wait_closed()
+
+  async def _session(self, lines: bytes) -> bytes:
+    reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+    writer.write(lines)
+    writer.write_eof()
+    output = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return output
+
+  async def test_form(self):
+    output = await self._session(b'x\n-1\n3\n2023-11-15\n')
+    self.assertEqual(
+      output.decode(),
+      'Count: Error: You must enter a valid integer.\n'
+      'Count: Error: Value must be at least 0.\n'
+      'Count: At: ',
+    )
+    self.assertEqual(
+      self.submitted, [{'count': 3, 'at': datetime(2023, 11, 15)}]
+    )
+
+  async def test_default_value(self):
+    await self._session(b'1\n\n')
+    self.assertEqual(self.submitted, [{'count': 1, 'at': datetime(2023, 1, 1)}])
+
+  async def test_disconnect_before_submit(self):
+    output = await self._session(b'1\n')
+    self.assertEqual(output, b'Count: At: ')
+    self.assertEqual(self.submitted, [])
+
+  async def test_undecodable_line_prompts_again(self):
+    output = await self._session(b'\xff\n2\n\n')
+    self.assertEqual(
+      output.decode(),
+      'Count: Error: You must enter a valid integer.\nCount: At: ',
+    )
+    self.assertEqual(self.submitted, [{'count': 2, 'at': datetime(2023, 1, 1)}])
+
+  async def test_line_over_limit_closes_connection(self):
+    reader = asyncio.StreamReader(limit=16)
+    reader.feed_data(b'1' * 32 + b'\n2\n\n')
+    reader.feed_eof()
+    writer = mock.Mock(drain=mock.AsyncMock(), wait_closed=mock.AsyncMock())
+    await typed_input._serve_form(_FORM, self.submitted.append, reader, writer)
+    writer.close.assert_called_once_with()
+    self.assertEqual(self.submitted, [])
+
+  async def test_concurrent_connections(self):
+    outputs = await asyncio.gather(
+      *(self._session(f'{i}\n\n'.encode()) for i in range(100))
+    )
+    self.assertEqual(set(outputs), {b'Count: At: '})
+    self.assertEqual(
+      sorted(values['count'] for values in self.submitted), list(range(100))
+    )
+
+  async def test_async_on_submit(self):
+    submitted = []
+
+    async def on_submit(values):
+      await asyncio.sleep(0)
+      submitted.append(values)
+
+    server = await serve(_FORM[:1], on_submit=on_submit)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+      reader, writer = await asyncio.open_connection('127.0.0.1', port)
+      writer.write(b'5\n')
+      await reader.read()
+      writer.close()
+      await writer.wait_closed()
+    self.assertEqual(submitted, [{'count': 5}])
+
+
+@unittest.skipIf(sys.platform == 'win32', 'Unix sockets are POSIX only.')
+class ServeUnixSocketTest(unittest.IsolatedAsyncioTestCase):
+  async def test_form(self):
+    submitted = []
+    with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'form.sock')
+      server = await serve(_FORM, path=path, on_submit=submitted.append)
+      async with server:
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b'7\n2024-02-29T12:00\n')
+        writer.write_eof()
+        self.assertEqual(await reader.read(), b'Count: At: ')
+        writer.close()
+        await writer.wait_closed()
+    self.assertEqual(submitted, [{'count': 7, 'at': datetime(2024, 2, 29, 12)}])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,142 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import typed_input
+from typed_input import (
+  ReplayMismatch,
+  SessionRecorder,
+  SessionReplayer,
+  float_input,
+  int_input,
+)
+
+
+class SessionReplayTest(unittest.TestCase):
+  def setUp(self):
+    directory = tempfile.TemporaryDirectory()
+    self.addCleanup(directory.cleanup)
+    self.path = os.path.join(directory.name, 'session.log')
+
+  @mock.patch('builtins.input')
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def _record(self, lines, unused_mock_stdout, mock_input):
+    mock_input.side_effect = lines
+    with SessionRecorder(self.path):
+      int_input('Percent: ', max_value=100)
+      float_input('Reading: ')
+
+  def _records(self):
+    with open(self.path, encoding='utf-8') as f:
+      return [json.loads(line) for line in f]
+
+  def test_records_every_attempt(self):
+    self._record(['abc', '150', '42', '2.5'])
+    records = self._records()
+    self.assertEqual(
+      [record[2:] for record in records],
+      [
+        [
+          'Percent: ',
+          'abc',
+          'conversion_failed',
+          'Error: You must enter a valid integer.',
+        ],
+        [
+          'Percent: ',
+          '150',
+          'bounds_violated',
+          'Error: Value must be at most 100.',
+        ],
+        ['Percent: ', '42', 'value_accepted', '42'],
+        ['Reading: ', '2.5', 'value_accepted', '2.5'],
+      ],
+    )
+    offsets = [record[0] for record in records]
+    self.assertEqual(offsets, sorted(offsets))
+    self.assertTrue(all(record[1] >= 0 for record in records))
+
+  def test_log_is_appended_to(self):
+    self._record(['1', '2'])
+    self._record(['3', '4'])
+    self.assertEqual([record[3] for record in self._records()], list('1234'))
+
+  def test_recording_stops_after_block(self):
+    self._record(['1', '2'])
+    with mock.patch('builtins.input', return_value='5'):
+      int_input()
+    self.assertEqual(len(self._records()), 2)
+
+  @mock.patch('builtins.input')
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_replay_drives_prompts(self, mock_stdout, mock_input):
+    self._record(['abc', '150', '42', '2.5'])
+    with SessionReplayer(self.path, speed=None) as replayer:
+      self.assertEqual(int_input('Percent: ', max_value=100), 42)
+      self.assertEqual(float_input('Reading: '), 2.5)
+    mock_input.assert_not_called()
+    self.assertEqual(mock_stdout.getvalue(), '')
+    report = replayer.report()
+    self.assertEqual(report.inputs, 4)
+    self.assertTrue(report.ok)
+    self.assertGreater(report.inputs_per_second, 0)
+
+  def test_replay_reports_drift(self):
+    self._record(['150', '42', '2.5'])
+    with SessionReplayer(self.path, speed=None) as replayer:
+      self.assertEqual(int_input('Percent: ', max_value=200), 150)
+      self.assertEqual(int_input('Count: '), 42)
+    self.assertEqual(
+      replayer.report().mismatches,
+      [
+        ReplayMismatch(
+          1,
+          'outcome',
+          ('bounds_violated', 'Error: Value must be at most 100.'),
+          ('value_accepted', '150'),
+        ),
+        ReplayMismatch(2, 'prompt', 'Percent: ', 'Count: '),
+      ],
+    )
+
+  def test_replay_raises_eof_when_log_exhausted(self):
+    self._record(['1', '2'])
+    with SessionReplayer(self.path, speed=None):
+      int_input('Percent: ')
+      float_input('Reading: ')
+      with self.assertRaises(EOFError):
+        int_input()
+
+  @mock.patch('time.sleep')
+  def test_replay_paced_by_speed(self, mock_sleep):
+    with open(self.path, 'w', encoding='utf-8') as f:
+      f.write('[10.0,1.0,null,"1","value_accepted","1"]\n')
+    with SessionReplayer(self.path, speed=4.0):
+      int_input()
+    (delay,), _ = mock_sleep.call_args
+    self.assertAlmostEqual(delay, 2.5, places=1)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_timeouts_recorded_and_replayed(self, unused_mock_stdout):
+    timed_out = mock.patch.object(
+      typed_input, '_timed_input', return_value=None
+    )
+    with SessionRecorder(self.path), timed_out:
+      self.assertEqual(int_input(default_value=3, timeout=1), 3)
+    (record,) = self._records()
+    self.assertEqual(record[2:], [None, None, 'input_timed_out', None])
+    with SessionReplayer(self.path, speed=None) as replayer:
+      self.assertEqual(int_input(default_value=3, timeout=1), 3)
+    self.assertTrue(replayer.report().ok)
+
+  def test_invalid_speed(self):
+    with self.assertRaises(ValueError) as context:
+      SessionReplayer(self.path, speed=0)
+    self.assertEqual(str(context.exception), '(speed=0) must be positive.')
+
+
+if __name__ == '__main__':
+  unittest.main()
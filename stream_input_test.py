@@ -0,0 +1,144 @@
+import io
+import socket
+import sys
+import threading
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from typed_input import (
+  InputTimeout,
+  IntSpec,
+  datetime_input,
+  decimal_input,
+  float_input,
+  int_input,
+)
+
+
+class _CountingWriter(io.StringIO):
+  def __init__(self):
+    super().__init__()
+    self.writes = 0
+
+  def write(self, s):
+    self.writes += 1
+    return super().write(s)
+
+
+class StreamInputTest(unittest.TestCase):
+  @mock.patch('builtins.input')
+  def test_text_streams(self, mock_input):
+    stdout = io.StringIO()
+    value = int_input(
+      'Number: ',
+      min_value=0,
+      stdin=io.StringIO('abc\n-1\n5\n'),
+      stdout=stdout,
+    )
+    self.assertEqual(value, 5)
+    self.assertEqual(
+      stdout.getvalue(),
+      'Number: Error: You must enter a valid integer.\n'
+      'Number: Error: Value must be at least 0.\n'
+      'Number: ',
+    )
+    mock_input.assert_not_called()
+
+  def test_binary_streams(self):
+    stdout = io.BytesIO()
+    value = decimal_input(
+      '€ ', stdin=io.BytesIO(b'x\r\n1.50\r\n'), stdout=stdout
+    )
+    self.assertEqual(value, Decimal('1.50'))
+    self.assertEqual(
+      stdout.getvalue().decode(),
+      '€ Error: You must enter a valid Decimal.\n€ ',
+    )
+
+  def test_output_written_once_per_prompt(self):
+    stdout = _CountingWriter()
+    float_input('> ', stdin=io.StringIO('a\nb\n1.5\n'), stdout=stdout)
+    self.assertEqual(stdout.writes, 3)
+
+  def test_default_value_and_datetime(self):
+    stdout = io.StringIO()
+    default = datetime(2023, 1, 1)
+    self.assertEqual(
+      datetime_input(
+        default_value=default, stdin=io.StringIO('\n'), stdout=stdout
+      ),
+      default,
+    )
+    self.assertEqual(stdout.getvalue(), '')
+
+  def test_eof_flushes_pending_output(self):
+    stdout = io.StringIO()
+    with self.assertRaises(EOFError):
+      int_input(stdin=io.StringIO('abc\n'), stdout=stdout)
+    self.assertEqual(
+      stdout.getvalue(), 'Error: You must enter a valid integer.\n'
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_stdin_only_writes_to_sys_stdout(self, mock_stdout):
+    self.assertEqual(int_input('> ', stdin=io.StringIO('x\n3\n')), 3)
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      '> Error: You must enter a valid integer.\n> ',
+    )
+
+  def test_spec_prompt(self):
+    spec = IntSpec(max_value=10)
+    stdout = io.StringIO()
+    stdin = io.StringIO('11\n7\n8\n')
+    self.assertEqual(spec.prompt(stdin=stdin, stdout=stdout), 7)
+    self.assertEqual(spec.prompt(stdin=stdin, stdout=stdout), 8)
+    self.assertEqual(stdout.getvalue(), 'Error: Value must be at most 10.\n')
+
+
+@unittest.skipIf(sys.platform == 'win32', 'select needs POSIX sockets.')
+class SocketSessionTest(unittest.TestCase):
+  def _socketpair(self):
+    server, client = socket.socketpair()
+    self.addCleanup(server.close)
+    self.addCleanup(client.close)
+    return server, client
+
+  def test_concurrent_sessions(self):
+    results = {}
+
+    def serve(name, sock):
+      with sock.makefile('rb') as stdin, sock.makefile('wb') as stdout:
+        results[name] = int_input('n? ', stdin=stdin, stdout=stdout)
+
+    clients = []
+    threads = []
+    for i in range(10):
+      server, client = self._socketpair()
+      clients.append(client)
+      thread = threading.Thread(target=serve, args=(i, server))
+      thread.start()
+      threads.append(thread)
+    for i, client in enumerate(clients):
+      client.sendall(f'bad\n{i * 10}\n'.encode())
+    for thread in threads:
+      thread.join(5)
+    self.assertEqual(results, {i: i * 10 for i in range(10)})
+    clients[3].settimeout(1)
+    self.assertEqual(
+      clients[3].recv(1024),
+      b'n? Error: You must enter a valid integer.\nn? ',
+    )
+
+  def test_timeout(self):
+    server, _ = self._socketpair()
+    stdout = io.StringIO()
+    with server.makefile('rb') as stdin, self.assertRaises(InputTimeout):
+      int_input('n? ', timeout=0.01, stdin=stdin, stdout=stdout)
+    self.assertEqual(stdout.getvalue(), 'n? \n')
+
+
+if __name__ == '__main__':
+  unittest.main()
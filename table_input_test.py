@@ -0,0 +1,150 @@
+import array
+import io
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+import typed_input
+from typed_input import Table, TableColumn, table_input
+
+_COLUMNS = (
+  ('qty', int, {'min_value': 1}),
+  ('price', Decimal),
+  ('ts', datetime),
+  ('weight', float),
+)
+
+
+class TableInputTest(unittest.TestCase):
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_columns_packed_into_typed_arrays(self, unused_mock_stdout):
+    table = table_input(
+      _COLUMNS,
+      delimiter=',',
+      stdin=io.BytesIO(
+        b'3, 9.99, 2023-11-15T10:30:00.5, 1.5\n1, 0.5, 2023-11-16, -2\n'
+      ),
+    )
+    self.assertIsInstance(table, Table)
+    self.assertEqual(len(table), 2)
+    self.assertEqual(table.column_names, ('qty', 'price', 'ts', 'weight'))
+    self.assertEqual(table['qty'].data, array.array('q', [3, 1]))
+    self.assertEqual(table['price'].data, array.array('q', [999, 50]))
+    self.assertEqual(table['weight'].data, array.array('d', [1.5, -2.0]))
+    self.assertEqual(table['ts'].data.typecode, 'q')
+    self.assertEqual(
+      table.row(0),
+      {
+        'qty': 3,
+        'price': Decimal('9.99'),
+        'ts': datetime(2023, 11, 15, 10, 30, 0, 500000),
+        'weight': 1.5,
+      },
+    )
+    self.assertEqual(table['price'][1], Decimal('0.50'))
+    self.assertEqual(table['ts'][-1], datetime(2023, 11, 16))
+    self.assertEqual(table['qty'][:], [3, 1])
+
+  @mock.patch('sys.stderr', new_callable=io.StringIO)
+  def test_invalid_rows_reported_and_skipped(self, mock_stderr):
+    table = table_input(
+      _COLUMNS,
+      delimiter=',',
+      stdin=io.StringIO(
+        '0, 1, 2023-11-15, 1\n2, x, 2023-11-15, 1\n2, 1, 2023-11-15, 1\n1, 2\n'
+      ),
+    )
+    self.assertEqual(
+      list(table),
+      [
+        {
+          'qty': 2,
+          'price': Decimal(1),
+          'ts': datetime(2023, 11, 15),
+          'weight': 1.0,
+        }
+      ],
+    )
+    self.assertEqual(
+      mock_stderr.getvalue(),
+      'Line 1: qty: Error: Value must be at least 1.\n'
+      'Line 2: price: Error: You must enter a valid Decimal.\n'
+      'Line 4: Error: Expected 4 fields but got 2.\n',
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_decimal_exponent_grows_across_batches(self, unused_mock_stdout):
+    with mock.patch.object(typed_input, '_ARRAY_BATCH_SIZE', 2):
+      table = table_input(
+        [('amount', Decimal)], stdin=io.StringIO('1\n2.5\n-0.125\n1E+2\n')
+      )
+    column = table['amount']
+    self.assertEqual(column.data, array.array('q', [1000, 2500, -125, 100000]))
+    self.assertEqual(
+      list(column),
+      [
+        Decimal('1.000'),
+        Decimal('2.500'),
+        Decimal('-0.125'),
+        Decimal('100.000'),
+      ],
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_datetimes_in_timezone(self, unused_mock_stdout):
+    tz = timezone(timedelta(hours=-5))
+    table = table_input(
+      [('ts', datetime, {'tz': tz})],
+      stdin=io.StringIO('2023-11-15T10:00+02:00\n2023-11-15T10:00\n'),
+    )
+    self.assertEqual(table['ts'].data.typecode, 'q')
+    self.assertEqual(
+      list(table['ts']),
+      [
+        datetime(2023, 11, 15, 3, tzinfo=tz),
+        datetime(2023, 11, 15, 10, tzinfo=tz),
+      ],
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_unpackable_values_fall_back_to_a_list(self, unused_mock_stdout):
+    big = 2**64
+    aware = datetime(2023, 11, 15, tzinfo=timezone.utc)
+    with mock.patch.object(typed_input, '_ARRAY_BATCH_SIZE', 1):
+      table = table_input(
+        [('n', int), ('amount', Decimal), ('ts', datetime)],
+        stdin=io.StringIO(f'1 1.5 2023-11-15\n{big} NaN 2023-11-15T00:00Z\n'),
+      )
+    self.assertEqual(table['n'].data, [1, big])
+    self.assertEqual(table['amount'][0], Decimal('1.5'))
+    self.assertTrue(table['amount'][1].is_nan())
+    self.assertEqual(table['ts'].data, [datetime(2023, 11, 15), aware])
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_other_types_stored_as_lists(self, unused_mock_stdout):
+    table = table_input(
+      [('d', date), ('n', int)], stdin=io.StringIO('2023-11-15 1\n')
+    )
+    self.assertIsInstance(table['d'], TableColumn)
+    self.assertEqual(table['d'].data, [date(2023, 11, 15)])
+
+  def test_column_base_class_is_abstract(self):
+    with self.assertRaises(TypeError):
+      TableColumn('d')
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_empty_input(self, unused_mock_stdout):
+    table = table_input(_COLUMNS, stdin=io.BytesIO(b''))
+    self.assertEqual(len(table), 0)
+    self.assertEqual(list(table), [])
+
+  def test_invalid_columns_raise(self):
+    with self.assertRaises(ValueError):
+      table_input([('a', int), ('a', int)], stdin=io.BytesIO(b''))
+    with self.assertRaises(TypeError):
+      table_input([('a', object)], stdin=io.BytesIO(b''))
+
+
+if __name__ == '__main__':
+  unittest.main()
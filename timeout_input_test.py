@@ -0,0 +1,130 @@
+import io
+import os
+import sys
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from typed_input import (
+  InputEventKind,
+  InputTimeout,
+  add_input_hook,
+  decimal_input,
+  int_input,
+  remove_input_hook,
+)
+
+
+@unittest.skipIf(sys.platform == 'win32', 'select needs POSIX pipes.')
+class TimeoutInputTest(unittest.TestCase):
+  def setUp(self):
+    read_fd, self.write_fd = os.pipe()
+    stdin = os.fdopen(read_fd, encoding='utf-8')
+    self.addCleanup(stdin.close)
+    self.addCleanup(os.close, self.write_fd)
+    patcher = mock.patch('sys.stdin', stdin)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_line_read_before_timeout(self, mock_stdout):
+    os.write(self.write_fd, b'42\n7\n')
+    self.assertEqual(int_input('Number: ', timeout=1), 42)
+    self.assertEqual(int_input(timeout=1), 7)
+    self.assertEqual(mock_stdout.getvalue(), 'Number: ')
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_lines_read_ahead_by_input_are_not_skipped(self, unused_mock_stdout):
+    os.write(self.write_fd, b'1\n2\n3\n')
+    self.assertEqual(int_input('a: '), 1)
+    self.assertEqual(int_input('b: ', timeout=1, default_value=-1), 2)
+    self.assertEqual(int_input('c: ', timeout=1), 3)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_stdin_left_blocking(self, unused_mock_stdout):
+    os.write(self.write_fd, b'1\n')
+    self.assertEqual(int_input(timeout=1), 1)
+    self.assertTrue(os.get_blocking(sys.stdin.fileno()))
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_undecodable_binary_input_is_invalid(self, unused_mock_stdout):
+    read_fd, write_fd = os.pipe()
+    self.addCleanup(os.close, write_fd)
+    os.write(write_fd, b'\xff\n5\n')
+    stdout = io.StringIO()
+    with open(read_fd, 'rb') as stdin:
+      self.assertEqual(int_input(timeout=1, stdin=stdin, stdout=stdout), 5)
+    self.assertEqual(
+      stdout.getvalue(), 'Error: You must enter a valid integer.\n'
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_timeout_raises(self, mock_stdout):
+    with self.assertRaises(InputTimeout) as context:
+      int_input('Number: ', timeout=0.01)
+    self.assertIsInstance(context.exception, TimeoutError)
+    self.assertEqual(
+      str(context.exception), 'No input received within 0.01 seconds.'
+    )
+    self.assertEqual(mock_stdout.getvalue(), 'Number: \n')
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_timeout_returns_default_value(self, unused_mock_stdout):
+    self.assertEqual(
+      decimal_input(default_value=Decimal(1), timeout=0.01), Decimal(1)
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_partial_line_times_out(self, unused_mock_stdout):
+    os.write(self.write_fd, b'12')
+    with self.assertRaises(InputTimeout):
+      int_input(timeout=0.01)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_deadline_applies_across_retries(self, mock_stdout):
+    os.write(self.write_fd, b'abc\n-1\n')
+    with self.assertRaises(InputTimeout) as context:
+      int_input(min_value=0, timeout=5, deadline=0.05)
+    self.assertEqual(
+      str(context.exception), 'No valid input received within 0.05 seconds.'
+    )
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      'Error: You must enter a valid integer.\n'
+      'Error: Value must be at least 0.\n\n',
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_eof(self, unused_mock_stdout):
+    # Replaces the write end of the pipe, so the read end sees end of file.
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, self.write_fd)
+    os.close(devnull)
+    with self.assertRaises(EOFError):
+      int_input(timeout=1)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_timed_out_event(self, unused_mock_stdout):
+    events = []
+    add_input_hook(events.append)
+    self.addCleanup(remove_input_hook, events.append)
+    int_input(default_value=3, timeout=0.01)
+    self.assertEqual(
+      [event.kind for event in events],
+      [InputEventKind.PROMPT_SHOWN, InputEventKind.INPUT_TIMED_OUT],
+    )
+    self.assertGreaterEqual(events[1].duration, 0.01)
+
+
+class TimeoutFallbackTest(unittest.TestCase):
+  @mock.patch('builtins.input', return_value='5')
+  @mock.patch('sys.stdin', new_callable=io.StringIO)
+  def test_unselectable_stdin_falls_back_to_input(
+    self, unused_mock_stdin, mock_input
+  ):
+    self.assertEqual(int_input('Number: ', timeout=1), 5)
+    mock_input.assert_called_once_with('Number: ')
+
+
+if __name__ == '__main__':
+  unittest.main()
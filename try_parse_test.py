@@ -0,0 +1,174 @@
+import random
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from typed_input import (
+  ChoiceSpec,
+  DateTimeSpec,
+  DecimalSpec,
+  FloatSpec,
+  IntSpec,
+  ParseResult,
+  Validator,
+  try_parse_datetime,
+  try_parse_datetime_many,
+  try_parse_decimal,
+  try_parse_decimal_many,
+  try_parse_float,
+  try_parse_float_many,
+  try_parse_int,
+  try_parse_int_many,
+)
+
+
+class TryParseTest(unittest.TestCase):
+  def test_valid_input(self):
+    result = try_parse_int(' 42 ', min_value=0)
+    self.assertEqual(result, ParseResult(42, None, None))
+    self.assertTrue(result.ok)
+
+  def test_conversion_failure(self):
+    result = try_parse_float('N/A')
+    self.assertFalse(result.ok)
+    self.assertEqual(result.code, 'conversion')
+    self.assertIsNone(result.value)
+    self.assertEqual(result.message, 'Error: You must enter a valid float.')
+
+  def test_error_codes_name_the_violated_constraint(self):
+    even = Validator(lambda value: value % 2 == 0, 'Error: Must be even.')
+    for user_input, code in (
+      ('-1', 'min_value'),
+      ('101', 'max_value'),
+      ('7', 'allowed'),
+      ('13', 'validator'),
+    ):
+      result = try_parse_int(
+        user_input,
+        min_value=0,
+        max_value=100,
+        allowed=[(0, 5), (10, 20)],
+        validators=[even],
+      )
+      self.assertEqual(result.code, code, user_input)
+
+  def test_blank_input_uses_default_value(self):
+    self.assertEqual(try_parse_int('  ', default_value=3).value, 3)
+    self.assertEqual(try_parse_int('').code, 'conversion')
+
+  def test_custom_type_error_message(self):
+    result = try_parse_decimal('$5', type_error_message='Enter an amount.')
+    self.assertEqual(result.message, 'Enter an amount.')
+
+  def test_datetime_in_timezone(self):
+    result = try_parse_datetime('2023-11-15T10:00', tz=timezone.utc)
+    self.assertEqual(
+      result.value, datetime(2023, 11, 15, 10, tzinfo=timezone.utc)
+    )
+    self.assertEqual(try_parse_datetime('tomorrow').code, 'conversion')
+
+  def test_batch_functions(self):
+    self.assertEqual(
+      [result.value for result in try_parse_int_many(['1', 'x', '3'])],
+      [1, None, 3],
+    )
+    self.assertEqual(
+      [result.code for result in try_parse_float_many(['1.5', '-1'], 0)],
+      [None, 'min_value'],
+    )
+    self.assertEqual(
+      try_parse_decimal_many(['1.10', ''], default_value=Decimal(0)),
+      [ParseResult(Decimal('1.10'), None, None), ParseResult(0, None, None)],
+    )
+    self.assertEqual(
+      [result.ok for result in try_parse_datetime_many(['2023-11-15', '?'])],
+      [True, False],
+    )
+
+  def test_config_errors_raise(self):
+    with self.assertRaises(ValueError):
+      try_parse_int('1', min_value=2, max_value=1)
+
+  def test_choice_spec(self):
+    spec = ChoiceSpec(['red', 'green'])
+    self.assertEqual(spec.try_parse('gr').value, 'green')
+    self.assertEqual(spec.try_parse('blue').code, 'conversion')
+
+
+class TryParseAgreesWithParseTest(unittest.TestCase):
+  """try_parse must accept and reject exactly what parse does."""
+
+  def assert_agrees(self, spec, user_inputs):
+    for user_input, result in zip(
+      user_inputs, spec.try_parse_many(user_inputs)
+    ):
+      try:
+        expected = ParseResult(spec.parse(user_input), None, None)
+      except ValueError as e:
+        self.assertEqual(result.message, str(e), repr(user_input))
+        self.assertIsNone(result.value)
+      else:
+        self.assertEqual(repr(result), repr(expected), repr(user_input))
+
+  def test_edge_cases(self):
+    user_inputs = [
+      '',
+      ' ',
+      '7',
+      '-7',
+      '+7',
+      ' 7 ',
+      '1_000',
+      '_1',
+      '1_',
+      '1__0',
+      '٣',
+      ' 7　',
+      '1.5',
+      '.5',
+      '5.',
+      '1e5',
+      '1E-5',
+      'inf',
+      '-Infinity',
+      'nan',
+      'NaN',
+      'sNaN',
+      'nan12',
+      '_-7',
+      'Na_N',
+      '12,5',
+      'N/A',
+      '0x10',
+      '2023-11-15',
+      '2023-11-15T10:00Z',
+      '2023-11-15 10:00:00.5+01:00',
+      '20231115',
+      ' 2023-11-15',
+      'x2023-11-15',
+    ]
+    for spec in (
+      IntSpec(),
+      FloatSpec(),
+      DecimalSpec(),
+      DateTimeSpec(),
+      IntSpec(default_value=0),
+      FloatSpec(default_value=0.0),
+    ):
+      with self.subTest(spec=spec):
+        self.assert_agrees(spec, user_inputs)
+
+  def test_random_input(self):
+    rng = random.Random(0)
+    alphabet = '0123456789+-_.eEinfatysINFATYS \t\xa0٣:TZW/x'
+    user_inputs = [
+      ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+      for _ in range(5000)
+    ]
+    for spec in (IntSpec(), FloatSpec(), DecimalSpec(), DateTimeSpec()):
+      with self.subTest(spec=spec):
+        self.assert_agrees(spec, user_inputs)
+
+
+if __name__ == '__main__':
+  unittest.main()
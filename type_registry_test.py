@@ -0,0 +1,183 @@
+import enum
+import fractions
+import io
+import ipaddress
+import os
+import tempfile
+import unittest
+import uuid
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from parameterized import parameterized
+
+import typed_input
+from typed_input import RecordSpec, register_type, validate_file
+
+
+class Color(enum.Enum):
+  RED = 'r'
+  GREEN = 'g'
+
+
+class Priority(enum.IntEnum):
+  LOW = 1
+  HIGH = 2
+
+
+class _Celsius(float):
+  pass
+
+
+class TypedInputTest(unittest.TestCase):
+  @parameterized.expand(
+    [
+      (date, '2023-11-15', date(2023, 11, 15)),
+      (time, '10:30', time(10, 30)),
+      (timedelta, '1:30:00', timedelta(hours=1, minutes=30)),
+      (timedelta, '2 days, 0:00:01.5', timedelta(days=2, seconds=1.5)),
+      (timedelta, '-0:30', timedelta(minutes=-30)),
+      (timedelta, '-1 day, 23:00:00', timedelta(hours=-1)),
+      (timedelta, '-3 days, 5:00:00', timedelta(days=-3, hours=5)),
+      (timedelta, 'P1W2DT3H', timedelta(days=9, hours=3)),
+      (timedelta, '-PT0.5S', timedelta(seconds=-0.5)),
+      (fractions.Fraction, ' 3/4 ', fractions.Fraction(3, 4)),
+      (fractions.Fraction, '0.25', fractions.Fraction(1, 4)),
+      (
+        uuid.UUID,
+        '12345678-1234-5678-1234-567812345678',
+        uuid.UUID('12345678123456781234567812345678'),
+      ),
+      (ipaddress.IPv4Address, '10.0.0.1', ipaddress.IPv4Address('10.0.0.1')),
+      (ipaddress.IPv6Address, '::1', ipaddress.IPv6Address('::1')),
+      (
+        ipaddress.IPv4Network,
+        '10.0.0.0/8',
+        ipaddress.IPv4Network('10.0.0.0/8'),
+      ),
+      (Color, 'RED', Color.RED),
+      (Color, 'g', Color.GREEN),
+      (Priority, '2', Priority.HIGH),
+    ]
+  )
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_builtin_converters(self, value_type, line, expected, mock_stdout):
+    with mock.patch('builtins.input', return_value=line):
+      self.assertEqual(typed_input.typed_input(value_type), expected)
+    self.assertEqual(mock_stdout.getvalue(), '')
+
+  @parameterized.expand(
+    [
+      (date, '2023-13-01', 'date in ISO 8601 format e.g. YYYY-MM-DD.'),
+      (time, '25:00', 'time in ISO 8601 format e.g. HH:MM:SS.'),
+      (timedelta, 'PT', 'duration e.g. 1:30:00 or PT1H30M.'),
+      (timedelta, '1:5', 'duration e.g. 1:30:00 or PT1H30M.'),
+      (fractions.Fraction, '1/0', 'fraction e.g. 3/4.'),
+      (uuid.UUID, 'xyz', 'UUID.'),
+      (ipaddress.IPv4Address, '10.0.0.256', 'IPv4 address.'),
+      (Color, 'BLUE', 'Color: one of RED, GREEN.'),
+    ]
+  )
+  def test_type_error_messages(self, value_type, line, message):
+    stdout = io.StringIO()
+    with self.assertRaises(EOFError):
+      typed_input.typed_input(
+        value_type, stdin=io.StringIO(f'{line}\n'), stdout=stdout
+      )
+    self.assertEqual(
+      stdout.getvalue(), f'Error: You must enter a valid {message}\n'
+    )
+
+  @mock.patch('builtins.input', side_effect=['2019-12-31', '', '2020-06-01'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_bounds(self, mock_stdout, unused_mock_input):
+    value = typed_input.typed_input(date, min_value=date(2020, 1, 1))
+    self.assertEqual(value, date(2020, 6, 1))
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      'Error: Value must be at least 2020-01-01.\n'
+      'Error: You must enter a valid date in ISO 8601 format e.g. '
+      'YYYY-MM-DD.\n',
+    )
+
+  def test_builtin_spec_types(self):
+    with mock.patch('builtins.input', return_value='1.5'):
+      self.assertEqual(typed_input.typed_input(Decimal), Decimal('1.5'))
+
+  def test_unsupported_type(self):
+    with self.assertRaises(TypeError):
+      typed_input.typed_input(bytes)
+    with self.assertRaises(TypeError):
+      typed_input.typed_input(_Celsius)
+
+  def test_unknown_keyword_rejected_for_registered_type(self):
+    for kwargs in ({'min_val': date(2023, 1, 1)}, {'tz': None}):
+      with self.subTest(kwargs=kwargs), self.assertRaises(TypeError):
+        typed_input._spec_for_type(date, **kwargs)
+    with self.assertRaises(TypeError):
+      RecordSpec([('day', date, {'places': 2})])
+
+  def test_timedelta_round_trips_str(self):
+    parse = typed_input._spec_for_type(timedelta).parse
+    for value in (
+      timedelta(hours=-1),
+      timedelta(days=-3, hours=5),
+      timedelta(days=-1, microseconds=1),
+      timedelta(seconds=-0.5),
+      timedelta(days=2, seconds=1.5),
+    ):
+      with self.subTest(value=value):
+        self.assertEqual(parse(str(value)), value)
+
+  def test_converter_resolved_once_per_subclass(self):
+    typed_input._spec_for_type(Priority)
+    self.assertIn(Priority, typed_input._CONVERTERS)
+
+
+class RegisterTypeTest(unittest.TestCase):
+  def setUp(self):
+    converters = mock.patch.dict(typed_input._CONVERTERS)
+    spec_types = mock.patch.dict(typed_input._SPEC_TYPES)
+    converters.start()
+    spec_types.start()
+    self.addCleanup(converters.stop)
+    self.addCleanup(spec_types.stop)
+
+  @mock.patch('builtins.input', side_effect=['-300', '21.5'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_register_type(self, mock_stdout, unused_mock_input):
+    def celsius(user_input):
+      value = _Celsius(user_input)
+      if value < -273.15:
+        raise ValueError('Below absolute zero.')
+      return value
+
+    register_type(_Celsius, celsius)
+    value = typed_input.typed_input(_Celsius)
+    self.assertIsInstance(value, _Celsius)
+    self.assertEqual(value, 21.5)
+    self.assertEqual(
+      mock_stdout.getvalue(), 'Error: You must enter a valid _Celsius.\n'
+    )
+
+  def test_registered_types_in_records_and_files(self):
+    register_type(bytes, str.encode, 'Error: Bad bytes.')
+    spec = RecordSpec([('id', uuid.UUID), ('data', bytes)])
+    record = spec.parse('12345678123456781234567812345678 abc')
+    self.assertEqual(record['data'], b'abc')
+    with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'durations.txt')
+      with open(path, 'w') as f:
+        f.write('1:00\nPT5M\nsoon\n')
+      result = validate_file(path, timedelta)
+    self.assertEqual(result.values, [timedelta(hours=1), timedelta(minutes=5)])
+    self.assertEqual(result.errors[0][0], 3)
+
+  def test_override_builtin_spec_type(self):
+    register_type(int, lambda s: int(s, 16), 'Error: Enter hex.')
+    self.assertEqual(RecordSpec([('n', int)]).parse('ff'), {'n': 255})
+
+
+if __name__ == '__main__':
+  unittest.main()
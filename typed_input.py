@@ -2,97 +2,4711 @@
 
 from __future__ import annotations
 
-import decimal
+import _thread
+import abc
+import bisect
+import contextlib
+import enum
+import functools
+import io
+import itertools
+import os
+import re
+import stat
 import sys
-from datetime import datetime
-from decimal import Decimal
-from typing import Any, Callable, TypeVar
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from typing import (
+  IO,
+  TYPE_CHECKING,
+  Any,
+  AnyStr,
+  Callable,
+  Generic,
+  NamedTuple,
+  TypeVar,
+  Union,
+)
+
+# Modules only some features need are imported where they are used, so that
+# `import typed_input` stays cheap for short-lived command line tools.
+if TYPE_CHECKING:
+  import array
+  import asyncio
+  import concurrent.futures
+  import decimal
+  import fractions
+  import mmap
+  import queue
+  import threading
+  from datetime import datetime, timedelta, tzinfo
+  from decimal import Decimal
+
+  import numpy as np
+  from typing_extensions import Self
+
+
+def _get_python_version() -> str:
+  """Returns the Python version in the format 'major.minor'."""
+  return f'{sys.version_info.major}.{sys.version_info.minor}'
+
+
+@functools.cache
+def _default_datetime_input_type_error() -> str:
+  """Returns the default datetime error, linking the docs for this Python."""
+  docs_url = f'https://docs.python.org/{_get_python_version()}/library/datetime.html#datetime.datetime.fromisoformat'
+  return (
+    f'{_BASE_INVALID_TYPE_ERROR} datetime in valid ISO 8601 format e.g. YYYY-MM-DD.\n'
+    f'See {docs_url} for all allowed options.'
+  )
+
+
+_BASE_INVALID_TYPE_ERROR = 'Error: You must enter a valid'
+_DEFAULT_INT_INPUT_TYPE_ERROR = f'{_BASE_INVALID_TYPE_ERROR} integer.'
+_DEFAULT_FLOAT_INPUT_TYPE_ERROR = f'{_BASE_INVALID_TYPE_ERROR} float.'
+_DEFAULT_DECIMAL_INPUT_TYPE_ERROR = f'{_BASE_INVALID_TYPE_ERROR} Decimal.'
+_DEFAULT_CHOICE_INPUT_TYPE_ERROR = f'{_BASE_INVALID_TYPE_ERROR} option.'
+_T = TypeVar('_T', int, float, 'Decimal', 'datetime', str)
+_V = TypeVar('_V')
+_BytesLike = Union[bytes, bytearray, memoryview]
+_DEFAULT_DATETIME_CACHE_SIZE = 1024
+# Regular expressions are kept as strings, with their flags inline, and only
+# compiled by `_compile` for the first spec or parser that needs them.
+_ISO_DATETIME_PATTERN = (
+  r'(?a)(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?'
+  r'(Z|[+-]\d{2}:\d{2})?'
+)
+# Loose supersets of the syntax each converter accepts, so input they reject
+# is certainly invalid and can be rejected without raising an exception.
+_INT_SYNTAX = r'\s*[+-]?\d[\d_]*\s*'
+_FLOAT_SYNTAX = (
+  r'(?i)\s*[+-]?(?:[\d_]*\.?[\d_]*(?:e[+-]?[\d_]+)?|inf(?:inity)?|nan)\s*'
+)
+# Decimal ignores underscores anywhere, so only its characters are screened.
+_DECIMAL_SYNTAX = r'(?i)[\s\d_+\-.einftyas]*'
+_DATETIME_SYNTAX = r'[0-9]{4}'
+_ASCII_DIGITS = frozenset('0123456789')
+_new_tuple = tuple.__new__
+_HISTOGRAM_BUCKETS = tuple(10.0**exponent for exponent in range(-6, 4))
+_STREAM_BLOCK_SIZE = 1 << 16
+_DEFAULT_MAX_REPORTED_ERRORS = 100
+_CHUNKS_PER_WORKER = 4
+_MIN_PARALLEL_CHUNK_SIZE = 1 << 20
+_ARRAY_BATCH_SIZE = 1 << 16
+# Large enough that a burst of connections is not refused while being accepted.
+_SERVE_BACKLOG = 1024
+_MAX_LISTED_CHOICES = 5
+_SIGNS = ('+', '-')
+_LINE_ENDS = ('\n', b'\n')
+# The values of the `decimal.ROUND_*` constants.
+_ROUNDING_MODES = frozenset(
+  (
+    'ROUND_CEILING',
+    'ROUND_DOWN',
+    'ROUND_FLOOR',
+    'ROUND_HALF_DOWN',
+    'ROUND_HALF_EVEN',
+    'ROUND_HALF_UP',
+    'ROUND_UP',
+    'ROUND_05UP',
+  )
+)
+_NUMPY_REQUIRED_ERROR = (
+  'NumPy is required for array input. '
+  'Install it with: pip install "typed-input[numpy]"'
+)
+
+
+@functools.cache
+def _decimal_type() -> type[Decimal]:
+  """Returns `decimal.Decimal`, importing decimal when it is first needed."""
+  import decimal
+
+  return decimal.Decimal
+
+
+@functools.cache
+def _compile(pattern: str) -> re.Pattern[str]:
+  """Compiles a regular expression once, when it is first used."""
+  return re.compile(pattern)
+
+
+def _check_bounds_arguments(
+  min_value: _T | None,
+  max_value: _T | None,
+  default_value: _T | None,
+) -> None:
+  """Checks that the bounds and default value are consistent with each other.
+
+  Args:
+    min_value: The minimum acceptable value, if any.
+    max_value: The maximum acceptable value, if any.
+    default_value: The value used for empty input, if any.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+  """
+  if min_value is not None and max_value is not None and min_value > max_value:
+    raise ValueError(f'({min_value=}) is greater than ({max_value=}).')
+  if default_value is not None:
+    if min_value is not None and default_value < min_value:
+      raise ValueError(f'({default_value=}) is less than ({min_value=}).')
+    if max_value is not None and default_value > max_value:
+      raise ValueError(f'({default_value=}) is greater than ({max_value=}).')
+
+
+def _iso_datetime_parser() -> Callable[[str], datetime]:
+  """Returns a function parsing ISO 8601 strings the same way everywhere.
+
+  `datetime.fromisoformat` accepts more formats from Python 3.11 on. When it
+  rejects a string, the most common of those formats, a 'Z' suffix and
+  fractions of 1 to 6 digits, are rewritten into a form every supported
+  version accepts before trying again.
+  """
+  from datetime import datetime
+
+  fromisoformat = datetime.fromisoformat
+  fullmatch = _compile(_ISO_DATETIME_PATTERN).fullmatch
+
+  def parse(date_string: str) -> datetime:
+    """Parses an ISO 8601 string.
+
+    Raises:
+      ValueError: If `date_string` is not a valid ISO 8601 datetime.
+    """
+    try:
+      return fromisoformat(date_string)
+    except ValueError:
+      match = fullmatch(date_string)
+      if match is None:
+        raise
+    head, seconds, fraction, offset = match.groups()
+    if offset == 'Z':
+      offset = '+00:00'
+    return fromisoformat(
+      f'{head}:{seconds or "00"}.{(fraction or "").ljust(6, "0")}{offset or ""}'
+    )
+
+  return parse
+
+
+class DateTimeParser:
+  """An ISO 8601 datetime parser with a bounded LRU cache of parsed strings.
+
+  Bulk input such as log timestamps tends to repeat the same few date-only and
+  minute-granularity strings, so parsed values are cached and a repeated string
+  costs one dictionary lookup instead of a parse. Only valid strings are
+  cached. Strings like 'YYYY-MM-DDTHH:MM[:SS[.ffffff]]' with an optional 'Z' or
+  '±HH:MM' offset are accepted the same way on every supported Python version,
+  e.g. a 'Z' suffix or a one digit fraction also works before Python 3.11.
+
+  Example:
+    >>> parser = DateTimeParser(cache_size=128)
+    >>> parser('2023-11-15T15:30:00Z')
+    datetime.datetime(2023, 11, 15, 15, 30, tzinfo=datetime.timezone.utc)
+    >>> parser.cache_info()
+    CacheInfo(hits=0, misses=1, maxsize=128, currsize=1)
+  """
+
+  __slots__ = ('_cache_size', '_parse')
+
+  def __init__(self, cache_size: int = _DEFAULT_DATETIME_CACHE_SIZE) -> None:
+    """Creates a parser.
+
+    Args:
+      cache_size: The maximum number of parsed strings to cache. Use 0 to
+        disable caching.
+    """
+    self._cache_size = cache_size
+    self._parse = functools.lru_cache(maxsize=cache_size)(
+      _iso_datetime_parser()
+    )
+
+  def __reduce__(self) -> tuple[type[DateTimeParser], tuple[int]]:
+    return DateTimeParser, (self._cache_size,)
+
+  def __call__(self, date_string: str) -> datetime:
+    """Parses an ISO 8601 datetime string.
+
+    Raises:
+      ValueError: If `date_string` is not a valid ISO 8601 datetime.
+    """
+    return self._parse(date_string)
+
+  def cache_info(self) -> Any:
+    """Returns the hits, misses, maxsize and currsize of the cache."""
+    return self._parse.cache_info()
+
+  def cache_clear(self) -> None:
+    """Clears the cache and its statistics."""
+    self._parse.cache_clear()
+
+
+def _normalize_timezone(value: datetime, tz: tzinfo) -> datetime:
+  """Converts an aware datetime to `tz`, or assumes `tz` for a naive one."""
+  if value.tzinfo is None:
+    return value.replace(tzinfo=tz)
+  return value.astimezone(tz)
+
+
+def _parse_datetime_in_timezone(
+  parser: DateTimeParser, tz: tzinfo, date_string: str
+) -> datetime:
+  """Parses an ISO 8601 datetime string and normalizes it to `tz`."""
+  return _normalize_timezone(parser(date_string), tz)
+
+
+@functools.cache
+def _default_datetime_parser() -> DateTimeParser:
+  """Returns the parser shared by all datetime input, created on first use."""
+  return DateTimeParser()
+
+
+class InputEventKind(str, enum.Enum):
+  """The kinds of event emitted to input hooks by the prompt loop."""
+
+  PROMPT_SHOWN = 'prompt_shown'
+  INPUT_RECEIVED = 'input_received'
+  CONVERSION_FAILED = 'conversion_failed'
+  BOUNDS_VIOLATED = 'bounds_violated'
+  VALUE_ACCEPTED = 'value_accepted'
+  INPUT_TIMED_OUT = 'input_timed_out'
+
+
+class InputEvent(NamedTuple):
+  """A structured event emitted to input hooks by the prompt loop.
+
+  Attributes:
+    kind: What happened.
+    prompt: The prompt of the input function that emitted the event.
+    raw_input: The line entered, for every kind except PROMPT_SHOWN.
+    value: The accepted value, for VALUE_ACCEPTED.
+    message: The error message displayed, for CONVERSION_FAILED and
+      BOUNDS_VIOLATED.
+    bound: 'min_value', 'max_value', 'allowed', 'validator', or for Decimal
+      input 'places' or 'max_digits', for BOUNDS_VIOLATED.
+    duration: In seconds, the think-time between showing the prompt and
+      receiving the input for INPUT_RECEIVED, the time waited for
+      INPUT_TIMED_OUT, and the time taken to convert and validate the input
+      for the other kinds except PROMPT_SHOWN.
+  """
+
+  kind: InputEventKind
+  prompt: str | None
+  raw_input: str | None = None
+  value: Any = None
+  message: str | None = None
+  bound: str | None = None
+  duration: float | None = None
+
+
+InputHook = Callable[[InputEvent], None]
+_INPUT_HOOKS: list[InputHook] = []
+_WAIT_EVENT_KINDS = frozenset(
+  (InputEventKind.INPUT_RECEIVED, InputEventKind.INPUT_TIMED_OUT)
+)
+
+
+def add_input_hook(hook: InputHook) -> None:
+  """Registers a function to be called with every InputEvent.
+
+  Hooks are called synchronously from the prompt loop, in registration order,
+  and apply to every prompt in the process. While no hook is registered the
+  prompt loop does not time or build any events.
+
+  Args:
+    hook: A callable taking one InputEvent, e.g. a `MetricsAggregator`.
+  """
+  _INPUT_HOOKS.append(hook)
+
+
+def remove_input_hook(hook: InputHook) -> None:
+  """Unregisters a hook registered with `add_input_hook`.
+
+  Raises:
+    ValueError: If `hook` is not registered.
+  """
+  _INPUT_HOOKS.remove(hook)
+
+
+def _emit_input_event(event: InputEvent) -> None:
+  """Calls every registered hook with `event`."""
+  for hook in tuple(_INPUT_HOOKS):
+    hook(event)
+
+
+class Histogram:
+  """A thread-unsafe histogram of durations in seconds with decade buckets."""
+
+  __slots__ = ('bucket_counts', 'count', 'max', 'min', 'sum')
+
+  def __init__(self) -> None:
+    self.bucket_counts = [0] * (len(_HISTOGRAM_BUCKETS) + 1)
+    self.count = 0
+    self.sum = 0.0
+    self.min = float('inf')
+    self.max = 0.0
+
+  def observe(self, value: float) -> None:
+    """Records one duration."""
+    self.bucket_counts[bisect.bisect_left(_HISTOGRAM_BUCKETS, value)] += 1
+    self.count += 1
+    self.sum += value
+    self.min = min(self.min, value)
+    self.max = max(self.max, value)
+
+  def summary(self) -> dict[str, Any]:
+    """Returns the count, sum, min, max, mean and per-bucket counts.
+
+    Each bucket is reported as (upper bound in seconds, count) and counts the
+    durations greater than the previous bucket's bound, up to its own.
+    """
+    return {
+      'count': self.count,
+      'sum': self.sum,
+      'min': self.min if self.count else None,
+      'max': self.max if self.count else None,
+      'mean': self.sum / self.count if self.count else None,
+      'buckets': list(
+        zip((*_HISTOGRAM_BUCKETS, float('inf')), self.bucket_counts)
+      ),
+    }
+
+
+class MetricsAggregator:
+  """An input hook that aggregates events into counters and histograms.
+
+  Example:
+    >>> metrics = MetricsAggregator()
+    >>> add_input_hook(metrics)
+    >>> int_input(min_value=0)
+    -1
+    Error: Value must be at least 0.
+    5
+    5
+    >>> metrics.report()['counters']
+    {'prompt_shown': 2, 'input_received': 2, 'bounds_violated': 1, ...}
+  """
+
+  def __init__(self) -> None:
+    import threading
+
+    self._lock = threading.Lock()
+    self._counters = dict.fromkeys((kind.value for kind in InputEventKind), 0)
+    self._bounds_violated = {'min_value': 0, 'max_value': 0}
+    self._think_time = Histogram()
+    self._parse_time = Histogram()
+
+  def __call__(self, event: InputEvent) -> None:
+    with self._lock:
+      self._counters[event.kind.value] += 1
+      if event.kind in _WAIT_EVENT_KINDS:
+        self._think_time.observe(event.duration or 0.0)
+      elif event.kind is not InputEventKind.PROMPT_SHOWN:
+        self._parse_time.observe(event.duration or 0.0)
+        if event.bound is not None:
+          self._bounds_violated[event.bound] = (
+            self._bounds_violated.get(event.bound, 0) + 1
+          )
+
+  def report(self) -> dict[str, Any]:
+    """Returns a snapshot of the aggregated metrics.
+
+    Returns:
+      dict: 'counters' maps each event kind to its count, 'bounds_violated'
+        maps 'min_value', 'max_value' and any other violated bound, such as
+        'allowed', to how often each was hit, and
+        'think_time' and 'parse_time' are `Histogram.summary` dicts.
+    """
+    with self._lock:
+      return {
+        'counters': dict(self._counters),
+        'bounds_violated': dict(self._bounds_violated),
+        'think_time': self._think_time.summary(),
+        'parse_time': self._parse_time.summary(),
+      }
+
+
+class OpenTelemetryHook:
+  """An input hook that records events with an OpenTelemetry style meter.
+
+  Works with an `opentelemetry.metrics.Meter`, or anything with the same
+  `create_counter` and `create_histogram` methods, so OpenTelemetry is not a
+  dependency of this package. Three instruments are created:
+  'typed_input.events' counts events by 'event' (and 'bound') attribute, and
+  'typed_input.think_time' and 'typed_input.parse_time' record durations.
+
+  Example:
+    >>> from opentelemetry import metrics
+    >>> add_input_hook(OpenTelemetryHook(metrics.get_meter('my.app')))
+  """
+
+  def __init__(self, meter: Any) -> None:
+    self._events = meter.create_counter(
+      'typed_input.events', unit='1', description='Input events by kind.'
+    )
+    self._think_time = meter.create_histogram(
+      'typed_input.think_time',
+      unit='s',
+      description='Time between showing a prompt and receiving input.',
+    )
+    self._parse_time = meter.create_histogram(
+      'typed_input.parse_time',
+      unit='s',
+      description='Time taken to convert and validate input.',
+    )
+
+  def __call__(self, event: InputEvent) -> None:
+    attributes = {'event': event.kind.value}
+    if event.bound is not None:
+      attributes['bound'] = event.bound
+    self._events.add(1, attributes)
+    if event.kind in _WAIT_EVENT_KINDS:
+      self._think_time.record(event.duration, attributes)
+    elif event.kind is not InputEventKind.PROMPT_SHOWN:
+      self._parse_time.record(event.duration, attributes)
+
+
+class _InvalidInput:
+  """The error message for input that failed conversion or validation.
+
+  `bound` names the violated constraint for input of the right type that is
+  out of bounds, and is None for input that failed conversion.
+  """
+
+  __slots__ = ('_result', 'bound', 'message')
+
+  def __init__(self, message: str, bound: str | None = None) -> None:
+    self.message = message
+    self.bound = bound
+    self._result: ParseResult | None = None
+
+  def as_result(self) -> ParseResult:
+    """Returns the error as a `ParseResult`, built once and then shared."""
+    result = self._result
+    if result is None:
+      result = self._result = ParseResult(
+        None, self.bound or 'conversion', self.message
+      )
+    return result
+
+
+class ParseResult(NamedTuple):
+  """The outcome of a `try_parse` call: a value or an error, never raised.
+
+  Attributes:
+    value: The validated value, or None if the input is invalid.
+    code: None if the input is valid. Otherwise 'conversion' if it is not of
+      the right type, or the constraint it violates: 'min_value',
+      'max_value', 'allowed', 'validator', 'places' or 'max_digits'.
+    message: The error message `prompt` would display, or None if valid.
+  """
+
+  value: Any
+  code: str | None
+  message: str | None
+
+  @property
+  def ok(self) -> bool:
+    """Whether the input is valid."""
+    return self.code is None
+
+
+class Validator(NamedTuple):
+  """A custom check run on each value after conversion and the bounds.
+
+  Example:
+    >>> multiple_of_5 = Validator(
+    ...   lambda value: value % 5 == 0,
+    ...   'Error: Value must be a multiple of 5.',
+    ...   vectorized=lambda array: array % 5 == 0,
+    ... )
+    >>> int_input('Quantity: ', min_value=0, validators=[multiple_of_5])
+
+  Attributes:
+    check: Returns whether a value is valid.
+    message: The error message displayed for a value that fails `check`.
+    cost: The relative cost of `check`. Validators run from the cheapest to
+      the most expensive and stop at the first failure, so cheap checks
+      reject bad input before expensive ones run.
+    vectorized: Optionally, returns a boolean NumPy array of whether each
+      element of an array is valid. Used instead of `check` by the array
+      input functions, so the check costs no Python call per element.
+  """
+
+  check: Callable[[Any], bool]
+  message: str
+  cost: float = 1.0
+  vectorized: Callable[[np.ndarray], np.ndarray] | None = None
+
+
+def _sorted_validators(
+  validators: Iterable[Validator] | None,
+) -> tuple[Validator, ...]:
+  """Returns the validators from the cheapest to the most expensive."""
+  if validators is None:
+    return ()
+  return tuple(sorted(validators, key=lambda validator: validator.cost))
+
+
+class _AllowedValues:
+  """A union of allowed values and inclusive intervals, merged for bisect.
+
+  The intervals are sorted and overlapping ones merged once, so checking a
+  value is one binary search over the interval starts. When every interval is
+  a single value they are also kept in a frozenset, so checking is a hash
+  lookup. Error messages, which name the allowed range nearest to the invalid
+  value, are built the first time each range is reported.
+  """
+
+  __slots__ = ('_ends', '_errors', '_starts', '_values')
+
+  def __init__(self, allowed: Iterable[Any]) -> None:
+    intervals = []
+    for item in allowed:
+      if isinstance(item, tuple):
+        low, high = item
+        if low > high:
+          raise ValueError(
+            f'Allowed interval {item!r} has its start after its end.'
+          )
+      else:
+        low = high = item
+      intervals.append((low, high))
+    if not intervals:
+      raise ValueError('At least one allowed value or interval is required.')
+    intervals.sort(key=lambda interval: interval[0])
+    starts: list[Any] = []
+    ends: list[Any] = []
+    for low, high in intervals:
+      if ends and low <= ends[-1]:
+        ends[-1] = max(ends[-1], high)
+      else:
+        starts.append(low)
+        ends.append(high)
+    self._starts = starts
+    self._ends = ends
+    self._values = frozenset(starts) if starts == ends else None
+    self._errors: dict[int, _InvalidInput] = {}
+
+  @property
+  def intervals(self) -> tuple[tuple[Any, Any], ...]:
+    return tuple(zip(self._starts, self._ends))
+
+  def error_for(self, value: Any) -> _InvalidInput | None:
+    """Returns None if `value` is allowed, or else the error to display."""
+    if self._values is not None and value in self._values:
+      return None
+    index = bisect.bisect_right(self._starts, value) - 1
+    if self._values is None and index >= 0 and value <= self._ends[index]:
+      return None
+    return self._nearest_error(value, index)
+
+  def _nearest_error(self, value: Any, index: int) -> _InvalidInput:
+    """Returns the error naming the interval nearest to a disallowed value.
+
+    `index` is the interval starting at or before the value, or -1.
+    """
+    if index < 0:
+      nearest = 0
+    elif index + 1 == len(self._starts):
+      nearest = index
+    else:
+      try:
+        below = value - self._ends[index]
+        above = self._starts[index + 1] - value
+        nearest = index if below <= above else index + 1
+      except TypeError:
+        nearest = index
+    error = self._errors.get(nearest)
+    if error is None:
+      low, high = self._starts[nearest], self._ends[nearest]
+      if low == high:
+        message = (
+          f'Error: Value is not allowed. The nearest allowed value is {low}.'
+        )
+      else:
+        message = (
+          'Error: Value is not allowed. The nearest allowed range is '
+          f'{low} to {high}.'
+        )
+      error = self._errors[nearest] = _InvalidInput(message, 'allowed')
+    return error
+
+
+class InputTimeout(TimeoutError):
+  """Raised when a prompt with a timeout or deadline receives no valid input."""
+
+
+def _timed_input(prompt: str | None, timeout: float | None) -> str | None:
+  """Reads a line like `input`, or returns None if `timeout` seconds pass first.
+
+  Reads through `sys.stdin`, so lines an earlier `input()` read ahead from
+  piped stdin are returned first, and waits with `select` only once its buffer
+  is empty, so a timeout leaves no thread blocked in `input()`. If stdin has no
+  selectable file descriptor, as with Windows consoles or a replaced
+  `sys.stdin`, this falls back to a blocking `input()`.
+  """
+  if timeout is None:
+    return input(prompt) if prompt else input()
+  fd = _selectable_fileno(sys.stdin)
+  if fd is None:
+    return input(prompt) if prompt else input()
+  if prompt:
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+  return _read_line(sys.stdin, fd, timeout)
+
+
+def _selectable_fileno(stream: Any) -> int | None:
+  """Returns the file descriptor of a stream if `select` can wait on it."""
+  import select
+
+  try:
+    fd = stream.fileno()
+    select.select([fd], [], [], 0)
+  except (AttributeError, OSError, ValueError):
+    return None
+  return fd
+
+
+def _read_available(stream: IO[Any], fd: int) -> Any:
+  """Reads as much of the next line of a stream as is available now.
+
+  Returns the line, the start of it if the rest has not arrived yet, or an
+  empty string or bytes if nothing is available or the stream is at end of
+  file. The file descriptor is non-blocking only while it is read, since it
+  may be shared with stdout. Unbuffered binary streams are read a byte at a
+  time, so no input beyond the line is consumed.
+  """
+  blocking = os.get_blocking(fd)
+  os.set_blocking(fd, False)
+  try:
+    if not isinstance(stream, io.RawIOBase):
+      return stream.readline()
+    line = bytearray()
+    while not line.endswith(b'\n'):
+      try:
+        byte = os.read(fd, 1)
+      except BlockingIOError:
+        break
+      if not byte:
+        break
+      line += byte
+    return bytes(line)
+  finally:
+    os.set_blocking(fd, blocking)
+
+
+def _read_line(stream: IO[Any], fd: int, timeout: float) -> str | None:
+  """Reads a line from a stream, or returns None on timeout.
+
+  Raises:
+    EOFError: If the stream is at end of file.
+  """
+  import select
+
+  expires_at = time.monotonic() + timeout
+  line = _read_available(stream, fd)
+  while line[-1:] not in _LINE_ENDS:
+    remaining = max(expires_at - time.monotonic(), 0.0)
+    if not select.select([fd], [], [], remaining)[0]:
+      return None
+    chunk = _read_available(stream, fd)
+    if not chunk:
+      if not line:
+        raise EOFError('EOF when reading a line')
+      break
+    line += chunk
+  return _decode_line(line, getattr(stream, 'encoding', None))
+
+
+def _decode_line(line: str | bytes, encoding: str | None = None) -> str:
+  """Returns a line without its terminator, decoding bytes leniently.
+
+  Undecodable bytes become U+FFFD, so they fail validation like any other
+  invalid input instead of raising out of the prompt.
+  """
+  if isinstance(line, (bytes, bytearray)):
+    line = line.decode(encoding or 'utf-8', 'replace')
+  return line.removesuffix('\n').removesuffix('\r')
+
+
+def _attempt_timeout(
+  timeout: float | None, expires_at: float | None
+) -> float | None:
+  """Returns how long the next attempt may wait under a timeout and deadline."""
+  if expires_at is None:
+    return timeout
+  remaining = max(expires_at - time.monotonic(), 0.0)
+  return remaining if timeout is None else min(timeout, remaining)
+
+
+def _timeout_error(
+  timeout: float | None, deadline: float | None, expires_at: float | None
+) -> InputTimeout:
+  """Returns the InputTimeout for whichever of the two limits expired."""
+  if expires_at is not None and time.monotonic() >= expires_at:
+    return InputTimeout(f'No valid input received within {deadline} seconds.')
+  return InputTimeout(f'No input received within {timeout} seconds.')
+
+
+class _ConsoleSession:
+  """Prompts on the real terminal with the builtin `input` and `print`."""
+
+  __slots__ = ()
+
+  def input(self, prompt: str | None, timeout: float | None) -> str | None:
+    return _timed_input(prompt, timeout)
+
+  def print(self, message: str) -> None:
+    print(message)
+
+  def flush(self) -> None:
+    pass
+
+
+_CONSOLE_SESSION = _ConsoleSession()
+
+
+class _StreamSession:
+  """Prompts on caller-supplied streams, buffering output between reads.
+
+  Error messages are collected and written together with the next prompt, so
+  each attempt costs one write and one flush however much it prints. Text and
+  binary streams are both accepted; binary streams are UTF-8 encoded. With a
+  timeout, a stream with a selectable file descriptor is waited on with
+  `select` once its buffer is empty, like stdin.
+  """
+
+  __slots__ = ('_binary_stdout', '_pending', '_stdin', '_stdout')
+
+  def __init__(self, stdin: IO[Any] | None, stdout: IO[Any] | None) -> None:
+    self._stdin: IO[Any] = sys.stdin if stdin is None else stdin
+    self._stdout: IO[Any] = sys.stdout if stdout is None else stdout
+    self._binary_stdout = isinstance(
+      self._stdout, (io.RawIOBase, io.BufferedIOBase)
+    )
+    self._pending: list[str] = []
+
+  def input(self, prompt: str | None, timeout: float | None) -> str | None:
+    if prompt:
+      self._pending.append(prompt)
+    self.flush()
+    if timeout is not None:
+      fd = _selectable_fileno(self._stdin)
+      if fd is not None:
+        return _read_line(self._stdin, fd, timeout)
+    line = self._stdin.readline()
+    if not line:
+      raise EOFError('EOF when reading a line')
+    return _decode_line(line)
+
+  def print(self, message: str) -> None:
+    self._pending.append(f'{message}\n')
+
+  def flush(self) -> None:
+    if self._pending:
+      output = ''.join(self._pending)
+      self._pending.clear()
+      self._stdout.write(output.encode() if self._binary_stdout else output)
+    self._stdout.flush()
+
+
+def _prompt_session(
+  stdin: IO[Any] | None, stdout: IO[Any] | None
+) -> _ConsoleSession | _StreamSession | SessionReplayer:
+  """Returns the session for a prompt on the given streams, if any."""
+  if stdin is None and stdout is None:
+    return _REPLAYERS[-1] if _REPLAYERS else _CONSOLE_SESSION
+  return _StreamSession(stdin, stdout)
+
+
+_OUTCOME_EVENT_KINDS = frozenset(
+  (
+    InputEventKind.VALUE_ACCEPTED,
+    InputEventKind.CONVERSION_FAILED,
+    InputEventKind.BOUNDS_VIOLATED,
+  )
+)
+
+
+def _outcome_detail(event: InputEvent) -> str | None:
+  """Returns the accepted value's repr or the error message of an event."""
+  if event.kind is InputEventKind.VALUE_ACCEPTED:
+    return repr(event.value)
+  return event.message
+
+
+class SessionRecorder:
+  """An input hook that appends each line entered at a prompt to a log.
+
+  Every attempt at a prompt is appended to the log as one line holding a JSON
+  array, `[offset, wait, prompt, raw_input, outcome, detail]`:
+
+  - offset: The seconds since recording started when the line arrived.
+  - wait: The think-time between showing the prompt and the line arriving.
+  - prompt: The prompt shown.
+  - raw_input: The line entered, or null if the prompt timed out.
+  - outcome: The `InputEventKind` value of the result, e.g. 'value_accepted'.
+  - detail: The repr of the accepted value or the error message displayed.
+
+  The log is opened for appending and is line buffered, so an interrupted
+  session keeps every completed line. Replay it with `SessionReplayer`.
+
+  Example:
+    >>> with SessionRecorder('operators.log'):
+    ...   run_operator_console()
+  """
+
+  def __init__(self, path: str | os.PathLike[str]) -> None:
+    """Initializes the recorder. Recording starts when the block is entered.
+
+    Args:
+      path: The log file to append to. It is created if it does not exist.
+    """
+    import threading
+
+    self._path = path
+    self._log: IO[str] | None = None
+    self._start = 0.0
+    self._lock = threading.Lock()
+    self._received = threading.local()
+
+  def __enter__(self) -> Self:
+    self._log = open(self._path, 'a', encoding='utf-8', buffering=1)
+    self._start = time.monotonic()
+    add_input_hook(self)
+    return self
+
+  def __exit__(self, *unused_exc_info: object) -> None:
+    remove_input_hook(self)
+    if self._log is not None:
+      self._log.close()
+      self._log = None
+
+  def __call__(self, event: InputEvent) -> None:
+    kind = event.kind
+    if kind is InputEventKind.INPUT_RECEIVED:
+      # The outcome of a line is emitted on the same thread right after it is
+      # received, so the pair is joined through a thread local.
+      self._received.event = (time.monotonic() - self._start, event)
+    elif kind is InputEventKind.INPUT_TIMED_OUT:
+      self._append(
+        time.monotonic() - self._start, event.duration, event, None, None
+      )
+    elif kind in _OUTCOME_EVENT_KINDS:
+      received = getattr(self._received, 'event', None)
+      if received is not None:
+        self._received.event = None
+        offset, received_event = received
+        self._append(
+          offset,
+          received_event.duration,
+          event,
+          event.raw_input,
+          _outcome_detail(event),
+        )
+
+  def _append(
+    self,
+    offset: float,
+    wait: float | None,
+    event: InputEvent,
+    raw_input: str | None,
+    detail: str | None,
+  ) -> None:
+    import json
+
+    record = [
+      round(offset, 6),
+      None if wait is None else round(wait, 6),
+      event.prompt,
+      raw_input,
+      event.kind.value,
+      detail,
+    ]
+    line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+    with self._lock:
+      if self._log is not None:
+        self._log.write(f'{line}\n')
+
+
+class ReplayMismatch(NamedTuple):
+  """A difference between a recorded attempt and its replay.
+
+  Attributes:
+    line_number: The line of the log holding the recorded attempt.
+    field: 'prompt' if a different prompt read the line, or 'outcome' if the
+      line was accepted or rejected differently.
+    recorded: The recorded prompt, or the recorded (outcome, detail) pair.
+    replayed: The replayed prompt, or the replayed (outcome, detail) pair.
+  """
+
+  line_number: int
+  field: str
+  recorded: Any
+  replayed: Any
+
+
+class ReplayReport(NamedTuple):
+  """The throughput and behavioral drift measured by a `SessionReplayer`.
+
+  Attributes:
+    inputs: The number of recorded lines replayed.
+    elapsed: The seconds the replay took.
+    mismatches: Every recorded attempt that replayed differently.
+  """
+
+  inputs: int
+  elapsed: float
+  mismatches: list[ReplayMismatch]
+
+  @property
+  def inputs_per_second(self) -> float:
+    """The replayed lines per second."""
+    return self.inputs / self.elapsed if self.elapsed else float('inf')
+
+  @property
+  def ok(self) -> bool:
+    """Whether every attempt replayed as it was recorded."""
+    return not self.mismatches
+
+
+class SessionReplayer:
+  """Drives the console prompts from a `SessionRecorder` log.
+
+  While the block runs, every prompt that would read the terminal, i.e. any
+  `*_input` call or `InputSpec.prompt` without `stdin` or `stdout`, reads the
+  next recorded line instead, and a recorded timeout times the prompt out.
+  Error messages are not printed. Each line is delivered at its recorded
+  offset divided by `speed`, and each prompt and outcome is compared with the
+  recording, so a day of traffic can be replayed against a new build to
+  measure throughput and catch behavioral drift.
+
+  Example:
+    >>> with SessionReplayer('operators.log', speed=None) as replayer:
+    ...   run_operator_console()
+    >>> replayer.report().mismatches
+    []
+  """
+
+  def __init__(
+    self, path: str | os.PathLike[str], speed: float | None = 1.0
+  ) -> None:
+    """Initializes the replayer. Replay starts when the block is entered.
+
+    Args:
+      path: The log written by `SessionRecorder`.
+      speed: How many times faster than recorded to deliver the lines, e.g.
+        1.0 for real time or 60.0 to replay an hour in a minute. None
+        delivers every line as soon as it is read.
+
+    Raises:
+      ValueError: If `speed` is not positive.
+    """
+    if speed is not None and speed <= 0:
+      raise ValueError(f'({speed=}) must be positive.')
+    self._path = path
+    self._speed = speed
+    self._log: IO[str] | None = None
+    self._start = 0.0
+    self._end: float | None = None
+    self._line_number = 0
+    self._inputs = 0
+    self._expected: tuple[int, str, str | None] | None = None
+    self._mismatches: list[ReplayMismatch] = []
+
+  def __enter__(self) -> Self:
+    self._log = open(self._path, encoding='utf-8')
+    self._start = time.monotonic()
+    self._end = None
+    add_input_hook(self)
+    _REPLAYERS.append(self)
+    return self
+
+  def __exit__(self, *unused_exc_info: object) -> None:
+    self._end = time.monotonic()
+    _REPLAYERS.remove(self)
+    remove_input_hook(self)
+    if self._log is not None:
+      self._log.close()
+      self._log = None
+
+  def input(
+    self, prompt: str | None, unused_timeout: float | None
+  ) -> str | None:
+    """Returns the next recorded line, or None for a recorded timeout.
+
+    Raises:
+      EOFError: If every recorded line has been replayed.
+    """
+    import json
+
+    line = self._log.readline() if self._log is not None else ''
+    if not line:
+      raise EOFError('EOF when reading a line')
+    self._line_number += 1
+    offset, _, recorded_prompt, raw_input, outcome, detail = json.loads(line)
+    if recorded_prompt != prompt:
+      self._mismatches.append(
+        ReplayMismatch(self._line_number, 'prompt', recorded_prompt, prompt)
+      )
+    if self._speed is not None:
+      delay = self._start + offset / self._speed - time.monotonic()
+      if delay > 0:
+        time.sleep(delay)
+    self._inputs += 1
+    self._expected = (self._line_number, outcome, detail)
+    return raw_input
+
+  def print(self, message: str) -> None:
+    pass
+
+  def flush(self) -> None:
+    pass
+
+  def __call__(self, event: InputEvent) -> None:
+    if self._expected is None:
+      return
+    kind = event.kind
+    replayed: tuple[str, str | None]
+    if kind is InputEventKind.INPUT_TIMED_OUT:
+      replayed = (kind.value, None)
+    elif kind in _OUTCOME_EVENT_KINDS:
+      replayed = (kind.value, _outcome_detail(event))
+    else:
+      return
+    line_number, *recorded = self._expected
+    self._expected = None
+    if tuple(recorded) != replayed:
+      self._mismatches.append(
+        ReplayMismatch(line_number, 'outcome', tuple(recorded), replayed)
+      )
+
+  def report(self) -> ReplayReport:
+    """Returns the lines replayed so far, how long it took and any drift."""
+    end = time.monotonic() if self._end is None else self._end
+    return ReplayReport(self._inputs, end - self._start, list(self._mismatches))
+
+
+_REPLAYERS: list[SessionReplayer] = []
+
+
+def _parse_observed(
+  parse: Callable[[str], Any],
+  prompt: str | None,
+  user_input: str,
+  think_time: float,
+) -> Any:
+  """Calls `parse` on the input and emits the events for it to the hooks."""
+  _emit_input_event(
+    InputEvent(
+      InputEventKind.INPUT_RECEIVED, prompt, user_input, duration=think_time
+    )
+  )
+  start = time.perf_counter()
+  result = parse(user_input)
+  parse_time = time.perf_counter() - start
+  if not isinstance(result, _InvalidInput):
+    event = InputEvent(
+      InputEventKind.VALUE_ACCEPTED,
+      prompt,
+      user_input,
+      value=result,
+      duration=parse_time,
+    )
+  elif result.bound is not None:
+    event = InputEvent(
+      InputEventKind.BOUNDS_VIOLATED,
+      prompt,
+      user_input,
+      message=result.message,
+      bound=result.bound,
+      duration=parse_time,
+    )
+  else:
+    event = InputEvent(
+      InputEventKind.CONVERSION_FAILED,
+      prompt,
+      user_input,
+      message=result.message,
+      duration=parse_time,
+    )
+  _emit_input_event(event)
+  return result
+
+
+def _prompt_loop(
+  session: _ConsoleSession | _StreamSession | SessionReplayer,
+  parse: Callable[[str], Any],
+  prompt: str | None,
+  timeout: float | None,
+  deadline: float | None,
+  default_value: Any = None,
+) -> Any:
+  """Prompts on a session until `parse` accepts a line, leaving output unflushed.
+
+  This is the prompt loop of every prompt that reads one line at a time, so
+  they all honour `stdout`, emit hook events and can be recorded and replayed.
+
+  Args:
+    session: The session to read lines from and print error messages to.
+    parse: Returns the value for a line, or an _InvalidInput if it is invalid.
+    prompt: The prompt shown for each line, if any.
+    timeout: The seconds to wait for each line of input.
+    deadline: The seconds to wait for valid input in total.
+    default_value: The value returned if the timeout or deadline expires.
+
+  Raises:
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+  """
+  expires_at = None if deadline is None else time.monotonic() + deadline
+  while True:
+    attempt_timeout = _attempt_timeout(timeout, expires_at)
+    if _INPUT_HOOKS:
+      _emit_input_event(InputEvent(InputEventKind.PROMPT_SHOWN, prompt))
+      start = time.perf_counter()
+      user_input = session.input(prompt, attempt_timeout)
+      think_time = time.perf_counter() - start
+      if user_input is None:
+        _emit_input_event(
+          InputEvent(
+            InputEventKind.INPUT_TIMED_OUT, prompt, duration=think_time
+          )
+        )
+        return _timed_out(session, default_value, timeout, deadline, expires_at)
+      result = _parse_observed(parse, prompt, user_input, think_time)
+    else:
+      user_input = session.input(prompt, attempt_timeout)
+      if user_input is None:
+        return _timed_out(session, default_value, timeout, deadline, expires_at)
+      result = parse(user_input)
+    if not isinstance(result, _InvalidInput):
+      return result
+    session.print(result.message)
+
+
+def _timed_out(
+  session: _ConsoleSession | _StreamSession | SessionReplayer,
+  default_value: Any,
+  timeout: float | None,
+  deadline: float | None,
+  expires_at: float | None,
+) -> Any:
+  """Ends the prompt line and returns the default or raises InputTimeout."""
+  session.print('')
+  if default_value is not None:
+    return default_value
+  raise _timeout_error(timeout, deadline, expires_at)
+
+
+class InputSpec(Generic[_T]):
+  """A reusable, precompiled set of validation rules for one type of input.
+
+  The bounds and default value are checked once when the spec is created and
+  every error message is built up front, so each call to `parse` only converts
+  the input and compares it against the bounds. Use one of the typed
+  subclasses (`IntSpec`, `FloatSpec`, `DecimalSpec` or `DateTimeSpec`) rather
+  than instantiating this class directly.
+
+  Example:
+    >>> spec = IntSpec(min_value=0, max_value=100, default_value=5)
+    >>> spec.parse('42')
+    42
+    >>> list(spec.parse_many(['1', '', '3']))
+    [1, 5, 3]
+  """
+
+  __slots__ = (
+    '_allowed',
+    '_bytes_conversion_function',
+    '_cached_max_error',
+    '_cached_min_error',
+    '_cached_type_error',
+    '_checks',
+    '_conversion_function',
+    '_default_value',
+    '_max_value',
+    '_min_value',
+    '_syntax_screen',
+    '_type_error_message',
+    '_validators',
+  )
+
+  def __init__(
+    self,
+    conversion_function: Callable[[str], _T],
+    min_value: _T | None,
+    max_value: _T | None,
+    default_value: _T | None,
+    type_error_message: str,
+    bytes_conversion_function: Callable[[_BytesLike], _T] | None = None,
+    allowed: Iterable[_T | tuple[_T, _T]] | None = None,
+    validators: Iterable[Validator] | None = None,
+    syntax_screen: Callable[[str], object] | None = None,
+  ) -> None:
+    """Checks the configuration and precomputes the error messages.
+
+    Args:
+      conversion_function: Function to try convert the user input string to the
+        desired type.
+      min_value: The minimum acceptable value for the input, if any.
+      max_value: The maximum acceptable value for the input, if any.
+      default_value: A value to be used when the user inputs an empty string.
+        If not specified, empty input will not be allowed.
+      type_error_message: The error message displayed when the user enters a
+        value not of the specified type.
+      bytes_conversion_function: Function to try convert a line of bytes, which
+        may end with its line terminator, to the desired type without decoding
+        it to a string first. If not provided, bytes are decoded as UTF-8 and
+        passed to `conversion_function`.
+      allowed: The values and inclusive `(low, high)` intervals the input must
+        fall in, if restricted beyond `min_value` and `max_value`.
+      validators: Custom checks run, from the cheapest, on values within the
+        bounds, stopping at the first failure.
+      syntax_screen: Returns a falsy value for input that `conversion_function`
+        certainly rejects, so `try_parse` can reject it without raising. It
+        must accept everything `conversion_function` accepts.
+
+    Raises:
+      ValueError: If both `min_value` and `max_value` are specified, and
+        `min_value` is greater than `max_value`.
+      ValueError: If `default_value` is specified but falls outside the range
+        defined by `min_value` or `max_value`, is not in `allowed` or fails a
+        validator.
+      ValueError: If `allowed` is empty or has an interval whose start is
+        after its end.
+    """
+    if default_value is not None or (
+      min_value is not None and max_value is not None
+    ):
+      _check_bounds_arguments(min_value, max_value, default_value)
+    self._allowed = None if allowed is None else _AllowedValues(allowed)
+    if (
+      self._allowed is not None
+      and default_value is not None
+      and self._allowed.error_for(default_value) is not None
+    ):
+      raise ValueError(f'({default_value=}) is not an allowed value.')
+    self._validators = _sorted_validators(validators)
+    self._checks: tuple[tuple[Callable[[Any], bool], _InvalidInput], ...] = ()
+    if self._validators:
+      for validator in self._validators:
+        if default_value is not None and not validator.check(default_value):
+          raise ValueError(f'({default_value=}) fails: {validator.message}')
+      self._checks = tuple(
+        (validator.check, _InvalidInput(validator.message, 'validator'))
+        for validator in self._validators
+      )
+    self._conversion_function: Callable[[str], _T] = conversion_function
+    self._min_value: _T | None = min_value
+    self._max_value: _T | None = max_value
+    self._default_value: _T | None = default_value
+    self._type_error_message = type_error_message
+    self._cached_type_error: _InvalidInput | None = None
+    self._cached_min_error: _InvalidInput | None = None
+    self._cached_max_error: _InvalidInput | None = None
+    self._bytes_conversion_function: Callable[[_BytesLike], _T] | None = (
+      bytes_conversion_function
+    )
+    self._syntax_screen = syntax_screen
+
+  @property
+  def _type_error(self) -> _InvalidInput:
+    error = self._cached_type_error
+    if error is None:
+      error = self._cached_type_error = _InvalidInput(self._type_error_message)
+    return error
+
+  @property
+  def _min_error(self) -> _InvalidInput:
+    error = self._cached_min_error
+    if error is None:
+      error = self._cached_min_error = _InvalidInput(
+        f'Error: Value must be at least {self._min_value}.', 'min_value'
+      )
+    return error
+
+  @property
+  def _max_error(self) -> _InvalidInput:
+    error = self._cached_max_error
+    if error is None:
+      error = self._cached_max_error = _InvalidInput(
+        f'Error: Value must be at most {self._max_value}.', 'max_value'
+      )
+    return error
+
+  def __repr__(self) -> str:
+    return (
+      f'{type(self).__name__}(min_value={self._min_value!r}, '
+      f'max_value={self._max_value!r}, '
+      f'default_value={self._default_value!r})'
+    )
+
+  @property
+  def min_value(self) -> _T | None:
+    """The minimum acceptable value, or None if unbounded below."""
+    return self._min_value
+
+  @property
+  def max_value(self) -> _T | None:
+    """The maximum acceptable value, or None if unbounded above."""
+    return self._max_value
+
+  @property
+  def default_value(self) -> _T | None:
+    """The value used for empty input, or None if empty input is invalid."""
+    return self._default_value
+
+  @property
+  def type_error_message(self) -> str:
+    """The error message for input that is not of the specified type."""
+    return self._type_error_message
+
+  @property
+  def allowed(self) -> tuple[tuple[_T, _T], ...] | None:
+    """The merged, sorted `(low, high)` allowed intervals, or None if unset."""
+    return None if self._allowed is None else self._allowed.intervals
+
+  @property
+  def validators(self) -> tuple[Validator, ...]:
+    """The custom validators, in the order they run."""
+    return self._validators
+
+  def _parse(self, user_input: str) -> _T | _InvalidInput:
+    """Converts and validates one line of user input.
+
+    Returns:
+      T | _InvalidInput: The validated value, or the default value if it is set
+        and the input is blank. Otherwise the error message to display.
+    """
+    if self._default_value is not None and not user_input.strip():
+      return self._default_value
+    try:
+      value = self._conversion_function(user_input)
+      if self._min_value is not None and value < self._min_value:
+        return self._min_error
+      if self._max_value is not None and value > self._max_value:
+        return self._max_error
+      if self._allowed is not None:
+        error = self._allowed.error_for(value)
+        if error is not None:
+          return error
+    # Errors raised by decimal, e.g. InvalidOperation, are ArithmeticErrors.
+    except (ValueError, ArithmeticError):
+      return self._type_error
+    for check, error in self._checks:
+      if not check(value):
+        return error
+    return value
+
+  def _parse_bytes(self, raw: _BytesLike) -> _T | _InvalidInput:
+    """Like `_parse`, but for a line of bytes that may end with its terminator.
+
+    With a bytes converter the line is converted without creating a string for
+    it. Blank input never converts, so a blank line only has to be detected
+    once conversion fails, and so does a line that is not ASCII: int() and
+    float() only convert ASCII bytes, while `parse` also accepts other Unicode
+    digits and whitespace, so such a line is decoded and parsed as a string.
+    """
+    convert = self._bytes_conversion_function
+    if convert is None:
+      return self._parse_utf8(raw)
+    try:
+      value = convert(raw)
+      if self._min_value is not None and value < self._min_value:
+        return self._min_error
+      if self._max_value is not None and value > self._max_value:
+        return self._max_error
+      if self._allowed is not None:
+        error = self._allowed.error_for(value)
+        if error is not None:
+          return error
+    except (ValueError, ArithmeticError):
+      line = bytes(raw)
+      if not line.isascii():
+        return self._parse_utf8(line)
+      if self._default_value is not None and not line.strip():
+        return self._default_value
+      return self._type_error
+    for check, error in self._checks:
+      if not check(value):
+        return error
+    return value
+
+  def _parse_utf8(self, raw: _BytesLike) -> _T | _InvalidInput:
+    """Like `_parse_bytes`, but decodes the line to a string to parse it."""
+    try:
+      text = str(raw, 'utf-8')
+    except UnicodeDecodeError:
+      return self._type_error
+    return self._parse(text.removesuffix('\n').removesuffix('\r'))
+
+  def parse(self, user_input: str) -> _T:
+    """Converts and validates a string without prompting.
+
+    Args:
+      user_input: The string to convert, e.g. one line of user input.
+
+    Returns:
+      T: The validated value, or the default value if it is set and
+        `user_input` is blank.
+
+    Raises:
+      ValueError: If `user_input` is invalid. The message is the same error
+        message `prompt` would display.
+    """
+    result = self._parse(user_input)
+    if not isinstance(result, _InvalidInput):
+      return result
+    raise ValueError(result.message)
+
+  def parse_bytes(self, raw: _BytesLike) -> _T:
+    """Converts and validates a line of ASCII or UTF-8 bytes without prompting.
+
+    Int and float input is converted straight from the bytes, without
+    decoding the line to a string first, e.g. for lines read from a binary
+    file or an mmap; other types are decoded as UTF-8. Unlike `parse`, a
+    trailing line terminator is allowed, and int and float input may also have
+    surrounding whitespace.
+
+    Args:
+      raw: The bytes to convert.
+
+    Returns:
+      T: The validated value, or the default value if it is set and `raw` is
+        blank.
+
+    Raises:
+      ValueError: If `raw` is invalid. The message is the same error message
+        `prompt` would display.
+    """
+    result = self._parse_bytes(raw)
+    if not isinstance(result, _InvalidInput):
+      return result
+    raise ValueError(result.message)
+
+  def try_parse(self, user_input: str) -> ParseResult:
+    """Converts and validates a string, returning errors instead of raising.
+
+    Accepts and rejects exactly the same input as `parse`, but input that is
+    clearly not of the right type is screened out without raising and
+    catching an exception, which makes rejecting it several times faster.
+
+    Args:
+      user_input: The string to convert, e.g. one line of user input.
+
+    Returns:
+      ParseResult: The validated value, or the error code and message.
+    """
+    return self.try_parse_many((user_input,))[0]
+
+  def try_parse_many(self, user_inputs: Iterable[str]) -> list[ParseResult]:
+    """Converts and validates many strings, returning errors inline.
+
+    Args:
+      user_inputs: The strings to convert, e.g. the lines of a file.
+
+    Returns:
+      list[ParseResult]: The result for each string, in order.
+    """
+    screen = self._syntax_screen
+    parse = self._parse
+    type_error = self._type_error
+    blank_is_default = self._default_value is not None
+    results: list[ParseResult] = []
+    append = results.append
+    for user_input in user_inputs:
+      # Most valid input ends with a digit, so only the rest is screened.
+      if (
+        screen is not None
+        and user_input[-1:] not in _ASCII_DIGITS
+        and not screen(user_input)
+        and not (blank_is_default and not user_input.strip())
+      ):
+        append(type_error.as_result())
+        continue
+      result = parse(user_input)
+      if type(result) is _InvalidInput:
+        append(result.as_result())
+      else:
+        # Skips the NamedTuple's Python-level __new__ for each valid value.
+        append(_new_tuple(ParseResult, (result, None, None)))
+    return results
+
+  def parse_many(self, user_inputs: Iterable[str]) -> Iterator[_T]:
+    """Lazily converts and validates many strings without prompting.
+
+    Args:
+      user_inputs: The strings to convert, e.g. the lines of a file.
+
+    Yields:
+      T: Each validated value, in order.
+
+    Raises:
+      ValueError: At the first invalid string. The message is prefixed with
+        its 1-based line number, e.g. 'Line 3: Error: ...'.
+    """
+    parse = self._parse
+    for line_number, user_input in enumerate(user_inputs, start=1):
+      result = parse(user_input)
+      if not isinstance(result, _InvalidInput):
+        yield result
+        continue
+      raise ValueError(f'Line {line_number}: {result.message}')
+
+  def prompt(
+    self,
+    prompt: str | None = None,
+    timeout: float | None = None,
+    deadline: float | None = None,
+    stdin: IO[Any] | None = None,
+    stdout: IO[Any] | None = None,
+  ) -> _T:
+    """Prompts for input until valid input of the specified type is entered.
+
+    Args:
+      prompt: A message displayed when prompting for input. If not provided, no
+        prompt is shown.
+      timeout: The seconds to wait for each line of input.
+      deadline: The seconds to wait for valid input in total, across every
+        retry after invalid input.
+      stdin: A text or binary stream to read lines from instead of `input()`.
+      stdout: A text or binary stream to write the prompt and error messages
+        to instead of `print()`. Output is buffered and flushed once per line
+        read.
+
+    Returns:
+      T: Validated input of the specified type, or the default value if it is
+        set and the empty string is provided, or if it is set and the timeout
+        or deadline expires.
+
+    Raises:
+      InputTimeout: If the timeout or deadline expires and there is no default
+        value.
+      EOFError: If `stdin` reaches end of file before valid input is read.
+    """
+    if (
+      stdin is None
+      and stdout is None
+      and timeout is None
+      and deadline is None
+      and not _REPLAYERS
+      and not _INPUT_HOOKS
+    ):
+      # The plain console prompt, without a session to route it through.
+      while True:
+        result = self._parse(input(prompt) if prompt else input())
+        if not isinstance(result, _InvalidInput):
+          return result
+        print(result.message)
+    session = _prompt_session(stdin, stdout)
+    try:
+      return self._prompt_in_session(session, prompt, timeout, deadline)
+    finally:
+      session.flush()
+
+  def _prompt_in_session(
+    self,
+    session: _ConsoleSession | _StreamSession | SessionReplayer,
+    prompt: str | None,
+    timeout: float | None,
+    deadline: float | None,
+  ) -> _T:
+    """Runs the prompt loop on a session, leaving its output unflushed."""
+    return _prompt_loop(
+      session, self._parse, prompt, timeout, deadline, self._default_value
+    )
+
+  async def async_prompt(
+    self,
+    prompt: str | None = None,
+    reader: asyncio.StreamReader | None = None,
+    writer: asyncio.StreamWriter | None = None,
+  ) -> _T:
+    """Awaits input until valid input of the specified type is entered.
+
+    Behaves like `prompt`, except that lines are awaited from an asyncio
+    StreamReader so other tasks keep running while waiting.
+
+    Args:
+      prompt: A message displayed when prompting for input. If not provided, no
+        prompt is shown.
+      reader: The StreamReader to read lines from. Defaults to stdin, read
+        through the running event loop.
+      writer: A StreamWriter to write the prompt and error messages to instead
+        of stdout, e.g. the other half of a connection. It is drained once per
+        line read.
+
+    Returns:
+      T: Validated input of the specified type, or the default value if it is
+        set and the empty string is provided.
+
+    Raises:
+      EOFError: If the reader reaches end of file before valid input is read.
+      ValueError: If a line read from `reader` is longer than its limit.
+    """
+    while True:
+      if writer is not None:
+        if prompt:
+          writer.write(prompt.encode())
+        await writer.drain()
+      elif prompt:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+      if _INPUT_HOOKS:
+        _emit_input_event(InputEvent(InputEventKind.PROMPT_SHOWN, prompt))
+      start = time.perf_counter()
+      if reader is None:
+        user_input = await _read_stdin_line()
+      else:
+        line = await reader.readline()
+        if not line:
+          raise EOFError('EOF when reading a line')
+        user_input = _decode_line(line)
+      if _INPUT_HOOKS:
+        think_time = time.perf_counter() - start
+        result = _parse_observed(self._parse, prompt, user_input, think_time)
+      else:
+        result = self._parse(user_input)
+      if not isinstance(result, _InvalidInput):
+        return result
+      if writer is not None:
+        writer.write(f'{result.message}\n'.encode())
+      else:
+        print(result.message)
+
+
+class IntSpec(InputSpec[int]):
+  """Reusable validation rules for integer input, as used by `int_input`."""
+
+  __slots__ = ()
+
+  def __init__(
+    self,
+    min_value: int | None = None,
+    max_value: int | None = None,
+    default_value: int | None = None,
+    type_error_message: str | None = None,
+    allowed: Iterable[int | tuple[int, int]] | None = None,
+    validators: Iterable[Validator] | None = None,
+  ) -> None:
+    super().__init__(
+      int,
+      min_value,
+      max_value,
+      default_value,
+      type_error_message or _DEFAULT_INT_INPUT_TYPE_ERROR,
+      int,
+      allowed,
+      validators,
+      _compile(_INT_SYNTAX).fullmatch,
+    )
+
+
+class FloatSpec(InputSpec[float]):
+  """Reusable validation rules for float input, as used by `float_input`."""
+
+  __slots__ = ()
+
+  def __init__(
+    self,
+    min_value: float | None = None,
+    max_value: float | None = None,
+    default_value: float | None = None,
+    type_error_message: str | None = None,
+    allowed: Iterable[float | tuple[float, float]] | None = None,
+    validators: Iterable[Validator] | None = None,
+  ) -> None:
+    super().__init__(
+      float,
+      min_value,
+      max_value,
+      default_value,
+      type_error_message or _DEFAULT_FLOAT_INPUT_TYPE_ERROR,
+      float,
+      allowed,
+      validators,
+      _compile(_FLOAT_SYNTAX).fullmatch,
+    )
+
+
+class DecimalSpec(InputSpec['Decimal']):
+  """Reusable validation rules for Decimal input, as used by `decimal_input`.
+
+  With `places` or `max_digits`, input is parsed in a fixed-scale mode, e.g.
+  for amounts of money: values are quantized to `places` decimal places with
+  one preconfigured `decimal.Context`, whatever the ambient context is, and
+  input with too many places or digits is rejected. Plain decimal strings
+  within the scale, such as '1234.5', take a fast path: the scale and number
+  of digits are checked on the text, then the zero-padded text is converted
+  straight to a Decimal at the final scale and compared with the bounds. Input
+  with too many places or digits is rejected before any Decimal is built, but
+  out-of-range input still costs one.
+
+  Example:
+    >>> spec = DecimalSpec(min_value=Decimal(0), places=2, max_digits=10)
+    >>> spec.parse('19.9')
+    Decimal('19.90')
+    >>> spec.parse('19.999')
+    Traceback (most recent call last):
+      ...
+    ValueError: Error: Value must have at most 2 decimal places.
+  """
+
+  __slots__ = (
+    '_context',
+    '_digits_error',
+    '_max_digits',
+    '_places',
+    '_quantum',
+    '_rounding',
+    '_scale_error',
+  )
+
+  def __init__(
+    self,
+    min_value: Decimal | None = None,
+    max_value: Decimal | None = None,
+    default_value: Decimal | None = None,
+    type_error_message: str | None = None,
+    allowed: Iterable[Decimal | tuple[Decimal, Decimal]] | None = None,
+    validators: Iterable[Validator] | None = None,
+    places: int | None = None,
+    rounding: str | None = None,
+    max_digits: int | None = None,
+  ) -> None:
+    """Checks the configuration and precomputes the error messages.
+
+    Args:
+      min_value: The minimum acceptable Decimal, if any.
+      max_value: The maximum acceptable Decimal, if any.
+      default_value: A Decimal to be used when the user inputs an empty
+        string. If not specified, empty input will not be allowed.
+      type_error_message: A custom error message displayed when the user
+        enters an invalid Decimal.
+      allowed: The values and inclusive `(low, high)` intervals the input
+        must fall in, if any.
+      validators: Custom checks run, from the cheapest, on values within the
+        bounds.
+      places: If provided, values are quantized to this many decimal places,
+        e.g. 2 for cents, and input with more places is rejected unless
+        `rounding` is set. Infinities and NaNs are rejected.
+      rounding: A `decimal` rounding mode, e.g. `decimal.ROUND_HALF_UP`, used
+        to round input with more than `places` decimal places instead of
+        rejecting it. Requires `places`.
+      max_digits: If provided, the maximum number of digits in a value's
+        coefficient, after quantizing, e.g. 10 for a NUMERIC(10, 2) column.
+
+    Raises:
+      ValueError: If the bounds or default value are invalid, as for
+        `InputSpec`, or the default value has too many places or digits.
+      ValueError: If `places` is negative, `max_digits` is less than 1, or
+        `rounding` is not a rounding mode or is given without `places`.
+    """
+    if places is not None and places < 0:
+      raise ValueError(f'({places=}) must not be negative.')
+    if max_digits is not None and max_digits < 1:
+      raise ValueError(f'({max_digits=}) must be at least 1.')
+    if rounding is not None:
+      if places is None:
+        raise ValueError('rounding requires places.')
+      if rounding not in _ROUNDING_MODES:
+        raise ValueError(f'Unknown rounding mode: {rounding!r}.')
+    import decimal
+
+    super().__init__(
+      decimal.Decimal,
+      min_value,
+      max_value,
+      default_value,
+      type_error_message or _DEFAULT_DECIMAL_INPUT_TYPE_ERROR,
+      None,
+      allowed,
+      validators,
+      _compile(_DECIMAL_SYNTAX).fullmatch,
+    )
+    self._places = places
+    self._rounding = rounding
+    self._max_digits = max_digits
+    self._context: decimal.Context | None = None
+    if places is not None or max_digits is not None:
+      self._quantum = decimal.Decimal(1).scaleb(-(places or 0))
+      # The precision makes quantize signal a result with too many digits.
+      self._context = decimal.Context(
+        prec=max_digits or decimal.MAX_PREC,
+        rounding=rounding or decimal.ROUND_HALF_EVEN,
+        Emax=decimal.MAX_EMAX,
+        Emin=decimal.MIN_EMIN,
+        traps=[decimal.InvalidOperation],
+      )
+      self._scale_error = _InvalidInput(
+        f'Error: Value must have at most {places} decimal places.', 'places'
+      )
+      self._digits_error = _InvalidInput(
+        f'Error: Value must have at most {max_digits} digits.', 'max_digits'
+      )
+    if self._context is not None and default_value is not None:
+      result = self._scale(default_value)
+      if isinstance(result, _InvalidInput):
+        raise ValueError(f'({default_value=}) fails: {result.message}')
+      self._default_value = result
+
+  @property
+  def places(self) -> int | None:
+    """The decimal places values are quantized to, or None."""
+    return self._places
+
+  @property
+  def max_digits(self) -> int | None:
+    """The maximum number of digits in a value, or None."""
+    return self._max_digits
+
+  def _parse(self, user_input: str) -> Decimal | _InvalidInput:
+    if self._context is None:
+      return InputSpec._parse(self, user_input)
+    places = self._places
+    if places is not None:
+      # Plain strings of ASCII digits with an optional sign and point are
+      # checked for scale and digits as text, so only accepted values are
+      # ever converted, and straight to their final scale.
+      text = user_input.strip()
+      body = text[1:] if text.startswith(_SIGNS) else text
+      point = body.find('.')
+      digits = body if point < 0 else body.replace('.', '', 1)
+      if digits.isascii() and digits.isdecimal():
+        padding = places if point < 0 else places - len(body) + point + 1
+        if padding < 0:
+          if self._rounding is None:
+            return self._scale_error
+        else:
+          significant = digits.lstrip('0')
+          if significant or text[0] != '-':
+            max_digits = self._max_digits
+            if (
+              max_digits is not None
+              and significant
+              and len(significant) + padding > max_digits
+            ):
+              return self._digits_error
+            if padding:
+              text = f'{text}{"" if point >= 0 else "."}{"0" * padding}'
+            value = self._conversion_function(text)
+            if self._min_value is not None and value < self._min_value:
+              return self._min_error
+            if self._max_value is not None and value > self._max_value:
+              return self._max_error
+            if self._allowed is None and not self._checks:
+              return value
+            return self._check_allowed(value)
+    if self._default_value is not None and not user_input.strip():
+      return self._default_value
+    try:
+      # Exact whatever the ambient context. If that context does not trap
+      # invalid input it returns a NaN, which is rejected by _scale.
+      value = self._conversion_function(user_input)
+    except (ValueError, ArithmeticError):
+      return self._type_error
+    result = self._scale(value)
+    if isinstance(result, _InvalidInput):
+      return result
+    if self._min_value is not None and result < self._min_value:
+      return self._min_error
+    if self._max_value is not None and result > self._max_value:
+      return self._max_error
+    return self._check_allowed(result)
+
+  def _scale(self, value: Decimal) -> Decimal | _InvalidInput:
+    """Quantizes a value to `places` and checks its number of digits."""
+    _, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+      return self._type_error
+    places = self._places
+    if places is None:
+      if self._max_digits is not None and len(digits) > self._max_digits:
+        return self._digits_error
+      return value
+    if exponent < -places and self._rounding is None:
+      return self._scale_error
+    try:
+      return value.quantize(self._quantum, context=self._context)
+    except ArithmeticError:
+      return self._digits_error
+
+  def _check_allowed(self, value: Decimal) -> Decimal | _InvalidInput:
+    """Runs the allowed values and validators on a value within the bounds."""
+    if self._allowed is not None:
+      error = self._allowed.error_for(value)
+      if error is not None:
+        return error
+    for check, error in self._checks:
+      if not check(value):
+        return error
+    return value
+
+
+class DateTimeSpec(InputSpec['datetime']):
+  """Reusable validation rules for datetime input, like `datetime_input`."""
+
+  __slots__ = ()
+
+  def __init__(
+    self,
+    min_value: datetime | None = None,
+    max_value: datetime | None = None,
+    default_value: datetime | None = None,
+    type_error_message: str | None = None,
+    tz: tzinfo | None = None,
+    parser: DateTimeParser | None = None,
+    allowed: Iterable[datetime | tuple[datetime, datetime]] | None = None,
+    validators: Iterable[Validator] | None = None,
+  ) -> None:
+    """Checks the configuration and precomputes the error messages.
+
+    Args:
+      min_value: The minimum acceptable datetime, if any.
+      max_value: The maximum acceptable datetime, if any.
+      default_value: A datetime to be used when the user inputs an empty
+        string. If not specified, empty input will not be allowed.
+      type_error_message: A custom error message displayed when the user
+        enters an invalid datetime.
+      tz: If provided, every datetime (including the bounds and default) is
+        normalized to this timezone: aware datetimes are converted to it and
+        naive datetimes are assumed to be in it. This allows mixing aware and
+        naive input and bounds, which otherwise cannot be compared.
+      parser: The parser used to convert input, e.g. a `DateTimeParser` with a
+        custom cache size. Defaults to a parser shared by all datetime input.
+      allowed: The datetimes and inclusive `(start, end)` windows the input
+        must fall in, e.g. maintenance windows. Normalized to `tz` if given.
+      validators: Custom checks run, from the cheapest, on datetimes within
+        the bounds, e.g. that the input is a business day.
+    """
+    if parser is None:
+      parser = _default_datetime_parser()
+    conversion_function: Callable[[str], datetime] = parser._parse
+    if tz is not None:
+      min_value, max_value, default_value = (
+        None if value is None else _normalize_timezone(value, tz)
+        for value in (min_value, max_value, default_value)
+      )
+      conversion_function = functools.partial(
+        _parse_datetime_in_timezone, parser, tz
+      )
+      if allowed is not None:
+        allowed = [
+          (_normalize_timezone(item[0], tz), _normalize_timezone(item[1], tz))
+          if isinstance(item, tuple)
+          else _normalize_timezone(item, tz)
+          for item in allowed
+        ]
+    super().__init__(
+      conversion_function,
+      min_value,
+      max_value,
+      default_value,
+      type_error_message or _default_datetime_input_type_error(),
+      None,
+      allowed,
+      validators,
+      _compile(_DATETIME_SYNTAX).match,
+    )
+
+
+class ChoiceSpec(InputSpec[str]):
+  """Reusable rules for picking one of many options, as used by `choice_input`.
+
+  The options are indexed once: a dict resolves exact matches, and a sorted
+  list of keys resolves prefixes and tab completion with a binary search. Each
+  lookup therefore compares the input against O(log n) keys instead of
+  scanning every option, which keeps prompts over hundreds of thousands of
+  options responsive.
+
+  Example:
+    >>> spec = ChoiceSpec(['web-01', 'web-02', 'db-01'])
+    >>> spec.parse('db')
+    'db-01'
+    >>> spec.parse('web')
+    Traceback (most recent call last):
+      ...
+    ValueError: Error: 'web' matches more than one option: web-01, web-02.
+  """
+
+  __slots__ = ('_case_sensitive', '_choices', '_keys', '_options', '_prefixes')
+
+  def __init__(
+    self,
+    options: Iterable[str],
+    default_value: str | None = None,
+    type_error_message: str | None = None,
+    case_sensitive: bool = True,
+    prefixes: bool = True,
+  ) -> None:
+    """Indexes the options and precomputes the error messages.
+
+    Args:
+      options: The strings that may be entered. Duplicates are ignored.
+      default_value: An option to be used when the user inputs an empty
+        string. If not specified, empty input will not be allowed.
+      type_error_message: A custom error message displayed when the input
+        matches no option.
+      case_sensitive: If False, options are matched ignoring case, and the
+        option is returned as it was given.
+      prefixes: If True, a prefix of exactly one option selects that option.
+
+    Raises:
+      ValueError: If there are no options, or if two options differ only in
+        case and `case_sensitive` is False.
+      ValueError: If `default_value` is specified but is not an option.
+    """
+    choices: dict[str, str] = {}
+    for option in options:
+      key = option if case_sensitive else option.casefold()
+      if choices.setdefault(key, option) != option:
+        raise ValueError(
+          f'Options {choices[key]!r} and {option!r} differ only in case.'
+        )
+    if not choices:
+      raise ValueError('At least one option is required.')
+    if default_value is not None:
+      key = default_value if case_sensitive else default_value.casefold()
+      if key not in choices:
+        raise ValueError(f'(default_value={default_value!r}) is not an option.')
+      default_value = choices[key]
+    self._choices = choices
+    self._keys = sorted(choices)
+    self._options = tuple(choices[key] for key in self._keys)
+    self._case_sensitive = case_sensitive
+    self._prefixes = prefixes
+    super().__init__(
+      self.parse,
+      None,
+      None,
+      default_value,
+      type_error_message or _DEFAULT_CHOICE_INPUT_TYPE_ERROR,
+    )
+
+  def __repr__(self) -> str:
+    return (
+      f'{type(self).__name__}(<{len(self._options)} options>, '
+      f'default_value={self._default_value!r})'
+    )
+
+  @property
+  def options(self) -> tuple[str, ...]:
+    """The options, sorted by their matching key."""
+    return self._options
+
+  def _parse(self, user_input: str) -> str | _InvalidInput:
+    """Resolves one line of user input to an option.
+
+    Returns:
+      str | _InvalidInput: The option entered, or the only option starting
+        with the input, or the default value if it is set and the input is
+        blank. Otherwise the error message to display.
+    """
+    text = user_input.strip()
+    if self._default_value is not None and not text:
+      return self._default_value
+    key = text if self._case_sensitive else text.casefold()
+    option = self._choices.get(key)
+    if option is not None:
+      return option
+    if not self._prefixes or not key:
+      return self._type_error
+    keys = self._keys
+    index = bisect.bisect_left(keys, key)
+    if index == len(keys) or not keys[index].startswith(key):
+      return self._type_error
+    if index + 1 == len(keys) or not keys[index + 1].startswith(key):
+      return self._options[index]
+    matches = self._options[index : index + _MAX_LISTED_CHOICES]
+    listed = ', '.join(
+      option
+      for option, option_key in zip(matches, keys[index:])
+      if option_key.startswith(key)
+    )
+    more = index + _MAX_LISTED_CHOICES < len(keys) and keys[
+      index + _MAX_LISTED_CHOICES
+    ].startswith(key)
+    return _InvalidInput(
+      f'Error: {text!r} matches more than one option: '
+      f'{listed}{", ..." if more else "."}'
+    )
+
+  def complete(self, text: str, state: int) -> str | None:
+    """Returns the `state`-th option starting with `text`, or None.
+
+    Follows the `readline.set_completer` protocol, so it can also complete
+    input read some other way.
+    """
+    key = text if self._case_sensitive else text.casefold()
+    index = bisect.bisect_left(self._keys, key) + state
+    if index < len(self._keys) and self._keys[index].startswith(key):
+      return self._options[index]
+    return None
+
+  def prompt(
+    self,
+    prompt: str | None = None,
+    timeout: float | None = None,
+    deadline: float | None = None,
+    stdin: IO[Any] | None = None,
+    stdout: IO[Any] | None = None,
+  ) -> str:
+    """Prompts until an option is entered, with tab completion on a terminal.
+
+    Behaves like `InputSpec.prompt`. When reading from a terminal through
+    `input()`, the readline module, where available, completes the whole line
+    from the options when Tab is pressed.
+    """
+    if stdin is not None:
+      return super().prompt(prompt, timeout, deadline, stdin, stdout)
+    with _readline_completion(self.complete):
+      return super().prompt(prompt, timeout, deadline, stdin, stdout)
+
+
+@contextlib.contextmanager
+def _readline_completion(
+  completer: Callable[[str, int], str | None],
+) -> Iterator[None]:
+  """Completes the whole input line with `completer` while the block runs.
+
+  Does nothing if stdin is not a terminal or readline is unavailable, e.g. on
+  Windows. The previous completer and delimiters are restored afterwards, but
+  Tab stays bound to completion.
+  """
+  try:
+    import readline
+  except ImportError:
+    yield
+    return
+  try:
+    interactive = sys.stdin.isatty()
+  except (AttributeError, ValueError):
+    interactive = False
+  if not interactive:
+    yield
+    return
+  previous_completer = readline.get_completer()
+  previous_delims = readline.get_completer_delims()
+  readline.set_completer(completer)
+  readline.set_completer_delims('')
+  if 'libedit' in (readline.__doc__ or ''):
+    readline.parse_and_bind('bind ^I rl_complete')
+  else:
+    readline.parse_and_bind('tab: complete')
+  try:
+    yield
+  finally:
+    readline.set_completer(previous_completer)
+    readline.set_completer_delims(previous_delims)
+
+
+_SPEC_TYPES: dict[type, Callable[..., InputSpec[Any]]] = {
+  int: IntSpec,
+  float: FloatSpec,
+}
+# Standard library types with their own spec, resolved like
+# `_STDLIB_CONVERTERS` so that their modules are not imported up front.
+_STDLIB_SPEC_TYPES: dict[tuple[str, str], Callable[..., InputSpec[Any]]] = {
+  ('decimal', 'Decimal'): DecimalSpec,
+  ('datetime', 'datetime'): DateTimeSpec,
+}
+
+
+class _Converter(NamedTuple):
+  """How to convert input to one registered type."""
+
+  conversion_function: Callable[[str], Any]
+  type_error_message: str
+
+
+# A days group carries its own sign, as in str(timedelta(hours=-1)) ==
+# '-1 day, 23:00:00', so only a bare [-]H:MM[:SS] takes a leading minus.
+_CLOCK_DURATION_PATTERN = (
+  r'(?a)(?:(-?\d+) days?, |(-))?(\d+):(\d{2})(?::(\d{2}(?:\.\d{1,6})?))?'
+)
+_ISO_DURATION_PATTERN = (
+  r'(?ai)([-+])?P(?:(\d+(?:\.\d+)?)W)?(?:(\d+(?:\.\d+)?)D)?'
+  r'(?:T(?:(\d+(?:\.\d+)?)H)?(?:(\d+(?:\.\d+)?)M)?(?:(\d+(?:\.\d+)?)S)?)?'
+)
+
+
+def _timedelta_parser(
+  timedelta_type: type[timedelta],
+) -> Callable[[str], timedelta]:
+  """Returns a function parsing durations into timedeltas."""
+  clock_fullmatch = _compile(_CLOCK_DURATION_PATTERN).fullmatch
+  iso_fullmatch = _compile(_ISO_DURATION_PATTERN).fullmatch
+
+  def parse(duration: str) -> timedelta:
+    """Parses `str(timedelta)` output, [-]H:MM[:SS], or an ISO 8601 duration.
+
+    Raises:
+      ValueError: If `duration` is not in either format, or out of range.
+    """
+    duration = duration.strip()
+    try:
+      match = clock_fullmatch(duration)
+      if match:
+        days, sign, hours, minutes, seconds = match.groups()
+        value = timedelta_type(
+          days=int(days or 0),
+          hours=int(hours),
+          minutes=int(minutes),
+          seconds=float(seconds or 0),
+        )
+        return -value if sign else value
+      match = iso_fullmatch(duration)
+      if (
+        match and any(match.groups()[1:]) and not duration.upper().endswith('T')
+      ):
+        sign, weeks, days, hours, minutes, seconds = match.groups()
+        value = timedelta_type(
+          weeks=float(weeks or 0),
+          days=float(days or 0),
+          hours=float(hours or 0),
+          minutes=float(minutes or 0),
+          seconds=float(seconds or 0),
+        )
+        return -value if sign == '-' else value
+    except OverflowError:
+      pass
+    raise ValueError(f'Invalid duration: {duration!r}')
+
+  return parse
+
+
+def _fraction_parser(
+  fraction_type: type[fractions.Fraction],
+) -> Callable[[str], fractions.Fraction]:
+  """Returns a function parsing fractions such as '3/4' or '0.75'."""
+
+  def parse(fraction: str) -> fractions.Fraction:
+    """Parses a fraction.
+
+    Raises:
+      ValueError: If `fraction` is invalid or has a zero denominator.
+    """
+    try:
+      return fraction_type(fraction)
+    except ZeroDivisionError:
+      raise ValueError(f'Zero denominator: {fraction!r}') from None
+
+  return parse
+
+
+def _fromisoformat(value_type: Any) -> Callable[[str], Any]:
+  """Returns the `fromisoformat` method of a date or time type."""
+  return value_type.fromisoformat
+
+
+def _enum_converter(enum_type: type[enum.Enum]) -> _Converter:
+  """Builds a converter accepting an Enum member's name or value."""
+  members = {str(member.value): member for member in enum_type}
+  members.update(enum_type.__members__)
+
+  def convert(user_input: str) -> enum.Enum:
+    try:
+      return members[user_input.strip()]
+    except KeyError:
+      raise ValueError(
+        f'Invalid {enum_type.__name__}: {user_input!r}'
+      ) from None
+
+  names = ', '.join(enum_type.__members__)
+  return _Converter(
+    convert, f'{_BASE_INVALID_TYPE_ERROR} {enum_type.__name__}: one of {names}.'
+  )
+
+
+_CONVERTERS: dict[type, _Converter] = {}
+# Standard library types supported without importing their modules up front,
+# keyed by module and type name. A caller passing one has already imported it.
+# Each maps to a function building its conversion function from the type, or
+# None for the type itself, and the description used in its error message.
+_STDLIB_CONVERTERS: dict[
+  tuple[str, str], tuple[Callable[[Any], Callable[[str], Any]] | None, str]
+] = {
+  ('datetime', 'date'): (
+    _fromisoformat,
+    'date in ISO 8601 format e.g. YYYY-MM-DD',
+  ),
+  ('datetime', 'time'): (
+    _fromisoformat,
+    'time in ISO 8601 format e.g. HH:MM:SS',
+  ),
+  ('datetime', 'timedelta'): (
+    _timedelta_parser,
+    'duration e.g. 1:30:00 or PT1H30M',
+  ),
+  ('fractions', 'Fraction'): (_fraction_parser, 'fraction e.g. 3/4'),
+  ('uuid', 'UUID'): (None, 'UUID'),
+  ('ipaddress', 'IPv4Address'): (None, 'IPv4 address'),
+  ('ipaddress', 'IPv6Address'): (None, 'IPv6 address'),
+  ('ipaddress', 'IPv4Network'): (None, 'IPv4 network'),
+  ('ipaddress', 'IPv6Network'): (None, 'IPv6 network'),
+  ('ipaddress', 'IPv4Interface'): (None, 'IPv4 interface'),
+  ('ipaddress', 'IPv6Interface'): (None, 'IPv6 interface'),
+}
+# Builders of converters for every subclass of a type, found through the MRO.
+_CONVERTER_FACTORIES: dict[type, Callable[[Any], _Converter]] = {
+  enum.Enum: _enum_converter,
+}
+
+
+def register_type(
+  value_type: type[_V],
+  conversion_function: Callable[[str], _V] | None = None,
+  type_error_message: str | None = None,
+) -> None:
+  """Registers how to read a type with `typed_input`, `RecordSpec` and friends.
+
+  Example:
+    >>> register_type(Path, type_error_message='Error: Enter a valid path.')
+    >>> typed_input(Path, 'Config: ')
+
+  Args:
+    value_type: The type to register. Registering a type that is already
+      supported, including int, float, Decimal and datetime, replaces it.
+    conversion_function: Converts a line of input to `value_type`, raising
+      ValueError for invalid input. Defaults to `value_type` itself.
+    type_error_message: The error message displayed for invalid input.
+      Defaults to 'Error: You must enter a valid <type name>.'
+  """
+  _SPEC_TYPES.pop(value_type, None)
+  _CONVERTERS[value_type] = _Converter(
+    value_type if conversion_function is None else conversion_function,
+    type_error_message or f'{_BASE_INVALID_TYPE_ERROR} {value_type.__name__}.',
+  )
+
+
+def _lookup_stdlib_type(
+  table: dict[tuple[str, str], _V], value_type: type
+) -> _V | None:
+  """Looks up a type in a table keyed by the module and name of each type.
+
+  Returns:
+    The entry for the type, or None if there is none or `value_type` is not
+    the type its module defines under that name.
+  """
+  module = getattr(value_type, '__module__', '')
+  name = getattr(value_type, '__qualname__', '')
+  entry = table.get((module, name))
+  if (
+    entry is not None
+    and getattr(sys.modules.get(module), name, None) is value_type
+  ):
+    return entry
+  return None
+
+
+def _get_converter(value_type: type) -> _Converter:
+  """Returns the registered converter for a type, resolving it once.
+
+  Raises:
+    TypeError: If the type is not supported.
+  """
+  converter = _CONVERTERS.get(value_type)
+  if converter is None:
+    stdlib_converter = _lookup_stdlib_type(_STDLIB_CONVERTERS, value_type)
+    if stdlib_converter is not None:
+      build, description = stdlib_converter
+      converter = _CONVERTERS[value_type] = _Converter(
+        value_type if build is None else build(value_type),
+        f'{_BASE_INVALID_TYPE_ERROR} {description}.',
+      )
+      return converter
+    for base in getattr(value_type, '__mro__', ())[1:]:
+      factory = _CONVERTER_FACTORIES.get(base)
+      if factory is not None:
+        converter = _CONVERTERS[value_type] = factory(value_type)
+        break
+    else:
+      raise TypeError(f'Unsupported value type: {value_type!r}.')
+  return converter
+
+
+def _spec_for_type(value_type: type, **kwargs: Any) -> InputSpec[Any]:
+  """Builds the spec for a supported type, resolving its converter once.
+
+  Args:
+    value_type: int, float, Decimal, datetime or a registered type.
+    **kwargs: The spec's keyword arguments, e.g. `min_value`. Registered
+      types accept `min_value`, `max_value`, `default_value`,
+      `type_error_message`, `allowed` and `validators`.
+
+  Raises:
+    TypeError: If the type is not supported, or a keyword argument is not
+      accepted by its spec.
+  """
+  spec_type = _SPEC_TYPES.get(value_type)
+  if spec_type is None and value_type not in _CONVERTERS:
+    spec_type = _lookup_stdlib_type(_STDLIB_SPEC_TYPES, value_type)
+    if spec_type is not None:
+      _SPEC_TYPES[value_type] = spec_type
+  if spec_type is not None:
+    return spec_type(**kwargs)
+  return _registered_type_spec(_get_converter(value_type), **kwargs)
+
+
+def _registered_type_spec(
+  converter: _Converter,
+  *,
+  min_value: Any | None = None,
+  max_value: Any | None = None,
+  default_value: Any | None = None,
+  type_error_message: str | None = None,
+  allowed: Iterable[Any] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> InputSpec[Any]:
+  """Builds the spec for a registered type from the keywords it accepts."""
+  return InputSpec(
+    converter.conversion_function,
+    min_value,
+    max_value,
+    default_value,
+    type_error_message or converter.type_error_message,
+    None,
+    allowed,
+    validators,
+  )
+
+
+RecordField = Union[tuple[str, type], tuple[str, type, dict[str, Any]]]
+
+
+def _split_record(line: str, delimiter: str | None) -> list[str]:
+  """Splits a line into its stripped fields, on whitespace by default."""
+  if delimiter is None:
+    return line.split()
+  return [raw_value.strip() for raw_value in line.split(delimiter)]
+
+
+class RecordSpec:
+  """A compiled schema for reading one record of typed fields from a line.
+
+  Each field is compiled once into the same spec used by the matching
+  `*_input` function, so a line is split and converted field by field in one
+  pass with the same bounds, defaults and error messages, prefixed with the
+  field name.
+
+  Example:
+    >>> spec = RecordSpec(
+    ...   [
+    ...     ('qty', int, {'min_value': 1}),
+    ...     ('price', Decimal),
+    ...     ('ts', datetime),
+    ...   ],
+    ...   delimiter=',',
+    ... )
+    >>> spec.parse('3, 9.99, 2023-11-15')['price']
+    Decimal('9.99')
+    >>> spec.parse('0, 9.99, 2023-11-15')
+    Traceback (most recent call last):
+      ...
+    ValueError: qty: Error: Value must be at least 1.
+  """
+
+  __slots__ = ('_delimiter', '_fields')
+
+  def __init__(
+    self, schema: Iterable[RecordField], delimiter: str | None = None
+  ) -> None:
+    """Compiles a record schema.
+
+    Args:
+      schema: The fields of a record, in order, each a (name, type) or (name,
+        type, keyword arguments) tuple. The type is any type supported by
+        `typed_input`, and the keyword arguments are those of its spec, e.g.
+        {'min_value': 1}.
+      delimiter: The string separating fields, e.g. ','. Fields are stripped of
+        surrounding whitespace, and an empty field takes its default value.
+        Defaults to any whitespace.
+
+    Raises:
+      TypeError: If a field type is not supported.
+      ValueError: If a field name is repeated, or a field's keyword arguments
+        are invalid. The message is prefixed with the field name.
+    """
+    fields: list[tuple[str, Callable[[str], Any]]] = []
+    for name, value_type, *options in schema:
+      if any(name == field_name for field_name, _ in fields):
+        raise ValueError(f'Duplicate field name: {name!r}.')
+      try:
+        spec = _spec_for_type(value_type, **(options[0] if options else {}))
+      except (TypeError, ValueError) as e:
+        raise type(e)(f'{name}: {e}') from None
+      fields.append((name, spec._parse))
+    self._fields = tuple(fields)
+    self._delimiter = delimiter
+
+  def __repr__(self) -> str:
+    names = [name for name, _ in self._fields]
+    return f'{type(self).__name__}({names!r}, delimiter={self._delimiter!r})'
+
+  @property
+  def field_names(self) -> tuple[str, ...]:
+    return tuple(name for name, _ in self._fields)
+
+  def _parse(self, line: str) -> dict[str, Any] | _InvalidInput:
+    """Returns the record for a line, or an _InvalidInput if it is invalid."""
+    raw_values = _split_record(line, self._delimiter)
+    if len(raw_values) != len(self._fields):
+      return _InvalidInput(
+        f'Error: Expected {len(self._fields)} fields but got {len(raw_values)}.'
+      )
+    record = {}
+    for (name, parse), raw_value in zip(self._fields, raw_values):
+      result = parse(raw_value)
+      if isinstance(result, _InvalidInput):
+        return _InvalidInput(f'{name}: {result.message}', result.bound)
+      record[name] = result
+    return record
+
+  def parse(self, line: str) -> dict[str, Any]:
+    """Converts and validates one line without prompting.
+
+    Returns:
+      dict: Each field name mapped to its validated value.
+
+    Raises:
+      ValueError: If the line is invalid. The message is the same error
+        message `prompt` would display.
+    """
+    result = self._parse(line)
+    if not isinstance(result, _InvalidInput):
+      return result
+    raise ValueError(result.message)
+
+  def parse_many(self, lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Lazily converts and validates many lines without prompting.
+
+    Raises:
+      ValueError: At the first invalid line. The message is prefixed with its
+        1-based line number, e.g. 'Line 3: qty: Error: ...'.
+    """
+    parse = self._parse
+    for line_number, line in enumerate(lines, start=1):
+      result = parse(line)
+      if not isinstance(result, _InvalidInput):
+        yield result
+        continue
+      raise ValueError(f'Line {line_number}: {result.message}')
+
+  def prompt(
+    self,
+    prompt: str | None = None,
+    timeout: float | None = None,
+    deadline: float | None = None,
+    stdin: IO[Any] | None = None,
+    stdout: IO[Any] | None = None,
+  ) -> dict[str, Any]:
+    """Prompts for a line until a valid record is entered.
+
+    Takes the same arguments as `InputSpec.prompt`.
+
+    Returns:
+      dict: Each field name mapped to its validated value.
+
+    Raises:
+      InputTimeout: If the timeout or deadline expires.
+      EOFError: If `stdin` reaches end of file before a valid record is read.
+    """
+    session = _prompt_session(stdin, stdout)
+    try:
+      return _prompt_loop(session, self._parse, prompt, timeout, deadline)
+    finally:
+      session.flush()
+
+
+def _generic_single_value_input(
+  prompt: str | None,
+  min_value: _T | None,
+  max_value: _T | None,
+  default_value: _T | None,
+  type_error_message: str,
+  conversion_function: Callable[[str], _T],
+  timeout: float | None = None,
+  deadline: float | None = None,
+  stdin: IO[Any] | None = None,
+  stdout: IO[Any] | None = None,
+  allowed: Iterable[_T | tuple[_T, _T]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> _T:
+  """Generic function that prompts for input until valid input of desired type.
+
+  Args:
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    min_value: The minimum acceptable value for the input. If provided, the
+      function will only accept values greater than or equal to this value.
+    max_value: The maximum acceptable value for the input. If provided,
+      function will only accept values less than or equal to this value.
+    default_value: A value to be used when the user inputs an empty string. If
+      not specified, empty input will not be allowed, and the user will be
+      required to provide a valid input of the specified type.
+    type_error_message: A custom error message displayed when the user enters a
+      value not of the specified type.
+    conversion_function: Function to try convert the user input string to the
+      desired type.
+    timeout: The seconds to wait for each line of input.
+    deadline: The seconds to wait for valid input in total, across retries.
+    stdin: A text or binary stream to read lines from instead of `input()`.
+    stdout: A text or binary stream to write to instead of `print()`.
+    allowed: The values and inclusive `(low, high)` intervals the input must
+      fall in, if any.
+    validators: Custom checks run on values within the bounds, if any.
+
+  Returns:
+    T: Validated input of the specified type, or the default value if it is set
+      and the empty string is provided or the timeout or deadline expires.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+    EOFError: If `stdin` reaches end of file before valid input is read.
+  """
+  if (
+    allowed is None
+    and validators is None
+    and stdin is None
+    and stdout is None
+    and timeout is None
+    and deadline is None
+    and not _REPLAYERS
+    and not _INPUT_HOOKS
+  ):
+    # The plain console prompt needs no spec, and builds an error message
+    # only when one is displayed.
+    _check_bounds_arguments(min_value, max_value, default_value)
+    while True:
+      user_input = input(prompt) if prompt else input()
+      if default_value is not None and not user_input.strip():
+        return default_value
+      try:
+        value = conversion_function(user_input)
+      except (ValueError, ArithmeticError):
+        print(type_error_message)
+        continue
+      if min_value is not None and value < min_value:
+        print(f'Error: Value must be at least {min_value}.')
+      elif max_value is not None and value > max_value:
+        print(f'Error: Value must be at most {max_value}.')
+      else:
+        return value
+  spec = InputSpec(
+    conversion_function,
+    min_value,
+    max_value,
+    default_value,
+    type_error_message,
+    None,
+    allowed,
+    validators,
+  )
+  return spec.prompt(prompt, timeout, deadline, stdin, stdout)
+
+
+def _pollable_fileno(stream: Any) -> int | None:
+  """Returns the file descriptor of a pipe, socket or terminal stream.
+
+  An event loop can wait on these, but not on regular files.
+  """
+  fd = _selectable_fileno(stream)
+  if fd is None:
+    return None
+  mode = os.fstat(fd).st_mode
+  if stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode):
+    return fd
+  return None
+
+
+def _set_readable(readable: asyncio.Future[None]) -> None:
+  """Resolves a future once its file descriptor becomes readable."""
+  if not readable.done():
+    readable.set_result(None)
+
+
+async def _read_stdin_line() -> str:
+  """Awaits a line from `sys.stdin` without blocking the event loop.
+
+  Lines already in the stdin buffer, e.g. read ahead by an earlier `input()`,
+  are returned first. Otherwise the event loop waits for the file descriptor
+  to become readable, and it is made non-blocking only while it is read, so
+  stdin, and a terminal shared with stdout, stay blocking between prompts.
+  Stdin the event loop cannot wait on, such as a regular file, is read in the
+  default executor.
+
+  Raises:
+    EOFError: If stdin is at end of file.
+  """
+  import asyncio
+
+  loop = asyncio.get_running_loop()
+  stdin = sys.stdin
+  fd = _pollable_fileno(stdin)
+  if fd is None:
+    line = await loop.run_in_executor(None, stdin.readline)
+  else:
+    line = _read_available(stdin, fd)
+    while line[-1:] not in _LINE_ENDS:
+      readable: asyncio.Future[None] = loop.create_future()
+      loop.add_reader(fd, _set_readable, readable)
+      try:
+        await readable
+      finally:
+        loop.remove_reader(fd)
+      chunk = _read_available(stdin, fd)
+      if not chunk:
+        break
+      line += chunk
+  if not line:
+    raise EOFError('EOF when reading a line')
+  return _decode_line(line, getattr(stdin, 'encoding', None))
+
+
+async def _generic_async_single_value_input(
+  prompt: str | None,
+  min_value: _T | None,
+  max_value: _T | None,
+  default_value: _T | None,
+  type_error_message: str,
+  conversion_function: Callable[[str], _T],
+  reader: asyncio.StreamReader | None,
+) -> _T:
+  """Generic coroutine that prompts for input until valid input of desired type.
+
+  Behaves like `_generic_single_value_input`, except that lines are awaited
+  from an asyncio StreamReader so other tasks keep running while waiting.
+
+  Args:
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    min_value: The minimum acceptable value for the input.
+    max_value: The maximum acceptable value for the input.
+    default_value: A value to be used when the user inputs an empty string.
+    type_error_message: A custom error message displayed when the user enters a
+      value not of the specified type.
+    conversion_function: Function to try convert the user input string to the
+      desired type.
+    reader: The StreamReader to read lines from. Defaults to stdin, read
+      through the running event loop.
+
+  Returns:
+    T: Validated input of the specified type, or the default value if it is set
+      and the empty string is provided.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+    EOFError: If the reader reaches end of file before valid input is read.
+  """
+  spec = InputSpec(
+    conversion_function, min_value, max_value, default_value, type_error_message
+  )
+  return await spec.async_prompt(prompt, reader)
+
+
+def _iter_stream_lines(stream: IO[AnyStr], block_size: int) -> Iterator[str]:
+  """Yields the lines of a stream, reading it in blocks of `block_size`.
+
+  Only the unterminated tail of the most recent block is kept between reads, so
+  memory use is bounded by the block size and the longest line rather than the
+  total size of the stream. Line terminators are stripped.
+
+  Args:
+    stream: A binary (UTF-8 encoded) or text stream to read lines from.
+    block_size: The number of bytes or characters to read per call.
+
+  Yields:
+    str: Each line of the stream without its line terminator.
+  """
+  tail = None
+  while True:
+    block = stream.read(block_size)
+    if not block:
+      break
+    if tail:
+      block = tail + block
+    end = block.rfind(b'\n' if isinstance(block, bytes) else '\n')
+    if end == -1:
+      tail = block
+      continue
+    tail = block[end + 1 :]
+    yield from _split_lines(block[:end])
+  if tail:
+    yield from _split_lines(tail)
+
+
+def _split_lines(chunk: str | bytes) -> Iterator[str]:
+  """Yields the lines in a chunk of newline separated text or UTF-8 bytes.
+
+  A chunk that is not valid UTF-8 is decoded line by line instead, with
+  undecodable bytes replaced by U+FFFD, so they only spoil their own line,
+  which then fails conversion and is reported by its line number.
+  """
+  if isinstance(chunk, bytes):
+    try:
+      text = chunk.decode()
+    except UnicodeDecodeError:
+      for raw_line in chunk.split(b'\n'):
+        yield _decode_line(raw_line)
+      return
+  else:
+    text = chunk
+  for line in text.split('\n'):
+    yield line.removesuffix('\r')
+
+
+def _generic_iter_input(
+  min_value: _T | None,
+  max_value: _T | None,
+  default_value: _T | None,
+  type_error_message: str,
+  conversion_function: Callable[[str], _T],
+  split_whitespace: bool,
+  stdin: IO[Any] | None,
+) -> Iterator[_T]:
+  """Generic function that yields validated values read in bulk from a stream.
+
+  Args:
+    min_value: The minimum acceptable value for each value.
+    max_value: The maximum acceptable value for each value.
+    default_value: A value yielded for each empty line. If not specified, empty
+      lines are reported as invalid.
+    type_error_message: The error message reported for a value not of the
+      desired type.
+    conversion_function: Function to try convert each value to the desired
+      type.
+    split_whitespace: Whether to split each line on whitespace into several
+      values instead of treating each line as one value.
+    stdin: The stream to read from. Defaults to `sys.stdin.buffer`.
+
+  Returns:
+    Iterator[T]: An iterator over the valid values, in input order. Invalid
+      values are skipped and reported to stderr as 'Line N: <error message>'.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+  """
+  spec = InputSpec(
+    conversion_function, min_value, max_value, default_value, type_error_message
+  )
+  if stdin is None:
+    stdin = sys.stdin.buffer
+  return _iter_validated_values(
+    _iter_stream_lines(stdin, _STREAM_BLOCK_SIZE), spec, split_whitespace
+  )
+
+
+def _iter_validated_values(
+  lines: Iterator[str], spec: InputSpec[_T], split_whitespace: bool
+) -> Iterator[_T]:
+  """Yields the valid values in `lines`, reporting invalid ones by line."""
+  parse = spec._parse
+  for line_number, line in enumerate(lines, start=1):
+    for raw_value in line.split() if split_whitespace else (line,):
+      result = parse(raw_value)
+      if isinstance(result, _InvalidInput):
+        print(f'Line {line_number}: {result.message}', file=sys.stderr)
+      else:
+        yield result
+
+
+class FileValidationResult(NamedTuple):
+  """The outcome of validating every line of a file with `validate_file`.
+
+  Attributes:
+    values: The valid values in line order, or an empty list if the values were
+      not kept.
+    errors: (line number, error message) for the first invalid lines, up to
+      the `max_errors` passed to `validate_file`.
+    error_count: The total number of invalid lines, including unreported ones.
+    line_count: The number of lines in the file.
+  """
+
+  values: list[Any]
+  errors: list[tuple[int, str]]
+  error_count: int
+  line_count: int
+
+  @property
+  def ok(self) -> bool:
+    """Whether every line of the file is valid."""
+    return not self.error_count
+
+
+def _validate_lines(
+  lines: Iterable[bytes],
+  spec: InputSpec[Any],
+  max_errors: int | None,
+  keep_values: bool,
+) -> FileValidationResult:
+  """Validates each of `lines`, collecting the values and first errors."""
+  # Types with a bytes converter skip decoding each line to a string.
+  bytes_input = spec._bytes_conversion_function is not None
+  parse: Callable[[Any], Any] = (
+    spec._parse_bytes if bytes_input else spec._parse
+  )
+  values: list[Any] = []
+  append_value = values.append
+  errors: list[tuple[int, str]] = []
+  error_count = line_count = 0
+  for line_count, line in enumerate(lines, start=1):
+    if bytes_input:
+      result = parse(line)
+    else:
+      try:
+        text = line.decode()
+      except UnicodeDecodeError:
+        # Like the bytes converters, report undecodable input as a type error.
+        result = spec._type_error
+      else:
+        result = parse(text.removesuffix('\n').removesuffix('\r'))
+    if isinstance(result, _InvalidInput):
+      error_count += 1
+      if max_errors is None or len(errors) < max_errors:
+        errors.append((line_count, result.message))
+    elif keep_values:
+      append_value(result)
+  return FileValidationResult(values, errors, error_count, line_count)
+
+
+def _import_numpy() -> Any:
+  """Imports NumPy on first use, so it stays an optional dependency."""
+  try:
+    import numpy
+  except ImportError as e:
+    raise ImportError(_NUMPY_REQUIRED_ERROR) from e
+  return numpy
+
+
+def _array_bounds_error(
+  array: np.ndarray,
+  min_value: Any | None,
+  max_value: Any | None,
+  validators: tuple[Validator, ...] = (),
+) -> tuple[int, str, str] | None:
+  """Returns the first invalid index, its error message and bound, else None.
+
+  The bound is 'min_value', 'max_value' or 'validator', as in `InputEvent`.
+
+  The bounds are checked with one vectorized comparison per bound rather than
+  one Python level comparison per element, and so are validators that have a
+  `vectorized` function. The validators run in order, stopping at the first
+  one that any element fails.
+  """
+  if min_value is not None:
+    below = array < min_value
+    if below.any():
+      return int(below.argmax()), f'must be at least {min_value}.', 'min_value'
+  if max_value is not None:
+    above = array > max_value
+    if above.any():
+      return int(above.argmax()), f'must be at most {max_value}.', 'max_value'
+  for validator in validators:
+    message = f'fails: {validator.message.removeprefix("Error: ")}'
+    if validator.vectorized is not None:
+      invalid = ~validator.vectorized(array)
+      if invalid.any():
+        return int(invalid.argmax()), message, 'validator'
+    else:
+      for index, value in enumerate(array.tolist()):
+        if not validator.check(value):
+          return index, message, 'validator'
+  return None
+
+
+def _generic_array_input(
+  prompt: str | None,
+  min_value: Any | None,
+  max_value: Any | None,
+  default_value: Any | None,
+  type_error_message: str,
+  dtype: str,
+  delimiter: str | None,
+  stdin: IO[Any] | None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  validators: Iterable[Validator] | None = None,
+  stdout: IO[Any] | None = None,
+) -> np.ndarray:
+  """Generic function that reads a validated NumPy array of the desired dtype.
+
+  Args:
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown. Unused when reading from `stdin`.
+    min_value: The minimum acceptable value for every element.
+    max_value: The maximum acceptable value for every element.
+    default_value: An array-like returned when the user inputs an empty line.
+      If not specified, empty input will not be allowed.
+    type_error_message: The error message displayed when an element cannot be
+      converted to the desired dtype.
+    dtype: The NumPy dtype of the returned array.
+    delimiter: The string separating values. Defaults to any whitespace.
+    stdin: A stream whose lines are all read into one array instead of
+      prompting for a single line.
+    timeout: The seconds to wait for each line of input.
+    deadline: The seconds to wait for valid input in total, across retries.
+    validators: Custom checks run on every element within the bounds.
+    stdout: A text or binary stream to write to instead of `print()`.
+
+  Returns:
+    numpy.ndarray: A one dimensional array of the validated values.
+
+  Raises:
+    ImportError: If NumPy is not installed.
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but any of its elements fall
+      outside the range defined by `min_value` or `max_value`.
+    ValueError: If reading from `stdin` and any value is invalid. The message
+      is prefixed with the line number of the invalid value.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+  """
+  np = _import_numpy()
+  _check_bounds_arguments(min_value, max_value, None)
+  sorted_validators = _sorted_validators(validators)
+  if default_value is not None:
+    default_value = np.asarray(default_value, dtype=dtype)
+    bounds_error = _array_bounds_error(
+      default_value, min_value, max_value, sorted_validators
+    )
+    if bounds_error is not None:
+      index, message, _ = bounds_error
+      raise ValueError(f'Default value at position {index + 1} {message}')
+  if stdin is not None:
+    return _read_array_stream(
+      stdin,
+      min_value,
+      max_value,
+      type_error_message,
+      dtype,
+      delimiter,
+      sorted_validators,
+    )
+  type_error = _InvalidInput(type_error_message)
+
+  def parse(user_input: str) -> Any:
+    if not user_input.strip() and default_value is not None:
+      return default_value
+    try:
+      array = np.array(user_input.split(delimiter)).astype(dtype)
+    except (ValueError, OverflowError):
+      return type_error
+    bounds_error = _array_bounds_error(
+      array, min_value, max_value, sorted_validators
+    )
+    if bounds_error is not None:
+      index, message, bound = bounds_error
+      return _InvalidInput(
+        f'Error: Value at position {index + 1} {message}', bound
+      )
+    return array
+
+  session = _prompt_session(None, stdout)
+  try:
+    return _prompt_loop(
+      session, parse, prompt, timeout, deadline, default_value
+    )
+  finally:
+    session.flush()
+
+
+def _read_array_stream(
+  stdin: IO[Any],
+  min_value: Any | None,
+  max_value: Any | None,
+  type_error_message: str,
+  dtype: str,
+  delimiter: str | None,
+  validators: tuple[Validator, ...] = (),
+) -> np.ndarray:
+  """Reads every value in a stream into one array, converting in batches."""
+  np = _import_numpy()
+  arrays = []
+  tokens: list[str] = []
+  token_line_numbers: list[int] = []
+
+  def convert_batch() -> None:
+    try:
+      array = np.array(tokens).astype(dtype)
+    except (ValueError, OverflowError):
+      for token, line_number in zip(tokens, token_line_numbers):
+        try:
+          np.array([token]).astype(dtype)
+        except (ValueError, OverflowError):
+          raise ValueError(
+            f'Line {line_number}: {type_error_message}'
+          ) from None
+      raise
+    bounds_error = _array_bounds_error(array, min_value, max_value, validators)
+    if bounds_error is not None:
+      index, message, _ = bounds_error
+      raise ValueError(
+        f'Line {token_line_numbers[index]}: Error: Value {message}'
+      )
+    arrays.append(array)
+    tokens.clear()
+    token_line_numbers.clear()
+
+  lines = _iter_stream_lines(stdin, _STREAM_BLOCK_SIZE)
+  for line_number, line in enumerate(lines, start=1):
+    if not line.strip():
+      continue
+    line_tokens = line.split(delimiter)
+    tokens.extend(line_tokens)
+    token_line_numbers.extend([line_number] * len(line_tokens))
+    if len(tokens) >= _ARRAY_BATCH_SIZE:
+      convert_batch()
+  if tokens:
+    convert_batch()
+  if not arrays:
+    return np.empty(0, dtype=dtype)
+  return np.concatenate(arrays)
+
+
+def int_input(
+  prompt: str | None = None,
+  min_value: int | None = None,
+  max_value: int | None = None,
+  default_value: int | None = None,
+  type_error_message: str | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  stdin: IO[Any] | None = None,
+  stdout: IO[Any] | None = None,
+  allowed: Iterable[int | tuple[int, int]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> int:
+  """Prompts to enter an int, with optional default and range validation.
+
+  Args:
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    min_value: The minimum acceptable value for the input. If provided, the
+      function will only accept integers greater than or equal to this value.
+    max_value: The maximum acceptable value for the input. If provided,
+      function will only accept integers less than or equal to this value.
+    default_value: A value to be used when the user inputs an empty string. If
+      not specified, empty input will not be allowed, and the user will be
+      required to provide a valid integer.
+    type_error_message: A custom error message displayed when the user enters a
+      non-integer value. The default message if not provided is:
+      'Error: You must enter a valid integer.'
+    timeout: If provided, the seconds to wait for each line of input. Uses
+      `select` on stdin, so it needs a POSIX terminal or pipe.
+    deadline: If provided, the seconds to wait for valid input in total, so
+      repeated invalid input cannot hold the prompt indefinitely.
+    stdin: If provided, a text or binary stream (e.g. a pipe, a socket's
+      `makefile()` or an in-memory buffer) to read lines from instead of
+      calling `input()`, so one process can serve many prompt sessions.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`. Output is buffered and flushed once
+      per line read.
+    allowed: If provided, the values and inclusive `(low, high)` intervals the
+      input must fall in, e.g. `[(8000, 8099), 443]`. They are merged once and
+      checked with a binary search, and out-of-range input is told the
+      nearest allowed range.
+    validators: If provided, custom checks run on values within the bounds,
+      from the cheapest `Validator.cost` to the most expensive, stopping at
+      the first failure, whose message is displayed before prompting again.
+
+  Returns:
+    int: The validated integer input entered, or the default value
+      if it is set and the empty string is provided or the timeout or
+      deadline expires.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`, is not in `allowed` or fails a
+      validator.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+    EOFError: If `stdin` reaches end of file before valid input is read.
+  """
+  if not type_error_message:
+    type_error_message = _DEFAULT_INT_INPUT_TYPE_ERROR
+  return _generic_single_value_input(
+    prompt=prompt,
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    conversion_function=int,
+    timeout=timeout,
+    deadline=deadline,
+    stdin=stdin,
+    stdout=stdout,
+    allowed=allowed,
+    validators=validators,
+  )
+
+
+def float_input(
+  prompt: str | None = None,
+  min_value: float | None = None,
+  max_value: float | None = None,
+  default_value: float | None = None,
+  type_error_message: str | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  stdin: IO[Any] | None = None,
+  stdout: IO[Any] | None = None,
+  allowed: Iterable[float | tuple[float, float]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> float:
+  """Prompts to enter a float, with optional default and range validation.
+
+  Args:
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    min_value: The minimum acceptable value for the input. If provided, the
+      function will only accept floats greater than or equal to this value.
+    max_value: The maximum acceptable value for the input. If provided,
+      function will only accept floats less than or equal to this value.
+    default_value: A value to be used when the user inputs an empty string. If
+      not specified, empty input will not be allowed, and the user will be
+      required to provide a valid float.
+    type_error_message: A custom error message displayed when the user enters a
+      non-float value. The default message if not provided is:
+      'Error: You must enter a valid float.'
+    timeout: If provided, the seconds to wait for each line of input. Uses
+      `select` on stdin, so it needs a POSIX terminal or pipe.
+    deadline: If provided, the seconds to wait for valid input in total, so
+      repeated invalid input cannot hold the prompt indefinitely.
+    stdin: If provided, a text or binary stream (e.g. a pipe, a socket's
+      `makefile()` or an in-memory buffer) to read lines from instead of
+      calling `input()`, so one process can serve many prompt sessions.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`. Output is buffered and flushed once
+      per line read.
+    allowed: If provided, the values and inclusive `(low, high)` intervals the
+      input must fall in, e.g. `[(-0.5, 0.5), 1.0]` for a tolerance band and
+      an exact setting. They are merged once and checked with a binary
+      search, and out-of-range input is told the nearest allowed range.
+    validators: If provided, custom checks run on values within the bounds,
+      from the cheapest `Validator.cost` to the most expensive, stopping at
+      the first failure, whose message is displayed before prompting again.
+
+  Returns:
+    float: The validated float input entered, or the default value
+      if it is set and the empty string is provided or the timeout or
+      deadline expires.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`, is not in `allowed` or fails a
+      validator.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+    EOFError: If `stdin` reaches end of file before valid input is read.
+  """
+  if not type_error_message:
+    type_error_message = _DEFAULT_FLOAT_INPUT_TYPE_ERROR
+  return _generic_single_value_input(
+    prompt=prompt,
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    conversion_function=float,
+    timeout=timeout,
+    deadline=deadline,
+    stdin=stdin,
+    stdout=stdout,
+    allowed=allowed,
+    validators=validators,
+  )
+
+
+def decimal_input(
+  prompt: str | None = None,
+  min_value: Decimal | None = None,
+  max_value: Decimal | None = None,
+  default_value: Decimal | None = None,
+  type_error_message: str | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  stdin: IO[Any] | None = None,
+  stdout: IO[Any] | None = None,
+  allowed: Iterable[Decimal | tuple[Decimal, Decimal]] | None = None,
+  validators: Iterable[Validator] | None = None,
+  places: int | None = None,
+  rounding: str | None = None,
+  max_digits: int | None = None,
+) -> Decimal:
+  """Prompts to enter a Decimal, with optional default and range validation.
+
+  Args:
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    min_value: The minimum acceptable value for the input. If provided, the
+      function will only accept Decimals greater than or equal to this value.
+    max_value: The maximum acceptable value for the input. If provided,
+      function will only accept Decimals less than or equal to this value.
+    default_value: A value to be used when the user inputs an empty string. If
+      not specified, empty input will not be allowed, and the user will be
+      required to provide a valid Decimal.
+    type_error_message: A custom error message displayed when the user enters a
+      non-Decimal value. The default message if not provided is:
+      'Error: You must enter a valid Decimal.'
+    timeout: If provided, the seconds to wait for each line of input. Uses
+      `select` on stdin, so it needs a POSIX terminal or pipe.
+    deadline: If provided, the seconds to wait for valid input in total, so
+      repeated invalid input cannot hold the prompt indefinitely.
+    stdin: If provided, a text or binary stream (e.g. a pipe, a socket's
+      `makefile()` or an in-memory buffer) to read lines from instead of
+      calling `input()`, so one process can serve many prompt sessions.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`. Output is buffered and flushed once
+      per line read.
+    allowed: If provided, the values and inclusive `(low, high)` intervals the
+      input must fall in, e.g. price bands such as
+      `[(Decimal('9.99'), Decimal('19.99')), Decimal('49.99')]`. They are
+      merged once and checked with a binary search, and out-of-range input is
+      told the nearest allowed range.
+    validators: If provided, custom checks run on values within the bounds,
+      from the cheapest `Validator.cost` to the most expensive, stopping at
+      the first failure, whose message is displayed before prompting again.
+    places: If provided, the Decimal is quantized to this many decimal
+      places, e.g. 2 for an amount of money, and input with more decimal
+      places is rejected unless `rounding` is set. Plain input such as
+      '12.5' is checked and converted on a fast path.
+    rounding: If provided, a `decimal` rounding mode such as
+      `decimal.ROUND_HALF_UP` used to round input with more than `places`
+      decimal places instead of rejecting it. Requires `places`.
+    max_digits: If provided, the maximum number of digits in the Decimal,
+      after quantizing to `places`.
+
+  Returns:
+    Decimal: The validated Decimal input entered, or the default value
+      if it is set and the empty string is provided or the timeout or
+      deadline expires.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`, is not in `allowed`, fails a
+      validator or has too many decimal places or digits.
+    ValueError: If `places`, `rounding` or `max_digits` is invalid.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+    EOFError: If `stdin` reaches end of file before valid input is read.
+  """
+  if places is None and rounding is None and max_digits is None:
+    return _generic_single_value_input(
+      prompt=prompt,
+      min_value=min_value,
+      max_value=max_value,
+      default_value=default_value,
+      type_error_message=type_error_message
+      or _DEFAULT_DECIMAL_INPUT_TYPE_ERROR,
+      conversion_function=_decimal_type(),
+      timeout=timeout,
+      deadline=deadline,
+      stdin=stdin,
+      stdout=stdout,
+      allowed=allowed,
+      validators=validators,
+    )
+  spec = DecimalSpec(
+    min_value,
+    max_value,
+    default_value,
+    type_error_message,
+    allowed,
+    validators,
+    places,
+    rounding,
+    max_digits,
+  )
+  return spec.prompt(prompt, timeout, deadline, stdin, stdout)
+
+
+def datetime_input(
+  prompt: str | None = None,
+  min_value: datetime | None = None,
+  max_value: datetime | None = None,
+  default_value: datetime | None = None,
+  type_error_message: str | None = None,
+  tz: tzinfo | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  stdin: IO[Any] | None = None,
+  stdout: IO[Any] | None = None,
+  allowed: Iterable[datetime | tuple[datetime, datetime]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> datetime:
+  """Prompts to enter a datetime, with optional default and range validation.
+
+  Args:
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    min_value: The minimum acceptable value for the input. If provided, the
+      function will only accept datetimes greater than or equal to this value.
+    max_value: The maximum acceptable value for the input. If provided,
+      function will only accept datetimes less than or equal to this value.
+    default_value: A value to be used when the user inputs an empty string. If
+      not specified, empty input will not be allowed, and the user will be
+      required to provide a valid datetime.
+    type_error_message: A custom error message displayed when the user enters a
+      invalid datetime value. The default message if not provided is:
+      'Error: You must enter a valid datetime in valid ISO 8601 format e.g. YYYY-MM-DD.'
+      Along with a link to the the other allowed format options for the python
+      version being used (Python 3.11 introduced more allowed formats).
+    tz: If provided, the input, bounds and default value are all normalized to
+      this timezone: aware datetimes are converted to it and naive datetimes
+      are assumed to be in it, so aware and naive values can be compared.
+    timeout: If provided, the seconds to wait for each line of input. Uses
+      `select` on stdin, so it needs a POSIX terminal or pipe.
+    deadline: If provided, the seconds to wait for valid input in total, so
+      repeated invalid input cannot hold the prompt indefinitely.
+    stdin: If provided, a text or binary stream (e.g. a pipe, a socket's
+      `makefile()` or an in-memory buffer) to read lines from instead of
+      calling `input()`, so one process can serve many prompt sessions.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`. Output is buffered and flushed once
+      per line read.
+    allowed: If provided, the datetimes and inclusive `(start, end)` windows
+      the input must fall in, e.g. maintenance windows such as
+      `[(datetime(2024, 6, 1, 2), datetime(2024, 6, 1, 4))]`. They are merged
+      once and checked with a binary search, and out-of-range input is told
+      the nearest allowed window.
+    validators: If provided, custom checks run on values within the bounds,
+      from the cheapest `Validator.cost` to the most expensive, stopping at
+      the first failure, whose message is displayed before prompting again.
+
+  Returns:
+    datetime: The validated datetime input entered, normalized to `tz` if it
+      is set, or the default value if it is set and the empty string is
+      provided or the timeout or deadline expires.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`, is not in `allowed` or fails a
+      validator.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+    EOFError: If `stdin` reaches end of file before valid input is read.
+  """
+  if tz is None:
+    return _generic_single_value_input(
+      prompt=prompt,
+      min_value=min_value,
+      max_value=max_value,
+      default_value=default_value,
+      type_error_message=type_error_message
+      or _default_datetime_input_type_error(),
+      conversion_function=_default_datetime_parser()._parse,
+      timeout=timeout,
+      deadline=deadline,
+      stdin=stdin,
+      stdout=stdout,
+      allowed=allowed,
+      validators=validators,
+    )
+  spec = DateTimeSpec(
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    tz=tz,
+    allowed=allowed,
+    validators=validators,
+  )
+  return spec.prompt(prompt, timeout, deadline, stdin, stdout)
+
+
+def choice_input(
+  options: Iterable[str] | ChoiceSpec,
+  prompt: str | None = None,
+  default_value: str | None = None,
+  type_error_message: str | None = None,
+  case_sensitive: bool = True,
+  prefixes: bool = True,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  stdin: IO[Any] | None = None,
+  stdout: IO[Any] | None = None,
+) -> str:
+  """Prompts to pick one of many options, by name or by a unique prefix.
+
+  Example:
+    >>> choice_input(['web-01', 'web-02', 'db-01'], 'Host: ')
+    Host: web
+    Error: 'web' matches more than one option: web-01, web-02.
+    Host: web-02
+    'web-02'
+
+  Args:
+    options: The strings that may be entered. To prompt many times from a
+      large set of options, pass a `ChoiceSpec` so they are indexed only once;
+      the other matching arguments must then be left unset.
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    default_value: An option to be used when the user inputs an empty string.
+      If not specified, empty input will not be allowed.
+    type_error_message: A custom error message displayed when the input
+      matches no option. The default message if not provided is:
+      'Error: You must enter a valid option.'
+    case_sensitive: If False, options are matched ignoring case, and the
+      option is returned as it was given.
+    prefixes: If True, a prefix of exactly one option selects that option.
+    timeout: If provided, the seconds to wait for each line of input.
+    deadline: If provided, the seconds to wait for valid input in total.
+    stdin: If provided, a text or binary stream to read lines from instead of
+      calling `input()`.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`.
+
+  Returns:
+    str: The option entered or selected by prefix, or the default value if it
+      is set and the empty string is provided or the timeout or deadline
+      expires.
+
+  Raises:
+    ValueError: If there are no options, or if two options differ only in
+      case and `case_sensitive` is False.
+    ValueError: If `default_value` is specified but is not an option.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+    EOFError: If `stdin` reaches end of file before valid input is read.
+  """
+  if isinstance(options, ChoiceSpec):
+    spec = options
+  else:
+    spec = ChoiceSpec(
+      options, default_value, type_error_message, case_sensitive, prefixes
+    )
+  return spec.prompt(prompt, timeout, deadline, stdin, stdout)
+
+
+def typed_input(
+  value_type: type[_V],
+  prompt: str | None = None,
+  min_value: _V | None = None,
+  max_value: _V | None = None,
+  default_value: _V | None = None,
+  type_error_message: str | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  stdin: IO[Any] | None = None,
+  stdout: IO[Any] | None = None,
+  allowed: Iterable[_V | tuple[_V, _V]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> _V:
+  """Prompts to enter a value of any supported type, like `int_input`.
+
+  Supports int, float, Decimal and datetime, as well as date, time,
+  timedelta, Fraction, UUID, the ipaddress address, network and interface
+  types, every Enum (entered by member name or value), and any type added
+  with `register_type`. The converter is looked up once per call, not once
+  per line entered.
+
+  Example:
+    >>> typed_input(ipaddress.IPv4Address, 'Gateway: ')
+    Gateway: 10.0.0.300
+    Error: You must enter a valid IPv4 address.
+    Gateway: 10.0.0.1
+    IPv4Address('10.0.0.1')
+
+  Args:
+    value_type: The type of value to read.
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    min_value: The minimum acceptable value for the input, if any.
+    max_value: The maximum acceptable value for the input, if any.
+    default_value: A value to be used when the user inputs an empty string. If
+      not specified, empty input will not be allowed.
+    type_error_message: A custom error message displayed when the user enters a
+      value not of the specified type. Defaults to the registered message.
+    timeout: If provided, the seconds to wait for each line of input.
+    deadline: If provided, the seconds to wait for valid input in total.
+    stdin: If provided, a text or binary stream to read lines from instead of
+      calling `input()`.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`.
+    allowed: If provided, the values and inclusive `(low, high)` intervals the
+      input must fall in.
+    validators: If provided, custom checks run on values within the bounds,
+      from the cheapest, stopping at the first failure.
+
+  Returns:
+    The validated input, or the default value if it is set and the empty
+    string is provided or the timeout or deadline expires.
+
+  Raises:
+    TypeError: If `value_type` is not supported.
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`, is not in `allowed` or fails a
+      validator.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+  """
+  spec = _spec_for_type(
+    value_type,
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    allowed=allowed,
+    validators=validators,
+  )
+  return spec.prompt(prompt, timeout, deadline, stdin, stdout)
+
+
+def record_input(
+  schema: Iterable[RecordField] | RecordSpec,
+  prompt: str | None = None,
+  delimiter: str | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  stdin: IO[Any] | None = None,
+  stdout: IO[Any] | None = None,
+) -> dict[str, Any]:
+  """Prompts to enter one line holding a record of several typed fields.
+
+  The whole record is entered on one line instead of with one `*_input` call
+  per field, e.g. `3, 9.99, 2023-11-15` for the schema
+  `[('qty', int, {'min_value': 1}), ('price', Decimal), ('ts', datetime)]`.
+  If any field is invalid its error message is displayed, prefixed with the
+  field name, and the whole line is prompted for again.
+
+  Args:
+    schema: The fields of the record, as accepted by `RecordSpec`, or an
+      already compiled `RecordSpec` to avoid compiling the schema per call.
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    delimiter: The string separating fields. Defaults to any whitespace.
+      Ignored if `schema` is a `RecordSpec`.
+    timeout: If provided, the seconds to wait for each line of input.
+    deadline: If provided, the seconds to wait for a valid record in total.
+    stdin: If provided, a text or binary stream to read lines from instead of
+      calling `input()`.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`.
+
+  Returns:
+    dict: Each field name mapped to its validated value.
+
+  Raises:
+    TypeError: If a field type is not supported.
+    ValueError: If a field name is repeated, or a field's bounds or default
+      value are invalid.
+    InputTimeout: If the timeout or deadline expires.
+  """
+  if not isinstance(schema, RecordSpec):
+    schema = RecordSpec(schema, delimiter)
+  return schema.prompt(prompt, timeout, deadline, stdin, stdout)
+
+
+def iter_record_input(
+  schema: Iterable[RecordField] | RecordSpec,
+  delimiter: str | None = None,
+  stdin: IO[Any] | None = None,
+) -> Iterator[dict[str, Any]]:
+  """Yields a validated record for each line read in bulk from stdin.
+
+  Like `iter_int_input`, but each line is a record parsed as in
+  `record_input`, so thousands of pasted or piped rows go through one
+  compiled schema.
+
+  Args:
+    schema: The fields of each record, as accepted by `RecordSpec`, or a
+      compiled `RecordSpec`.
+    delimiter: The string separating fields. Defaults to any whitespace.
+      Ignored if `schema` is a `RecordSpec`.
+    stdin: A binary (UTF-8 encoded) or text stream to read instead of
+      `sys.stdin.buffer`.
+
+  Returns:
+    Iterator[dict]: An iterator over the valid records, in input order.
+      Invalid lines are skipped and reported to stderr as
+      'Line N: <error message>'.
+
+  Raises:
+    TypeError: If a field type is not supported.
+    ValueError: If a field name is repeated, or a field's bounds or default
+      value are invalid. Raised when called, before any input is read.
+  """
+  if not isinstance(schema, RecordSpec):
+    schema = RecordSpec(schema, delimiter)
+  if stdin is None:
+    stdin = sys.stdin.buffer
+  return _iter_validated_records(
+    _iter_stream_lines(stdin, _STREAM_BLOCK_SIZE), schema
+  )
+
+
+def _iter_validated_records(
+  lines: Iterator[str], spec: RecordSpec
+) -> Iterator[dict[str, Any]]:
+  """Yields the valid records in `lines`, reporting invalid ones by line."""
+  parse = spec._parse
+  for line_number, line in enumerate(lines, start=1):
+    result = parse(line)
+    if isinstance(result, _InvalidInput):
+      print(f'Line {line_number}: {result.message}', file=sys.stderr)
+    else:
+      yield result
+
+
+class TableColumn(Sequence[Any], abc.ABC):
+  """One column of a `Table`, stored packed and converted back on access.
+
+  Int, float, Decimal and datetime columns are packed into an `array.array`
+  of 8-byte machine values, so a row costs 8 bytes per column instead of a
+  Python object, and each element is converted back to its type only when it
+  is accessed. Columns of other types, and columns holding a value that
+  cannot be packed, e.g. an int beyond 64 bits or an aware datetime in a
+  column without `tz`, are stored as a list of the values.
+
+  Each subclass packs one type; columns are created by `table_input`, not
+  instantiated directly.
+  """
+
+  __slots__ = ('_data', '_name', '_packed')
+
+  def __init__(self, name: str) -> None:
+    self._name = name
+    self._data: Any = []
+    self._packed = False
+
+  def __repr__(self) -> str:
+    return f'{type(self).__name__}({self._name!r}, rows={len(self._data)})'
+
+  @property
+  def name(self) -> str:
+    return self._name
+
+  @property
+  def data(self) -> array.array[Any] | list[Any]:
+    """The storage: an `array.array` of packed values or a list of values."""
+    return self._data
+
+  def __len__(self) -> int:
+    return len(self._data)
+
+  def __getitem__(self, index: Any) -> Any:
+    if not self._packed:
+      return self._data[index]
+    if isinstance(index, slice):
+      return [self._unpack_value(item) for item in self._data[index]]
+    return self._unpack_value(self._data[index])
+
+  def _extend(self, values: Sequence[Any]) -> None:
+    """Appends a batch of values, packing them together if the column is."""
+    if self._packed:
+      try:
+        # Packed into a new array first, so a value that cannot be packed
+        # leaves the column unchanged. Packing may also rescale the column.
+        items = self._pack(values)
+        self._data.extend(items)
+        return
+      except (OverflowError, TypeError, ValueError):
+        self._data = [self._unpack_value(item) for item in self._data]
+        self._packed = False
+    self._data.extend(values)
+
+  @abc.abstractmethod
+  def _pack(self, values: Sequence[Any]) -> array.array[Any]:
+    """Returns the values packed into a new array, leaving the column as is.
+
+    Raises OverflowError, TypeError or ValueError for a value that cannot be
+    packed, which converts the column to a list.
+    """
+
+  def _unpack_value(self, item: Any) -> Any:
+    return item
+
+
+class _ListColumn(TableColumn):
+  """Values of a type with no packed form, stored as a list."""
+
+  __slots__ = ()
+
+  def _pack(self, values: Sequence[Any]) -> array.array[Any]:
+    raise TypeError(f'{self._name} values cannot be packed.')
+
+
+class _IntColumn(TableColumn):
+  """Ints packed as int64."""
+
+  __slots__ = ()
+
+  def __init__(self, name: str) -> None:
+    import array
+
+    super().__init__(name)
+    self._data = array.array('q')
+    self._packed = True
+
+  def _pack(self, values: Sequence[int]) -> array.array[int]:
+    import array
+
+    return array.array('q', values)
+
+
+class _FloatColumn(TableColumn):
+  """Floats packed as C doubles, which they are already."""
+
+  __slots__ = ()
+
+  def __init__(self, name: str) -> None:
+    import array
+
+    super().__init__(name)
+    self._data = array.array('d')
+    self._packed = True
+
+  def _pack(self, values: Sequence[float]) -> array.array[float]:
+    import array
+
+    return array.array('d', values)
+
+
+class _DecimalColumn(TableColumn):
+  """Decimals packed as int64 multiples of 10**-places.
+
+  `places` is the column's `places` option, to which every value has been
+  quantized. Without it, `places` grows to the most decimal places seen,
+  rescaling the values stored so far, so every value is stored exactly and
+  all of them are returned with the same exponent, e.g. 1.1 as
+  Decimal('1.10').
+  """
+
+  __slots__ = ('_context', '_places')
+
+  def __init__(self, name: str, places: int | None) -> None:
+    import array
+    import decimal
+
+    super().__init__(name)
+    self._data = array.array('q')
+    self._packed = True
+    self._places = places or 0
+    # Scales a Decimal by a power of ten exactly, whatever the ambient
+    # precision.
+    self._context = decimal.Context(
+      prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN
+    )
+
+  def _pack(self, values: Sequence[Decimal]) -> array.array[int]:
+    import array
+
+    # Comparing the string exponent of an infinity or NaN raises TypeError.
+    exponent = min(value.as_tuple().exponent for value in values)
+    if not isinstance(exponent, int):
+      raise TypeError('Infinities and NaNs cannot be packed.')
+    places = max(-exponent, 0)
+    if places > self._places:
+      scale = 10 ** (places - self._places)
+      self._data = array.array('q', [item * scale for item in self._data])
+      self._places = places
+    scaleb = self._context.scaleb
+    places = self._places
+    return array.array('q', [int(scaleb(value, places)) for value in values])
+
+  def _unpack_value(self, item: int) -> Decimal:
+    return self._context.scaleb(item, -self._places)
+
+
+class _DateTimeColumn(TableColumn):
+  """Datetimes packed as int64 microseconds since the Unix epoch.
+
+  Without `tz` the column packs naive datetimes. With `tz`, every value has
+  been normalized to it, so the UTC instant is packed and converted back.
+  """
+
+  __slots__ = ('_epoch', '_microsecond', '_tz')
+
+  def __init__(self, name: str, tz: tzinfo | None) -> None:
+    import array
+    from datetime import datetime, timedelta, timezone
+
+    super().__init__(name)
+    self._data = array.array('q')
+    self._packed = True
+    self._tz = tz
+    self._epoch = datetime(
+      1970, 1, 1, tzinfo=None if tz is None else timezone.utc
+    )
+    self._microsecond = timedelta(microseconds=1)
+
+  def _pack(self, values: Sequence[datetime]) -> array.array[int]:
+    import array
+
+    # Subtracting raises TypeError for a naive datetime in a column with a
+    # timezone, or an aware one in a column without.
+    epoch = self._epoch
+    microsecond = self._microsecond
+    return array.array(
+      'q', [(value - epoch) // microsecond for value in values]
+    )
+
+  def _unpack_value(self, item: int) -> datetime:
+    value = self._epoch + item * self._microsecond
+    return value if self._tz is None else value.astimezone(self._tz)
+
+
+# Packed columns of standard library types, with the option each is given.
+_STDLIB_COLUMN_TYPES: dict[
+  tuple[str, str], tuple[Callable[[str, Any], TableColumn], str]
+] = {
+  ('decimal', 'Decimal'): (_DecimalColumn, 'places'),
+  ('datetime', 'datetime'): (_DateTimeColumn, 'tz'),
+}
+
+
+def _table_column(
+  name: str, value_type: type, options: dict[str, Any]
+) -> TableColumn:
+  """Returns the packed column for a type, or a list column for others."""
+  if value_type is int:
+    return _IntColumn(name)
+  if value_type is float:
+    return _FloatColumn(name)
+  stdlib_column = _lookup_stdlib_type(_STDLIB_COLUMN_TYPES, value_type)
+  if stdlib_column is not None:
+    column_type, option = stdlib_column
+    return column_type(name, options.get(option))
+  return _ListColumn(name)
+
+
+class Table:
+  """Validated rows of typed columns, as returned by `table_input`.
+
+  Example:
+    >>> table['price'][0]
+    Decimal('9.99')
+    >>> table.row(0)
+    {'qty': 3, 'price': Decimal('9.99')}
+  """
+
+  __slots__ = ('_columns',)
+
+  def __init__(self, columns: Iterable[TableColumn]) -> None:
+    self._columns = {column.name: column for column in columns}
+
+  def __repr__(self) -> str:
+    return f'{type(self).__name__}({list(self._columns)!r}, rows={len(self)})'
+
+  @property
+  def column_names(self) -> tuple[str, ...]:
+    return tuple(self._columns)
+
+  def __len__(self) -> int:
+    """The number of rows."""
+    for column in self._columns.values():
+      return len(column)
+    return 0
+
+  def __getitem__(self, name: str) -> TableColumn:
+    """Returns the column with the given name."""
+    return self._columns[name]
+
+  def __iter__(self) -> Iterator[dict[str, Any]]:
+    """Yields each row as a dict of column names to values."""
+    for index in range(len(self)):
+      yield self.row(index)
+
+  def row(self, index: int) -> dict[str, Any]:
+    """Returns a row as a dict of column names to values."""
+    return {name: column[index] for name, column in self._columns.items()}
+
+
+def table_input(
+  columns: Iterable[RecordField],
+  delimiter: str | None = None,
+  stdin: IO[Any] | None = None,
+) -> Table:
+  """Reads a table of typed columns, one row per line, until end of input.
+
+  Each line is validated like a `record_input` record, e.g. a multi-column
+  paste or piped CSV-like input, but the rows are stored column by column in
+  compact typed arrays rather than as dicts of Python objects: ints as
+  int64, floats as doubles, Decimals as int64 multiples of a fixed power of
+  ten and datetimes as int64 microseconds since the epoch. A million rows
+  of datetimes and Decimals then take tens of megabytes rather than hundreds.
+  Values are converted back to their types only when accessed.
+
+  Example:
+    >>> table = table_input(
+    ...   [('qty', int, {'min_value': 1}), ('price', Decimal)], delimiter=','
+    ... )
+    >>> sum(table['qty'])
+    42
+
+  Args:
+    columns: The columns of the table, in order, as (name, type) or (name,
+      type, keyword arguments) tuples like a `RecordSpec` schema. Each column
+      keeps the bounds, defaults and error messages of its type's spec.
+    delimiter: The string separating fields. Defaults to any whitespace.
+    stdin: A binary (UTF-8 encoded) or text stream to read instead of
+      `sys.stdin.buffer`. On a terminal, end the input with Ctrl-D.
+
+  Returns:
+    Table: The valid rows, in input order. Invalid lines are skipped and
+      reported to stderr as 'Line N: <error message>'.
+
+  Raises:
+    TypeError: If a column type is not supported.
+    ValueError: If a column name is repeated, or a column's bounds or default
+      value are invalid.
+  """
+  columns = list(columns)
+  spec = RecordSpec(columns, delimiter)
+  table_columns = [
+    _table_column(name, value_type, options[0] if options else {})
+    for name, value_type, *options in columns
+  ]
+  if stdin is None:
+    stdin = sys.stdin.buffer
+  parse = spec._parse
+  rows: list[tuple[Any, ...]] = []
+  lines = _iter_stream_lines(stdin, _STREAM_BLOCK_SIZE)
+  for line_number, line in enumerate(lines, start=1):
+    result = parse(line)
+    if isinstance(result, _InvalidInput):
+      print(f'Line {line_number}: {result.message}', file=sys.stderr)
+      continue
+    rows.append(tuple(result.values()))
+    if len(rows) == _ARRAY_BATCH_SIZE:
+      _extend_columns(table_columns, rows)
+  _extend_columns(table_columns, rows)
+  return Table(table_columns)
+
+
+def _extend_columns(
+  columns: list[TableColumn], rows: list[tuple[Any, ...]]
+) -> None:
+  """Moves a batch of rows into the columns, packing each column at once."""
+  if rows:
+    for column, values in zip(columns, zip(*rows)):
+      column._extend(values)
+    rows.clear()
+
+
+def iter_int_input(
+  min_value: int | None = None,
+  max_value: int | None = None,
+  default_value: int | None = None,
+  type_error_message: str | None = None,
+  split_whitespace: bool = False,
+  stdin: IO[Any] | None = None,
+) -> Iterator[int]:
+  """Yields integers read in bulk from stdin, with optional range validation.
+
+  Unlike `int_input`, the stream is read in large blocks rather than one
+  `input()` call per value, and invalid values are reported with their line
+  number on stderr as 'Line N: <error message>' and skipped instead of
+  re-prompted.
+
+  Args:
+    min_value: The minimum acceptable value. If provided, only integers
+      greater than or equal to this value are yielded.
+    max_value: The maximum acceptable value. If provided, only integers
+      less than or equal to this value are yielded.
+    default_value: A value yielded for each empty line. If not specified, empty
+      lines are reported as invalid.
+    type_error_message: A custom error message reported for each non-integer
+      value. The default message if not provided is the same as for
+      `int_input`.
+    split_whitespace: Whether to split each line on whitespace into several
+      values instead of treating each line as a single value.
+    stdin: A binary (UTF-8 encoded) or text stream to read from. Defaults to
+      `sys.stdin.buffer`.
+
+  Returns:
+    Iterator[int]: An iterator over the valid integers, in input order.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+  """
+  if not type_error_message:
+    type_error_message = _DEFAULT_INT_INPUT_TYPE_ERROR
+  return _generic_iter_input(
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    conversion_function=int,
+    split_whitespace=split_whitespace,
+    stdin=stdin,
+  )
+
+
+def iter_float_input(
+  min_value: float | None = None,
+  max_value: float | None = None,
+  default_value: float | None = None,
+  type_error_message: str | None = None,
+  split_whitespace: bool = False,
+  stdin: IO[Any] | None = None,
+) -> Iterator[float]:
+  """Yields floats read in bulk from stdin, with optional range validation.
+
+  Unlike `float_input`, the stream is read in large blocks rather than one
+  `input()` call per value, and invalid values are reported with their line
+  number on stderr as 'Line N: <error message>' and skipped instead of
+  re-prompted.
+
+  Args:
+    min_value: The minimum acceptable value. If provided, only floats
+      greater than or equal to this value are yielded.
+    max_value: The maximum acceptable value. If provided, only floats
+      less than or equal to this value are yielded.
+    default_value: A value yielded for each empty line. If not specified, empty
+      lines are reported as invalid.
+    type_error_message: A custom error message reported for each non-float
+      value. The default message if not provided is the same as for
+      `float_input`.
+    split_whitespace: Whether to split each line on whitespace into several
+      values instead of treating each line as a single value.
+    stdin: A binary (UTF-8 encoded) or text stream to read from. Defaults to
+      `sys.stdin.buffer`.
+
+  Returns:
+    Iterator[float]: An iterator over the valid floats, in input order.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+  """
+  if not type_error_message:
+    type_error_message = _DEFAULT_FLOAT_INPUT_TYPE_ERROR
+  return _generic_iter_input(
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    conversion_function=float,
+    split_whitespace=split_whitespace,
+    stdin=stdin,
+  )
+
+
+def iter_decimal_input(
+  min_value: Decimal | None = None,
+  max_value: Decimal | None = None,
+  default_value: Decimal | None = None,
+  type_error_message: str | None = None,
+  split_whitespace: bool = False,
+  stdin: IO[Any] | None = None,
+) -> Iterator[Decimal]:
+  """Yields Decimals read in bulk from stdin, with optional range validation.
+
+  Unlike `decimal_input`, the stream is read in large blocks rather than one
+  `input()` call per value, and invalid values are reported with their line
+  number on stderr as 'Line N: <error message>' and skipped instead of
+  re-prompted.
+
+  Args:
+    min_value: The minimum acceptable value. If provided, only Decimals
+      greater than or equal to this value are yielded.
+    max_value: The maximum acceptable value. If provided, only Decimals
+      less than or equal to this value are yielded.
+    default_value: A value yielded for each empty line. If not specified, empty
+      lines are reported as invalid.
+    type_error_message: A custom error message reported for each non-Decimal
+      value. The default message if not provided is the same as for
+      `decimal_input`.
+    split_whitespace: Whether to split each line on whitespace into several
+      values instead of treating each line as a single value.
+    stdin: A binary (UTF-8 encoded) or text stream to read from. Defaults to
+      `sys.stdin.buffer`.
+
+  Returns:
+    Iterator[Decimal]: An iterator over the valid Decimals, in input order.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+  """
+  if not type_error_message:
+    type_error_message = _DEFAULT_DECIMAL_INPUT_TYPE_ERROR
+  return _generic_iter_input(
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    conversion_function=_decimal_type(),
+    split_whitespace=split_whitespace,
+    stdin=stdin,
+  )
+
+
+def iter_datetime_input(
+  min_value: datetime | None = None,
+  max_value: datetime | None = None,
+  default_value: datetime | None = None,
+  type_error_message: str | None = None,
+  split_whitespace: bool = False,
+  stdin: IO[Any] | None = None,
+) -> Iterator[datetime]:
+  """Yields datetimes read in bulk from stdin, with optional range validation.
+
+  Unlike `datetime_input`, the stream is read in large blocks rather than one
+  `input()` call per value, and invalid values are reported with their line
+  number on stderr as 'Line N: <error message>' and skipped instead of
+  re-prompted.
+
+  Args:
+    min_value: The minimum acceptable value. If provided, only datetimes
+      greater than or equal to this value are yielded.
+    max_value: The maximum acceptable value. If provided, only datetimes
+      less than or equal to this value are yielded.
+    default_value: A value yielded for each empty line. If not specified, empty
+      lines are reported as invalid.
+    type_error_message: A custom error message reported for each invalid
+      datetime value. The default message if not provided is the same as for
+      `datetime_input`.
+    split_whitespace: Whether to split each line on whitespace into several
+      values instead of treating each line as a single value.
+    stdin: A binary (UTF-8 encoded) or text stream to read from. Defaults to
+      `sys.stdin.buffer`.
+
+  Returns:
+    Iterator[datetime]: An iterator over the valid datetimes, in input order.
+
+  Raises:
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+  """
+  if not type_error_message:
+    type_error_message = _default_datetime_input_type_error()
+  return _generic_iter_input(
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    conversion_function=_default_datetime_parser()._parse,
+    split_whitespace=split_whitespace,
+    stdin=stdin,
+  )
+
+
+def try_parse_int(
+  user_input: str,
+  min_value: int | None = None,
+  max_value: int | None = None,
+  default_value: int | None = None,
+  type_error_message: str | None = None,
+  allowed: Iterable[int | tuple[int, int]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> ParseResult:
+  """Validates a string like `int_input`, returning the error if invalid.
+
+  Input is accepted and rejected exactly as `int_input` would, with the same
+  error messages, but no exception is raised for invalid input, and input
+  that is clearly not an integer is rejected without raising one internally.
+  To parse many strings with the same rules, use `try_parse_int_many` or an
+  `IntSpec`, which checks the rules once.
+
+  Example:
+    >>> try_parse_int('42', min_value=0)
+    ParseResult(value=42, code=None, message=None)
+    >>> try_parse_int('N/A').code
+    'conversion'
+
+  Args:
+    user_input: The string to convert.
+    min_value: The minimum acceptable value, if any.
+    max_value: The maximum acceptable value, if any.
+    default_value: A value to be used when the input is blank.
+    type_error_message: A custom error message for non-integer input.
+    allowed: The values and inclusive `(low, high)` intervals allowed.
+    validators: Custom checks run on values within the bounds.
+
+  Returns:
+    ParseResult: The validated integer, or the error code and message.
+
+  Raises:
+    ValueError: If the bounds, default value or allowed values are invalid.
+  """
+  spec = IntSpec(
+    min_value, max_value, default_value, type_error_message, allowed, validators
+  )
+  return spec.try_parse(user_input)
+
+
+def try_parse_int_many(
+  user_inputs: Iterable[str],
+  min_value: int | None = None,
+  max_value: int | None = None,
+  default_value: int | None = None,
+  type_error_message: str | None = None,
+  allowed: Iterable[int | tuple[int, int]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> list[ParseResult]:
+  """Validates many strings like `try_parse_int`, checking the rules once.
+
+  Returns:
+    list[ParseResult]: The result for each string, in order.
+  """
+  spec = IntSpec(
+    min_value, max_value, default_value, type_error_message, allowed, validators
+  )
+  return spec.try_parse_many(user_inputs)
+
+
+def try_parse_float(
+  user_input: str,
+  min_value: float | None = None,
+  max_value: float | None = None,
+  default_value: float | None = None,
+  type_error_message: str | None = None,
+  allowed: Iterable[float | tuple[float, float]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> ParseResult:
+  """Validates a string like `float_input`, returning the error if invalid.
+
+  Takes the same arguments as `try_parse_int`, for floats.
+  """
+  spec = FloatSpec(
+    min_value, max_value, default_value, type_error_message, allowed, validators
+  )
+  return spec.try_parse(user_input)
+
+
+def try_parse_float_many(
+  user_inputs: Iterable[str],
+  min_value: float | None = None,
+  max_value: float | None = None,
+  default_value: float | None = None,
+  type_error_message: str | None = None,
+  allowed: Iterable[float | tuple[float, float]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> list[ParseResult]:
+  """Validates many strings like `try_parse_float`, checking the rules once."""
+  spec = FloatSpec(
+    min_value, max_value, default_value, type_error_message, allowed, validators
+  )
+  return spec.try_parse_many(user_inputs)
+
+
+def try_parse_decimal(
+  user_input: str,
+  min_value: Decimal | None = None,
+  max_value: Decimal | None = None,
+  default_value: Decimal | None = None,
+  type_error_message: str | None = None,
+  allowed: Iterable[Decimal | tuple[Decimal, Decimal]] | None = None,
+  validators: Iterable[Validator] | None = None,
+  places: int | None = None,
+  rounding: str | None = None,
+  max_digits: int | None = None,
+) -> ParseResult:
+  """Validates a string like `decimal_input`, returning the error if invalid.
+
+  Takes the same arguments as `try_parse_int`, for Decimals, and the
+  `places`, `rounding` and `max_digits` of `decimal_input`.
+  """
+  spec = DecimalSpec(
+    min_value,
+    max_value,
+    default_value,
+    type_error_message,
+    allowed,
+    validators,
+    places,
+    rounding,
+    max_digits,
+  )
+  return spec.try_parse(user_input)
+
+
+def try_parse_decimal_many(
+  user_inputs: Iterable[str],
+  min_value: Decimal | None = None,
+  max_value: Decimal | None = None,
+  default_value: Decimal | None = None,
+  type_error_message: str | None = None,
+  allowed: Iterable[Decimal | tuple[Decimal, Decimal]] | None = None,
+  validators: Iterable[Validator] | None = None,
+  places: int | None = None,
+  rounding: str | None = None,
+  max_digits: int | None = None,
+) -> list[ParseResult]:
+  """Validates many strings like `try_parse_decimal`, checking rules once."""
+  spec = DecimalSpec(
+    min_value,
+    max_value,
+    default_value,
+    type_error_message,
+    allowed,
+    validators,
+    places,
+    rounding,
+    max_digits,
+  )
+  return spec.try_parse_many(user_inputs)
+
+
+def try_parse_datetime(
+  user_input: str,
+  min_value: datetime | None = None,
+  max_value: datetime | None = None,
+  default_value: datetime | None = None,
+  type_error_message: str | None = None,
+  tz: tzinfo | None = None,
+  allowed: Iterable[datetime | tuple[datetime, datetime]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> ParseResult:
+  """Validates a string like `datetime_input`, returning the error if invalid.
+
+  Takes the same arguments as `try_parse_int`, for datetimes, and `tz` to
+  normalize the input, bounds and default value to one timezone.
+  """
+  spec = DateTimeSpec(
+    min_value,
+    max_value,
+    default_value,
+    type_error_message,
+    tz,
+    allowed=allowed,
+    validators=validators,
+  )
+  return spec.try_parse(user_input)
+
+
+def try_parse_datetime_many(
+  user_inputs: Iterable[str],
+  min_value: datetime | None = None,
+  max_value: datetime | None = None,
+  default_value: datetime | None = None,
+  type_error_message: str | None = None,
+  tz: tzinfo | None = None,
+  allowed: Iterable[datetime | tuple[datetime, datetime]] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> list[ParseResult]:
+  """Validates many strings like `try_parse_datetime`, checking rules once."""
+  spec = DateTimeSpec(
+    min_value,
+    max_value,
+    default_value,
+    type_error_message,
+    tz,
+    allowed=allowed,
+    validators=validators,
+  )
+  return spec.try_parse_many(user_inputs)
+
+
+def int_array_input(
+  prompt: str | None = None,
+  min_value: int | None = None,
+  max_value: int | None = None,
+  default_value: Any | None = None,
+  type_error_message: str | None = None,
+  delimiter: str | None = None,
+  stdin: IO[Any] | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  validators: Iterable[Validator] | None = None,
+  stdout: IO[Any] | None = None,
+) -> np.ndarray:
+  """Prompts to enter a line of integers, returned as a NumPy `int64` array.
 
+  The line is split and converted in bulk by NumPy, and the range validation
+  runs as array comparisons rather than one Python comparison per element.
+  Requires the optional NumPy dependency: pip install "typed-input[numpy]".
 
-def _get_python_version() -> str:
-  """Returns the Python version in the format 'major.minor'."""
-  return f'{sys.version_info.major}.{sys.version_info.minor}'
+  Args:
+    prompt: A message displayed when prompting for input. If not provided, no
+      prompt is shown.
+    min_value: The minimum acceptable value for every element. If provided,
+      the function will only accept lines where every integer is greater than or
+      equal to this value.
+    max_value: The maximum acceptable value for every element. If provided,
+      the function will only accept lines where every integer is less than or
+      equal to this value.
+    default_value: An array-like returned when the user inputs an empty line.
+      If not specified, empty input will not be allowed.
+    type_error_message: A custom error message displayed when the user enters a
+      non-integer value. The default message if not provided is:
+      'Error: You must enter a valid integer.'
+    delimiter: The string separating values, e.g. ','. Defaults to any
+      whitespace.
+    stdin: If provided, every line of this binary (UTF-8 encoded) or text
+      stream is read into one array instead of prompting for a single line.
+      Blank lines are skipped.
+    timeout: If provided, the seconds to wait for the line of input. Uses
+      `select` on stdin, so it needs a POSIX terminal or pipe.
+    deadline: If provided, the seconds to wait for valid input in total, so
+      repeated invalid input cannot hold the prompt indefinitely.
+    validators: If provided, custom checks run on every element within the
+      bounds. A validator's `vectorized` function checks the whole array at
+      once; otherwise `check` is called once per element.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`. Output is buffered and flushed once
+      per line read.
 
+  Returns:
+    numpy.ndarray: A one dimensional `int64` array of the validated input, or
+      the default value if it is set and the empty string is provided or the
+      timeout or deadline expires.
 
-_FROMISOFORMAT_DOCS_URL = f'https://docs.python.org/{_get_python_version()}/library/datetime.html#datetime.datetime.fromisoformat'
-_BASE_INVALID_TYPE_ERROR = 'Error: You must enter a valid'
-_DEFAULT_INT_INPUT_TYPE_ERROR = f'{_BASE_INVALID_TYPE_ERROR} integer.'
-_DEFAULT_FLOAT_INPUT_TYPE_ERROR = f'{_BASE_INVALID_TYPE_ERROR} float.'
-_DEFAULT_DECIMAL_INPUT_TYPE_ERROR = f'{_BASE_INVALID_TYPE_ERROR} Decimal.'
-_DEFAULT_DATETIME_INPUT_TYPE_ERROR = (
-  f'{_BASE_INVALID_TYPE_ERROR} datetime in valid ISO 8601 format e.g. YYYY-MM-DD.\n'
-  f'See {_FROMISOFORMAT_DOCS_URL} for all allowed options.'
-)
-_T = TypeVar('_T', int, float, Decimal, datetime)
+  Raises:
+    ImportError: If NumPy is not installed.
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but any of its elements fall
+      outside the range defined by `min_value` or `max_value`.
+    ValueError: If reading from `stdin` and any value is invalid. The message
+      is prefixed with the line number of the invalid value.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
+  """
+  if not type_error_message:
+    type_error_message = _DEFAULT_INT_INPUT_TYPE_ERROR
+  return _generic_array_input(
+    prompt=prompt,
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    dtype='int64',
+    delimiter=delimiter,
+    stdin=stdin,
+    timeout=timeout,
+    deadline=deadline,
+    validators=validators,
+    stdout=stdout,
+  )
 
 
-def _generic_single_value_input(
-  prompt: str | None,
-  min_value: _T | None,
-  max_value: _T | None,
-  default_value: _T | None,
-  type_error_message: str,
-  conversion_function: Callable[[str], _T],
-) -> _T:
-  """Generic function that prompts for input until valid input of desired type.
+def float_array_input(
+  prompt: str | None = None,
+  min_value: float | None = None,
+  max_value: float | None = None,
+  default_value: Any | None = None,
+  type_error_message: str | None = None,
+  delimiter: str | None = None,
+  stdin: IO[Any] | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  validators: Iterable[Validator] | None = None,
+  stdout: IO[Any] | None = None,
+) -> np.ndarray:
+  """Prompts to enter a line of floats, returned as a NumPy `float64` array.
+
+  The line is split and converted in bulk by NumPy, and the range validation
+  runs as array comparisons rather than one Python comparison per element.
+  Requires the optional NumPy dependency: pip install "typed-input[numpy]".
 
   Args:
     prompt: A message displayed when prompting for input. If not provided, no
       prompt is shown.
-    min_value: The minimum acceptable value for the input. If provided, the
-      function will only accept values greater than or equal to this value.
-    max_value: The maximum acceptable value for the input. If provided,
-      function will only accept values less than or equal to this value.
-    default_value: A value to be used when the user inputs an empty string. If
-      not specified, empty input will not be allowed, and the user will be
-      required to provide a valid input of the specified type.
+    min_value: The minimum acceptable value for every element. If provided,
+      the function will only accept lines where every float is greater than or
+      equal to this value.
+    max_value: The maximum acceptable value for every element. If provided,
+      the function will only accept lines where every float is less than or
+      equal to this value.
+    default_value: An array-like returned when the user inputs an empty line.
+      If not specified, empty input will not be allowed.
     type_error_message: A custom error message displayed when the user enters a
-      value not of the specified type.
-    conversion_function: Function to try convert the user input string to the
-      desired type.
+      non-float value. The default message if not provided is:
+      'Error: You must enter a valid float.'
+    delimiter: The string separating values, e.g. ','. Defaults to any
+      whitespace.
+    stdin: If provided, every line of this binary (UTF-8 encoded) or text
+      stream is read into one array instead of prompting for a single line.
+      Blank lines are skipped.
+    timeout: If provided, the seconds to wait for the line of input. Uses
+      `select` on stdin, so it needs a POSIX terminal or pipe.
+    deadline: If provided, the seconds to wait for valid input in total, so
+      repeated invalid input cannot hold the prompt indefinitely.
+    validators: If provided, custom checks run on every element within the
+      bounds. A validator's `vectorized` function checks the whole array at
+      once; otherwise `check` is called once per element.
+    stdout: If provided, a text or binary stream to write the prompt and error
+      messages to instead of `sys.stdout`. Output is buffered and flushed once
+      per line read.
 
   Returns:
-    T: Validated input of the specified type, or the default value if it is set
-      and the empty string is provided.
+    numpy.ndarray: A one dimensional `float64` array of the validated input, or
+      the default value if it is set and the empty string is provided or the
+      timeout or deadline expires.
 
   Raises:
+    ImportError: If NumPy is not installed.
     ValueError: If both `min_value` and `max_value` are specified, and
       `min_value` is greater than `max_value`.
-    ValueError: If `default_value` is specified but falls outside the range
-      defined by `min_value` or `max_value`.
+    ValueError: If `default_value` is specified but any of its elements fall
+      outside the range defined by `min_value` or `max_value`.
+    ValueError: If reading from `stdin` and any value is invalid. The message
+      is prefixed with the line number of the invalid value.
+    InputTimeout: If the timeout or deadline expires and there is no default
+      value.
   """
-  if min_value is not None and max_value is not None and min_value > max_value:
-    raise ValueError(f'({min_value=}) is greater than ({max_value=}).')
-  if default_value is not None:
-    if min_value is not None and default_value < min_value:
-      raise ValueError(f'({default_value=}) is less than ({min_value=}).')
-    if max_value is not None and default_value > max_value:
-      raise ValueError(f'({default_value=}) is greater than ({max_value=}).')
-  while True:
-    try:
-      user_input = input(prompt) if prompt else input()
-      if not user_input.strip() and default_value is not None:
-        return default_value
-      value = conversion_function(user_input)
-      if min_value is not None and value < min_value:
-        print(f'Error: Value must be at least {min_value}.')
-        continue
-      if max_value is not None and value > max_value:
-        print(f'Error: Value must be at most {max_value}.')
-        continue
-      return value
-    except (ValueError, decimal.DecimalException):
-      print(type_error_message)
+  if not type_error_message:
+    type_error_message = _DEFAULT_FLOAT_INPUT_TYPE_ERROR
+  return _generic_array_input(
+    prompt=prompt,
+    min_value=min_value,
+    max_value=max_value,
+    default_value=default_value,
+    type_error_message=type_error_message,
+    dtype='float64',
+    delimiter=delimiter,
+    stdin=stdin,
+    timeout=timeout,
+    deadline=deadline,
+    validators=validators,
+    stdout=stdout,
+  )
 
 
-def int_input(
+async def async_int_input(
   prompt: str | None = None,
   min_value: int | None = None,
   max_value: int | None = None,
   default_value: int | None = None,
   type_error_message: str | None = None,
+  reader: asyncio.StreamReader | None = None,
 ) -> int:
-  """Prompts to enter an int, with optional default and range validation.
+  """Awaits an integer without blocking the event loop, like `int_input`.
+
+  Stdin is read through the running event loop, so other tasks keep running
+  while waiting for the user. The coroutine can be cancelled, or wrapped in
+  `asyncio.wait_for` or `asyncio.timeout`, without losing buffered input.
 
   Args:
     prompt: A message displayed when prompting for input. If not provided, no
@@ -105,8 +4719,9 @@ def int_input(
       not specified, empty input will not be allowed, and the user will be
       required to provide a valid integer.
     type_error_message: A custom error message displayed when the user enters a
-      non-integer value. The default message if not provided is:
-      'Error: You must enter a valid integer.'
+      non-integer value. The default message if not provided is the same as for
+      `int_input`.
+    reader: An asyncio StreamReader to read lines from instead of stdin.
 
   Returns:
     int: The validated integer input entered, or the default value
@@ -117,27 +4732,34 @@ def int_input(
       `min_value` is greater than `max_value`.
     ValueError: If `default_value` is specified but falls outside the range
       defined by `min_value` or `max_value`.
+    EOFError: If the input ends before a valid integer is entered.
   """
   if not type_error_message:
     type_error_message = _DEFAULT_INT_INPUT_TYPE_ERROR
-  return _generic_single_value_input(
+  return await _generic_async_single_value_input(
     prompt=prompt,
     min_value=min_value,
     max_value=max_value,
     default_value=default_value,
     type_error_message=type_error_message,
     conversion_function=int,
+    reader=reader,
   )
 
 
-def float_input(
+async def async_float_input(
   prompt: str | None = None,
   min_value: float | None = None,
   max_value: float | None = None,
   default_value: float | None = None,
   type_error_message: str | None = None,
+  reader: asyncio.StreamReader | None = None,
 ) -> float:
-  """Prompts to enter a float, with optional default and range validation.
+  """Awaits a float without blocking the event loop, like `float_input`.
+
+  Stdin is read through the running event loop, so other tasks keep running
+  while waiting for the user. The coroutine can be cancelled, or wrapped in
+  `asyncio.wait_for` or `asyncio.timeout`, without losing buffered input.
 
   Args:
     prompt: A message displayed when prompting for input. If not provided, no
@@ -150,8 +4772,9 @@ def float_input(
       not specified, empty input will not be allowed, and the user will be
       required to provide a valid float.
     type_error_message: A custom error message displayed when the user enters a
-      non-float value. The default message if not provided is:
-      'Error: You must enter a valid float.'
+      non-float value. The default message if not provided is the same as for
+      `float_input`.
+    reader: An asyncio StreamReader to read lines from instead of stdin.
 
   Returns:
     float: The validated float input entered, or the default value
@@ -162,27 +4785,34 @@ def float_input(
       `min_value` is greater than `max_value`.
     ValueError: If `default_value` is specified but falls outside the range
       defined by `min_value` or `max_value`.
+    EOFError: If the input ends before a valid float is entered.
   """
   if not type_error_message:
     type_error_message = _DEFAULT_FLOAT_INPUT_TYPE_ERROR
-  return _generic_single_value_input(
+  return await _generic_async_single_value_input(
     prompt=prompt,
     min_value=min_value,
     max_value=max_value,
     default_value=default_value,
     type_error_message=type_error_message,
     conversion_function=float,
+    reader=reader,
   )
 
 
-def decimal_input(
+async def async_decimal_input(
   prompt: str | None = None,
   min_value: Decimal | None = None,
   max_value: Decimal | None = None,
   default_value: Decimal | None = None,
   type_error_message: str | None = None,
+  reader: asyncio.StreamReader | None = None,
 ) -> Decimal:
-  """Prompts to enter a Decimal, with optional default and range validation.
+  """Awaits a Decimal without blocking the event loop, like `decimal_input`.
+
+  Stdin is read through the running event loop, so other tasks keep running
+  while waiting for the user. The coroutine can be cancelled, or wrapped in
+  `asyncio.wait_for` or `asyncio.timeout`, without losing buffered input.
 
   Args:
     prompt: A message displayed when prompting for input. If not provided, no
@@ -195,8 +4825,9 @@ def decimal_input(
       not specified, empty input will not be allowed, and the user will be
       required to provide a valid Decimal.
     type_error_message: A custom error message displayed when the user enters a
-      non-Decimal value. The default message if not provided is:
-      'Error: You must enter a valid Decimal.'
+      non-Decimal value. The default message if not provided is the same as for
+      `decimal_input`.
+    reader: An asyncio StreamReader to read lines from instead of stdin.
 
   Returns:
     Decimal: The validated Decimal input entered, or the default value
@@ -207,27 +4838,34 @@ def decimal_input(
       `min_value` is greater than `max_value`.
     ValueError: If `default_value` is specified but falls outside the range
       defined by `min_value` or `max_value`.
+    EOFError: If the input ends before a valid Decimal is entered.
   """
   if not type_error_message:
     type_error_message = _DEFAULT_DECIMAL_INPUT_TYPE_ERROR
-  return _generic_single_value_input(
+  return await _generic_async_single_value_input(
     prompt=prompt,
     min_value=min_value,
     max_value=max_value,
     default_value=default_value,
     type_error_message=type_error_message,
-    conversion_function=Decimal,
+    conversion_function=_decimal_type(),
+    reader=reader,
   )
 
 
-def datetime_input(
+async def async_datetime_input(
   prompt: str | None = None,
   min_value: datetime | None = None,
   max_value: datetime | None = None,
   default_value: datetime | None = None,
   type_error_message: str | None = None,
+  reader: asyncio.StreamReader | None = None,
 ) -> datetime:
-  """Prompts to enter a datetime, with optional default and range validation.
+  """Awaits a datetime without blocking the event loop, like `datetime_input`.
+
+  Stdin is read through the running event loop, so other tasks keep running
+  while waiting for the user. The coroutine can be cancelled, or wrapped in
+  `asyncio.wait_for` or `asyncio.timeout`, without losing buffered input.
 
   Args:
     prompt: A message displayed when prompting for input. If not provided, no
@@ -240,13 +4878,12 @@ def datetime_input(
       not specified, empty input will not be allowed, and the user will be
       required to provide a valid datetime.
     type_error_message: A custom error message displayed when the user enters a
-      invalid datetime value. The default message if not provided is:
-      'Error: You must enter a valid datetime in valid ISO 8601 format e.g. YYYY-MM-DD.'
-      Along with a link to the the other allowed format options for the python
-      version being used (Python 3.11 introduced more allowed formats).
+      invalid datetime value. The default message if not provided is the same
+      as for `datetime_input`.
+    reader: An asyncio StreamReader to read lines from instead of stdin.
 
   Returns:
-    Decimal: The validated Decimal input entered, or the default value
+    datetime: The validated datetime input entered, or the default value
       if it is set and the empty string is provided.
 
   Raises:
@@ -254,14 +4891,702 @@ def datetime_input(
       `min_value` is greater than `max_value`.
     ValueError: If `default_value` is specified but falls outside the range
       defined by `min_value` or `max_value`.
+    EOFError: If the input ends before a valid datetime is entered.
   """
   if not type_error_message:
-    type_error_message = _DEFAULT_DATETIME_INPUT_TYPE_ERROR
-  return _generic_single_value_input(
+    type_error_message = _default_datetime_input_type_error()
+  return await _generic_async_single_value_input(
     prompt=prompt,
     min_value=min_value,
     max_value=max_value,
     default_value=default_value,
     type_error_message=type_error_message,
-    conversion_function=datetime.fromisoformat,
+    conversion_function=_default_datetime_parser()._parse,
+    reader=reader,
+  )
+
+
+class _PromptRequest(NamedTuple):
+  """A prompt queued on a `ConsoleScheduler`, and the future for its value."""
+
+  spec: InputSpec[Any]
+  prompt: str | None
+  timeout: float | None
+  deadline: float | None
+  future: concurrent.futures.Future[Any]
+
+
+class ConsoleScheduler:
+  """Runs prompts submitted from many threads one at a time on one console.
+
+  A single worker thread owns stdin and stdout. Prompts are queued by
+  priority, lowest first, and then in submission order. Each prompt returns a
+  `concurrent.futures.Future` that resolves to the validated value, or to the
+  exception the prompt raised, e.g. `InputTimeout` or `EOFError`. A prompt's
+  retries and error messages complete before the next prompt is shown, so
+  concurrent prompts never interleave and each line reaches the prompt that
+  asked for it.
+
+  When stdin is piped rather than a terminal, or `stdin` is given, one stream
+  session answers the whole backlog of queued prompts straight from the
+  buffered input. Output is flushed once per line read and once when the
+  backlog is empty.
+
+  Example:
+    >>> with ConsoleScheduler() as scheduler:
+    ...   port = scheduler.submit(IntSpec(min_value=1), 'Port: ')
+    ...   host = scheduler.submit(ChoiceSpec(hosts), 'Host: ', priority=-1)
+    ...   print(host.result(), port.result())
+  """
+
+  def __init__(
+    self, stdin: IO[Any] | None = None, stdout: IO[Any] | None = None
+  ) -> None:
+    """Initializes the scheduler. The worker starts with the first prompt.
+
+    Args:
+      stdin: A text or binary stream to read lines from instead of stdin.
+      stdout: A text or binary stream to write prompts and error messages to
+        instead of stdout.
+    """
+    import queue
+    import threading
+
+    self._stdin = stdin
+    self._stdout = stdout
+    self._queue: queue.PriorityQueue[
+      tuple[float, int, _PromptRequest | None]
+    ] = queue.PriorityQueue()
+    self._sequence = itertools.count()
+    self._lock = threading.Lock()
+    self._thread: threading.Thread | None = None
+    self._closed = False
+
+  def __enter__(self) -> Self:
+    return self
+
+  def __exit__(self, *unused_exc_info: object) -> None:
+    self.close()
+
+  def submit(
+    self,
+    spec: InputSpec[_T],
+    prompt: str | None = None,
+    priority: float = 0,
+    timeout: float | None = None,
+    deadline: float | None = None,
+  ) -> concurrent.futures.Future[_T]:
+    """Queues a prompt and returns a future for its validated value.
+
+    Args:
+      spec: The validation rules, e.g. `IntSpec(min_value=0)`.
+      prompt: A message displayed when prompting for input. If not provided,
+        no prompt is shown.
+      priority: Prompts with a lower priority are shown first. Prompts with
+        the same priority are shown in submission order.
+      timeout: The seconds to wait for each line of input, once shown.
+      deadline: The seconds to wait for valid input in total, once shown.
+
+    Returns:
+      concurrent.futures.Future: Resolves to the validated value, or to the
+        exception raised by the prompt. Cancelling it before the prompt is
+        shown skips the prompt.
+
+    Raises:
+      RuntimeError: If the scheduler has been closed.
+    """
+    import concurrent.futures
+
+    future: concurrent.futures.Future[_T] = concurrent.futures.Future()
+    request = _PromptRequest(spec, prompt, timeout, deadline, future)
+    with self._lock:
+      if self._closed:
+        raise RuntimeError('Cannot submit a prompt to a closed scheduler.')
+      if self._thread is None:
+        import threading
+
+        self._thread = threading.Thread(
+          target=self._run, name='typed_input-console', daemon=True
+        )
+        self._thread.start()
+      self._queue.put((priority, next(self._sequence), request))
+    return future
+
+  def close(self, wait: bool = True) -> None:
+    """Stops accepting prompts once every queued prompt has been answered.
+
+    Args:
+      wait: Whether to block until the queued prompts have been answered.
+    """
+    with self._lock:
+      if self._closed:
+        return
+      self._closed = True
+      thread = self._thread
+      if thread is not None:
+        self._queue.put((float('inf'), next(self._sequence), None))
+    if wait and thread is not None:
+      thread.join()
+
+  def _abort(self, error: BaseException) -> None:
+    """Closes the scheduler and fails every queued prompt with `error`."""
+    with self._lock:
+      self._closed = True
+      while not self._queue.empty():
+        _, _, request = self._queue.get_nowait()
+        if (
+          request is not None and request.future.set_running_or_notify_cancel()
+        ):
+          request.future.set_exception(error)
+
+  def _session(self) -> _StreamSession | None:
+    """Returns the stream session for piped input, or None for a terminal."""
+    if self._stdin is None and self._stdout is None:
+      try:
+        if sys.stdin.isatty():
+          return None
+      except (AttributeError, ValueError):
+        return None
+    return _StreamSession(self._stdin, self._stdout)
+
+  def _run(self) -> None:
+    session = self._session()
+    while True:
+      _, _, request = self._queue.get()
+      if request is None:
+        break
+      if not request.future.set_running_or_notify_cancel():
+        continue
+      spec, prompt, timeout, deadline, future = request
+      try:
+        if session is None:
+          value = spec.prompt(prompt, timeout, deadline)
+        else:
+          value = spec._prompt_in_session(session, prompt, timeout, deadline)
+      except Exception as e:  # noqa: BLE001
+        # Any error, e.g. one raised by a validator, fails only its own prompt
+        # and is raised by the caller's future.result().
+        future.set_exception(e)
+      except BaseException as e:
+        # SystemExit or KeyboardInterrupt stop the worker, so every waiting
+        # prompt is failed and no more are accepted.
+        future.set_exception(e)
+        self._abort(e)
+        raise
+      else:
+        future.set_result(value)
+      if session is not None and self._queue.empty():
+        session.flush()
+    if session is not None:
+      session.flush()
+
+
+_CONSOLE_SCHEDULER: ConsoleScheduler | None = None
+# A lock from the low level _thread module, so that threading is only imported
+# when the scheduler is first used.
+_CONSOLE_SCHEDULER_LOCK = _thread.allocate_lock()
+
+
+def console_scheduler() -> ConsoleScheduler:
+  """Returns the scheduler shared by the `*_input_future` functions."""
+  global _CONSOLE_SCHEDULER
+  with _CONSOLE_SCHEDULER_LOCK:
+    if _CONSOLE_SCHEDULER is None:
+      _CONSOLE_SCHEDULER = ConsoleScheduler()
+    return _CONSOLE_SCHEDULER
+
+
+def int_input_future(
+  prompt: str | None = None,
+  min_value: int | None = None,
+  max_value: int | None = None,
+  default_value: int | None = None,
+  type_error_message: str | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  allowed: Iterable[int | tuple[int, int]] | None = None,
+  validators: Iterable[Validator] | None = None,
+  priority: float = 0,
+) -> concurrent.futures.Future[int]:
+  """Queues an `int_input` prompt on the shared console scheduler.
+
+  Safe to call from any thread. The prompt is shown once every prompt queued
+  before it with the same or a lower priority has been answered.
+
+  Args:
+    prompt: A message displayed when prompting for input.
+    min_value: The minimum acceptable value, if any.
+    max_value: The maximum acceptable value, if any.
+    default_value: A value to be used when the user inputs an empty string.
+    type_error_message: A custom error message for non-integer input.
+    timeout: The seconds to wait for each line of input, once shown.
+    deadline: The seconds to wait for valid input in total, once shown.
+    allowed: The values and inclusive `(low, high)` intervals allowed.
+    validators: Custom checks run on values within the bounds.
+    priority: Prompts with a lower priority are shown first.
+
+  Returns:
+    concurrent.futures.Future[int]: Resolves to the validated integer.
+
+  Raises:
+    ValueError: If the bounds, default value or allowed values are invalid.
+  """
+  spec = IntSpec(
+    min_value, max_value, default_value, type_error_message, allowed, validators
+  )
+  return console_scheduler().submit(spec, prompt, priority, timeout, deadline)
+
+
+def float_input_future(
+  prompt: str | None = None,
+  min_value: float | None = None,
+  max_value: float | None = None,
+  default_value: float | None = None,
+  type_error_message: str | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  allowed: Iterable[float | tuple[float, float]] | None = None,
+  validators: Iterable[Validator] | None = None,
+  priority: float = 0,
+) -> concurrent.futures.Future[float]:
+  """Queues a `float_input` prompt on the shared console scheduler.
+
+  Takes the same arguments as `int_input_future`, for floats.
+  """
+  spec = FloatSpec(
+    min_value, max_value, default_value, type_error_message, allowed, validators
+  )
+  return console_scheduler().submit(spec, prompt, priority, timeout, deadline)
+
+
+def decimal_input_future(
+  prompt: str | None = None,
+  min_value: Decimal | None = None,
+  max_value: Decimal | None = None,
+  default_value: Decimal | None = None,
+  type_error_message: str | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  allowed: Iterable[Decimal | tuple[Decimal, Decimal]] | None = None,
+  validators: Iterable[Validator] | None = None,
+  places: int | None = None,
+  rounding: str | None = None,
+  max_digits: int | None = None,
+  priority: float = 0,
+) -> concurrent.futures.Future[Decimal]:
+  """Queues a `decimal_input` prompt on the shared console scheduler.
+
+  Takes the same arguments as `int_input_future`, for Decimals, and the
+  `places`, `rounding` and `max_digits` of `decimal_input`.
+  """
+  spec = DecimalSpec(
+    min_value,
+    max_value,
+    default_value,
+    type_error_message,
+    allowed,
+    validators,
+    places,
+    rounding,
+    max_digits,
+  )
+  return console_scheduler().submit(spec, prompt, priority, timeout, deadline)
+
+
+def datetime_input_future(
+  prompt: str | None = None,
+  min_value: datetime | None = None,
+  max_value: datetime | None = None,
+  default_value: datetime | None = None,
+  type_error_message: str | None = None,
+  tz: tzinfo | None = None,
+  timeout: float | None = None,
+  deadline: float | None = None,
+  allowed: Iterable[datetime | tuple[datetime, datetime]] | None = None,
+  validators: Iterable[Validator] | None = None,
+  priority: float = 0,
+) -> concurrent.futures.Future[datetime]:
+  """Queues a `datetime_input` prompt on the shared console scheduler.
+
+  Takes the same arguments as `int_input_future`, for datetimes, and `tz` to
+  normalize the input, bounds and default value to one timezone.
+  """
+  spec = DateTimeSpec(
+    min_value,
+    max_value,
+    default_value,
+    type_error_message,
+    tz,
+    allowed=allowed,
+    validators=validators,
+  )
+  return console_scheduler().submit(spec, prompt, priority, timeout, deadline)
+
+
+class FormField(NamedTuple):
+  """One typed field of a form served with `serve`.
+
+  Attributes:
+    name: The key of the field's value in the submitted values.
+    spec: The validation rules for the field, e.g. `IntSpec(min_value=0)`.
+    prompt: The message displayed when prompting for the field.
+  """
+
+  name: str
+  spec: InputSpec[Any]
+  prompt: str | None = None
+
+
+async def _serve_form(
+  form: Sequence[FormField],
+  on_submit: Callable[[dict[str, Any]], Any] | None,
+  reader: asyncio.StreamReader,
+  writer: asyncio.StreamWriter,
+) -> None:
+  """Walks one connection through every field of a form, then closes it."""
+  try:
+    values = {}
+    try:
+      for field in form:
+        values[field.name] = await field.spec.async_prompt(
+          field.prompt, reader, writer
+        )
+    except ValueError:
+      # The client sent a line longer than the reader's limit. The rest of
+      # the stream can't be split into lines reliably, so it is dropped.
+      return
+    await writer.drain()
+    if on_submit is not None:
+      import inspect
+
+      result = on_submit(values)
+      if inspect.isawaitable(result):
+        await result
+  except (EOFError, ConnectionError):
+    pass
+  finally:
+    writer.close()
+    try:
+      await writer.wait_closed()
+    except ConnectionError:
+      pass
+
+
+async def serve(
+  form: Sequence[FormField],
+  host: str | None = '127.0.0.1',
+  port: int = 0,
+  *,
+  path: str | None = None,
+  on_submit: Callable[[dict[str, Any]], Any] | None = None,
+) -> asyncio.Server:
+  """Starts a server that prompts each connection for the fields of a form.
+
+  Every connection is a coroutine on the running event loop rather than a
+  thread or process, so thousands of concurrent sessions cost a few KB each.
+  A connection is walked through the fields in order, with the same bounds,
+  defaults and error messages as the interactive prompts, and is closed once
+  the form is submitted or the client disconnects.
+
+  Example:
+    >>> async def main():
+    ...   form = [
+    ...     FormField('reading', FloatSpec(min_value=0), 'Reading: '),
+    ...     FormField('taken_at', DateTimeSpec(), 'Taken at: '),
+    ...   ]
+    ...   server = await serve(form, port=7000, on_submit=print)
+    ...   async with server:
+    ...     await server.serve_forever()
+
+  Args:
+    form: The fields to prompt for, in order.
+    host: The interface to listen on. Defaults to localhost only.
+    port: The TCP port to listen on. Defaults to a free port, which can be
+      read from `server.sockets[0].getsockname()`.
+    path: If provided, listen on this Unix socket path instead of TCP.
+    on_submit: A function or coroutine function called with a dict mapping
+      each field name to its validated value when a connection completes the
+      form.
+
+  Returns:
+    asyncio.Server: The listening server. Close it to stop accepting
+      connections.
+  """
+  import asyncio
+
+  handler = functools.partial(_serve_form, tuple(form), on_submit)
+  if path is not None:
+    return await asyncio.start_unix_server(
+      handler, path, backlog=_SERVE_BACKLOG
+    )
+  return await asyncio.start_server(handler, host, port, backlog=_SERVE_BACKLOG)
+
+
+def validate_file(
+  path: str | os.PathLike[str],
+  value_type: type = int,
+  min_value: Any | None = None,
+  max_value: Any | None = None,
+  default_value: Any | None = None,
+  type_error_message: str | None = None,
+  max_errors: int | None = _DEFAULT_MAX_REPORTED_ERRORS,
+  keep_values: bool = True,
+  workers: int | None = None,
+  allowed: Iterable[Any] | None = None,
+  validators: Iterable[Validator] | None = None,
+) -> FileValidationResult:
+  """Validates every line of a file with the rules of the `*_input` functions.
+
+  The file is memory-mapped rather than read through `input()`, so multi-GB
+  files are validated without loading them into memory, while each line is
+  converted and checked exactly as `int_input`, `float_input`, `decimal_input`
+  or `datetime_input` would.
+
+  Args:
+    path: The file to validate, with one UTF-8 encoded value per line.
+    value_type: The type of every value: int, float, Decimal or datetime.
+    min_value: The minimum acceptable value, if any.
+    max_value: The maximum acceptable value, if any.
+    default_value: A value used for each empty line. If not specified, empty
+      lines are invalid.
+    type_error_message: A custom error message for values not of `value_type`.
+      Defaults to the message of the matching `*_input` function.
+    max_errors: The maximum number of errors to report. Further invalid lines
+      are only counted. None reports every error.
+    keep_values: Whether to collect the valid values. Pass False to only check
+      a file too large for its values to fit in memory.
+    workers: If greater than 1, the file is split into newline-aligned chunks
+      that are converted and validated across a `ProcessPoolExecutor` with
+      this many processes, which speeds up CPU-bound conversions such as
+      Decimal and datetime on large files. The results are merged in order
+      and errors are still reported by line number in the whole file. Like
+      any process pool, this must be called from under an
+      `if __name__ == '__main__':` guard on platforms that spawn processes.
+    allowed: The values and inclusive `(low, high)` intervals every value must
+      fall in, if any.
+    validators: Custom checks run on values within the bounds, if any. With
+      `workers`, their functions must be picklable, e.g. defined at module
+      level.
+
+  Returns:
+    FileValidationResult: The valid values and a line-numbered error report.
+
+  Raises:
+    TypeError: If `value_type` is not supported.
+    ValueError: If both `min_value` and `max_value` are specified, and
+      `min_value` is greater than `max_value`.
+    ValueError: If `default_value` is specified but falls outside the range
+      defined by `min_value` or `max_value`.
+    OSError: If the file cannot be opened.
+  """
+  spec_kwargs = {
+    'min_value': min_value,
+    'max_value': max_value,
+    'default_value': default_value,
+    'type_error_message': type_error_message,
+    'allowed': None if allowed is None else list(allowed),
+    'validators': None if validators is None else list(validators),
+  }
+  import mmap
+
+  spec = _spec_for_type(value_type, **spec_kwargs)
+  with open(path, 'rb') as f:
+    if not os.fstat(f.fileno()).st_size:
+      return FileValidationResult([], [], 0, 0)
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+      chunks = _newline_aligned_chunks(mapped, workers)
+      if len(chunks) == 1:
+        return _validate_lines(
+          iter(mapped.readline, b''), spec, max_errors, keep_values
+        )
+  import concurrent.futures
+
+  with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+    chunk_results = executor.map(
+      _validate_file_chunk,
+      *zip(
+        *(
+          (path, start, end, value_type, spec_kwargs, max_errors, keep_values)
+          for start, end in chunks
+        )
+      ),
+    )
+    return _merge_chunk_results(chunk_results, max_errors)
+
+
+def _newline_aligned_chunks(
+  mapped: mmap.mmap, workers: int | None
+) -> list[tuple[int, int]]:
+  """Splits a mapped file into (start, end) byte ranges of whole lines.
+
+  Files are only split for more than one worker, into a few chunks per worker
+  so that uneven chunks still balance, but never into chunks smaller than
+  `_MIN_PARALLEL_CHUNK_SIZE`.
+  """
+  size = len(mapped)
+  if workers is None or workers < 2:
+    return [(0, size)]
+  chunk_count = min(
+    workers * _CHUNKS_PER_WORKER, size // _MIN_PARALLEL_CHUNK_SIZE
+  )
+  chunks = []
+  start = 0
+  for i in range(1, chunk_count):
+    newline = mapped.find(b'\n', max(start, size * i // chunk_count))
+    if newline == -1:
+      break
+    chunks.append((start, newline + 1))
+    start = newline + 1
+  if start < size or not chunks:
+    chunks.append((start, size))
+  return chunks
+
+
+def _mapped_lines(mapped: mmap.mmap, start: int, end: int) -> Iterator[bytes]:
+  """Yields the lines of a mapped file between two newline-aligned offsets."""
+  mapped.seek(start)
+  readline = mapped.readline
+  while mapped.tell() < end:
+    yield readline()
+
+
+def _validate_file_chunk(
+  path: str | os.PathLike[str],
+  start: int,
+  end: int,
+  value_type: type,
+  spec_kwargs: dict[str, Any],
+  max_errors: int | None,
+  keep_values: bool,
+) -> FileValidationResult:
+  """Validates one chunk of a file in a worker process.
+
+  The spec is rebuilt in the worker from its arguments, since some conversion
+  functions such as the cached datetime parser cannot be pickled. Line numbers
+  in the result are relative to the start of the chunk.
+  """
+  import mmap
+
+  spec = _spec_for_type(value_type, **spec_kwargs)
+  with contextlib.ExitStack() as stack:
+    f = stack.enter_context(open(path, 'rb'))
+    mapped = stack.enter_context(
+      mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    )
+    return _validate_lines(
+      _mapped_lines(mapped, start, end), spec, max_errors, keep_values
+    )
+
+
+def _merge_chunk_results(
+  chunk_results: Iterable[FileValidationResult], max_errors: int | None
+) -> FileValidationResult:
+  """Merges in-order chunk results, renumbering errors by global line."""
+  values: list[Any] = []
+  errors: list[tuple[int, str]] = []
+  error_count = line_count = 0
+  for chunk in chunk_results:
+    values.extend(chunk.values)
+    for line_number, message in chunk.errors:
+      if max_errors is not None and len(errors) >= max_errors:
+        break
+      errors.append((line_count + line_number, message))
+    error_count += chunk.error_count
+    line_count += chunk.line_count
+  return FileValidationResult(values, errors, error_count, line_count)
+
+
+def _cli_types() -> dict[str, type]:
+  """Returns the value types selectable with `--type`, by name."""
+  import fractions
+  import ipaddress
+  import uuid
+  from datetime import date, datetime, timedelta
+  from datetime import time as dt_time
+  from decimal import Decimal
+
+  return {
+    'int': int,
+    'float': float,
+    'decimal': Decimal,
+    'datetime': datetime,
+    'date': date,
+    'time': dt_time,
+    'timedelta': timedelta,
+    'fraction': fractions.Fraction,
+    'uuid': uuid.UUID,
+    'ipv4': ipaddress.IPv4Address,
+    'ipv6': ipaddress.IPv6Address,
+  }
+
+
+def main(argv: list[str] | None = None) -> int:
+  """Runs the command line interface, e.g. `python -m typed_input check`.
+
+  Args:
+    argv: The command line arguments. Defaults to `sys.argv[1:]`.
+
+  Returns:
+    int: The exit status: 0 if every file is valid, 1 otherwise.
+  """
+  import argparse
+
+  cli_types = _cli_types()
+  parser = argparse.ArgumentParser(
+    prog='python -m typed_input', description=__doc__
+  )
+  subparsers = parser.add_subparsers(dest='command', required=True)
+  check = subparsers.add_parser(
+    'check', help='Validate files with one value per line.'
   )
+  check.add_argument('paths', nargs='+', metavar='path')
+  check.add_argument('--type', choices=cli_types, default='int')
+  check.add_argument('--min', dest='min_value', help='Minimum value.')
+  check.add_argument('--max', dest='max_value', help='Maximum value.')
+  check.add_argument('--default', dest='default_value', help='Empty lines.')
+  check.add_argument(
+    '--max-errors',
+    type=int,
+    default=_DEFAULT_MAX_REPORTED_ERRORS,
+    help='Maximum errors reported per file.',
+  )
+  check.add_argument(
+    '--workers',
+    type=int,
+    default=None,
+    help='Validate large files across this many processes.',
+  )
+  args = parser.parse_args(argv)
+  value_type = cli_types[args.type]
+  bound_spec = _spec_for_type(value_type)
+  try:
+    bounds = {
+      name: None if value is None else bound_spec.parse(value)
+      for name, value in (
+        ('min_value', args.min_value),
+        ('max_value', args.max_value),
+        ('default_value', args.default_value),
+      )
+    }
+  except ValueError as e:
+    parser.error(str(e))
+  status = 0
+  for path in args.paths:
+    result = validate_file(
+      path,
+      value_type,
+      max_errors=args.max_errors,
+      keep_values=False,
+      workers=args.workers,
+      **bounds,
+    )
+    for line_number, message in result.errors:
+      print(f'{path}:{line_number}: {message}')
+    print(f'{path}: {result.line_count} lines, {result.error_count} errors.')
+    if not result.ok:
+      status = 1
+  return status
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,571 @@
+"""Benchmarks for the typed_input parse and validate hot paths.
+
+Every interactive `*_input` function is driven by scripted input, so the
+numbers measure the library rather than a human. Each case mixes valid values
+with a given rate of invalid input (a type error, or a bounds violation for
+bounded cases), which exercises the retry loop. The bulk `iter_*_input`,
+`int_array_input` and `async_int_input` paths are timed over the same input.
+The cost of `import typed_input` in a fresh interpreter is measured with
+`python -X importtime`, since short-lived command line tools pay it on every
+run. It is checked against a budget relative to a baseline measured the same
+way: importing the modules the original four-prompt typed_input imported.
+
+Usage:
+  python typed_input_benchmark.py                      # print results
+  python typed_input_benchmark.py --save baseline.json # store results
+  python typed_input_benchmark.py --compare typed_input_benchmark_baseline.json
+
+With `--compare`, the exit status is 1 if any case is slower than the baseline
+by more than `--threshold` (default 25%), or is missing from the baseline, so a
+regression fails CI. The exit status is also 1 if importing typed_input takes
+longer than `--import-budget` times the baseline, or loads a module it should
+only import on first use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import builtins
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, NamedTuple
+
+import typed_input
+
+_INVALID_RATES = (0.0, 0.1, 0.5)
+_DEFAULT_VALUES_PER_RUN = 2000
+_DEFAULT_REPEAT = 5
+_DEFAULT_THRESHOLD = 0.25
+_DEFAULT_IMPORT_REPEAT = 10
+# The imports of typed_input when it only had its four original prompts. Their
+# import time is the baseline the import budget is relative to.
+_BASELINE_IMPORTS = ('datetime', 'decimal', 'typing')
+# The most `import typed_input` may take, as a multiple of the baseline. It
+# took about 1.2 times the baseline when this was set.
+_DEFAULT_IMPORT_BUDGET = 1.5
+# Modules typed_input imports only in the functions that need them.
+_DEFERRED_MODULES = (
+  'argparse',
+  'array',
+  'asyncio',
+  'concurrent.futures',
+  'datetime',
+  'decimal',
+  'fractions',
+  'inspect',
+  'ipaddress',
+  'json',
+  'mmap',
+  'numpy',
+  'queue',
+  'select',
+  'threading',
+  'uuid',
+)
+_IMPORT_SCRIPT = (
+  'import sys; before = set(sys.modules); import typed_input; '
+  'print(" ".join(sorted(set(sys.modules) - before)))'
+)
+_BASELINE_IMPORT_SCRIPT = f'import {", ".join(_BASELINE_IMPORTS)}'
+
+
+class _Case(NamedTuple):
+  """One benchmark: a prompt function, its arguments and its input values."""
+
+  name: str
+  function: Callable[..., Any]
+  kwargs: dict[str, Any]
+  valid_values: Callable[[random.Random], str]
+  invalid_value: str
+
+
+def _small_int(rng: random.Random) -> str:
+  return str(rng.randint(-1000, 1000))
+
+
+def _huge_int(rng: random.Random) -> str:
+  return str(rng.getrandbits(1024))
+
+
+def _float(rng: random.Random) -> str:
+  return repr(rng.uniform(-1e6, 1e6))
+
+
+def _short_decimal(rng: random.Random) -> str:
+  return f'{rng.randint(0, 10**6)}.{rng.randint(0, 99):02d}'
+
+
+def _long_decimal(rng: random.Random) -> str:
+  return f'{rng.getrandbits(128)}.{rng.getrandbits(128)}'
+
+
+def _naive_datetime(rng: random.Random) -> str:
+  start = datetime(2020, 1, 1)
+  return (start + timedelta(seconds=rng.randint(0, 10**8))).isoformat()
+
+
+def _repeated_date(rng: random.Random) -> str:
+  return f'2023-11-{rng.randint(1, 28):02d}'
+
+
+def _aware_datetime(rng: random.Random) -> str:
+  offset = timezone(timedelta(minutes=30 * rng.randint(-24, 24)))
+  start = datetime(2020, 1, 1, tzinfo=offset)
+  return (start + timedelta(microseconds=rng.getrandbits(50))).isoformat()
+
+
+def _record(rng: random.Random) -> str:
+  return f'{_small_int(rng)},{_short_decimal(rng)},{_naive_datetime(rng)}'
+
+
+_HOSTNAMES = typed_input.ChoiceSpec(
+  f'host-{i:06d}.example.com' for i in range(200_000)
+)
+
+
+def _hostname_prefix(rng: random.Random) -> str:
+  return f'host-{rng.randrange(200_000):06d}'
+
+
+_RECORD_SCHEMA: tuple[typed_input.RecordField, ...] = (
+  ('qty', int, {'min_value': -1000}),
+  ('price', Decimal, {}),
+  ('ts', datetime, {}),
+)
+
+
+def _generic_int_input(**kwargs: Any) -> int:
+  return typed_input._generic_single_value_input(
+    prompt=None,
+    type_error_message='Error',
+    conversion_function=int,
+    **kwargs,
+  )
+
+
+_CASES = (
+  _Case(
+    'generic_single_value_input/int',
+    _generic_int_input,
+    {'min_value': None, 'max_value': None, 'default_value': None},
+    _small_int,
+    'abc',
+  ),
+  _Case('int_input/small', typed_input.int_input, {}, _small_int, 'abc'),
+  _Case(
+    'int_input/small/bounded',
+    typed_input.int_input,
+    {'min_value': -1000, 'max_value': 1000},
+    _small_int,
+    '5000',
+  ),
+  _Case('int_input/huge', typed_input.int_input, {}, _huge_int, 'abc'),
+  _Case('float_input', typed_input.float_input, {}, _float, 'abc'),
+  _Case(
+    'float_input/bounded',
+    typed_input.float_input,
+    {'min_value': -1e6, 'max_value': 1e6},
+    _float,
+    '1e7',
+  ),
+  _Case(
+    'decimal_input/short', typed_input.decimal_input, {}, _short_decimal, 'x'
+  ),
+  _Case(
+    'decimal_input/long/bounded',
+    typed_input.decimal_input,
+    {'min_value': Decimal(0)},
+    _long_decimal,
+    '-1',
+  ),
+  _Case(
+    'decimal_input/places_2/bounded',
+    typed_input.decimal_input,
+    {'min_value': Decimal(0), 'places': 2, 'max_digits': 10},
+    _short_decimal,
+    '1.005',
+  ),
+  _Case(
+    'choice_input/200k_prefix',
+    typed_input.choice_input,
+    {'options': _HOSTNAMES},
+    _hostname_prefix,
+    'mail',
+  ),
+  _Case(
+    'datetime_input/naive',
+    typed_input.datetime_input,
+    {},
+    _naive_datetime,
+    'invalid',
+  ),
+  _Case(
+    'datetime_input/repeated_dates',
+    typed_input.datetime_input,
+    {'min_value': datetime(2023, 11, 1)},
+    _repeated_date,
+    '2023-10-31',
+  ),
+  _Case(
+    'datetime_input/aware/bounded',
+    typed_input.datetime_input,
+    {'min_value': datetime(2000, 1, 1, tzinfo=timezone.utc)},
+    _aware_datetime,
+    'invalid',
+  ),
+)
+
+
+class _BulkCase(NamedTuple):
+  """One benchmark of a bulk function over a prepared UTF-8 payload."""
+
+  name: str
+  function: Callable[[bytes, int], Any]
+  valid_values: Callable[[random.Random], str]
+  invalid_value: str
+  invalid_rates: tuple[float, ...] = _INVALID_RATES
+
+
+def _iter_input(function: Callable[..., Any]) -> Callable[[bytes, int], Any]:
+  def consume(payload: bytes, unused_values: int) -> Any:
+    return list(function(stdin=io.BytesIO(payload)))
+
+  return consume
+
+
+def _array_input(payload: bytes, unused_values: int) -> Any:
+  return typed_input.int_array_input(stdin=io.BytesIO(payload))
+
+
+def _async_int_input(payload: bytes, values: int) -> Any:
+  async def prompt_all() -> None:
+    reader = asyncio.StreamReader()
+    reader.feed_data(payload)
+    reader.feed_eof()
+    for _ in range(values):
+      await typed_input.async_int_input(reader=reader)
+
+  asyncio.run(prompt_all())
+
+
+_BULK_CASES = (
+  _BulkCase(
+    'iter_int_input', _iter_input(typed_input.iter_int_input), _small_int, 'x'
+  ),
+  _BulkCase(
+    'iter_float_input',
+    _iter_input(typed_input.iter_float_input),
+    _float,
+    'x',
+  ),
+  _BulkCase(
+    'iter_decimal_input',
+    _iter_input(typed_input.iter_decimal_input),
+    _long_decimal,
+    'x',
+  ),
+  _BulkCase(
+    'iter_datetime_input',
+    _iter_input(typed_input.iter_datetime_input),
+    _aware_datetime,
+    'x',
+  ),
+  _BulkCase(
+    'iter_record_input',
+    lambda payload, unused_values: list(
+      typed_input.iter_record_input(_RECORD_SCHEMA, ',', io.BytesIO(payload))
+    ),
+    _record,
+    '1,x,2023-11-15',
+  ),
+  _BulkCase('int_array_input', _array_input, _small_int, 'x', (0.0,)),
+  _BulkCase('async_int_input', _async_int_input, _small_int, 'x'),
+)
+
+
+class _NullWriter(io.TextIOBase):
+  """A stdout or stderr replacement that discards everything written to it."""
+
+  def write(self, s: str) -> int:
+    return len(s)
+
+
+def _scripted_lines(
+  case: _Case | _BulkCase, invalid_rate: float, values: int, seed: int
+) -> list[str]:
+  """Returns `values` valid lines, each preceded by random invalid attempts."""
+  rng = random.Random(seed)
+  lines = []
+  for _ in range(values):
+    while rng.random() < invalid_rate:
+      lines.append(case.invalid_value)
+    lines.append(case.valid_values(rng))
+  return lines
+
+
+def _time_case(case: _Case, lines: list[str], values: int) -> float:
+  """Returns the seconds taken to accept `values` prompts from `lines`."""
+  next_line = iter(lines).__next__
+  original_input, original_stdout = builtins.input, sys.stdout
+  builtins.input = lambda *unused_prompt: next_line()
+  sys.stdout = _NullWriter()
+  try:
+    function, kwargs = case.function, case.kwargs
+    start = time.perf_counter()
+    for _ in range(values):
+      function(**kwargs)
+    return time.perf_counter() - start
+  finally:
+    builtins.input, sys.stdout = original_input, original_stdout
+
+
+def _time_bulk_case(case: _BulkCase, lines: list[str], values: int) -> float:
+  """Returns the seconds taken to run a bulk case over `lines`."""
+  payload = ''.join(f'{line}\n' for line in lines).encode()
+  original_stdout, original_stderr = sys.stdout, sys.stderr
+  sys.stdout = sys.stderr = _NullWriter()
+  try:
+    start = time.perf_counter()
+    case.function(payload, values)
+    return time.perf_counter() - start
+  finally:
+    sys.stdout, sys.stderr = original_stdout, original_stderr
+
+
+def _numpy_installed() -> bool:
+  try:
+    import numpy  # noqa: F401
+  except ImportError:
+    return False
+  return True
+
+
+def _import_time(
+  env: dict[str, str], script: str, modules: tuple[str, ...]
+) -> tuple[int, list[str]]:
+  """Runs a script importing modules in a fresh interpreter.
+
+  Returns:
+    tuple: The total cumulative import time in microseconds reported by
+      `-X importtime` for `modules`, which the script imports directly, and
+      the script's output split into words.
+  """
+  process = subprocess.run(
+    [sys.executable, '-X', 'importtime', '-c', script],
+    capture_output=True,
+    check=True,
+    env=env,
+    text=True,
+  )
+  import_us = {}
+  for line in process.stderr.splitlines():
+    fields = line.split('|')
+    # Modules imported by other modules are indented under them.
+    if (
+      len(fields) == 3
+      and fields[2].strip() in modules
+      and not fields[2][1:].startswith(' ')
+    ):
+      import_us[fields[2].strip()] = int(fields[1])
+  missing = set(modules) - set(import_us)
+  if missing:
+    raise RuntimeError(
+      f'{", ".join(sorted(missing))} missing from -X importtime:\n'
+      f'{process.stderr}'
+    )
+  return sum(import_us.values()), process.stdout.split()
+
+
+def measure_import(repeat: int = _DEFAULT_IMPORT_REPEAT) -> dict[str, Any]:
+  """Measures `import typed_input` in fresh interpreters.
+
+  Bytecode is compiled into a temporary cache by a first, untimed import, so
+  the timed imports measure loading rather than compiling, without writing
+  `__pycache__` directories next to the sources. The baseline imports are
+  timed alternately with typed_input, so both see the same machine load.
+
+  Args:
+    repeat: The number of timed imports of each. The fastest is reported.
+
+  Returns:
+    dict: The best cumulative import time in microseconds, the best of the
+      baseline imports, and the deferred modules the import loaded, which
+      should be none.
+  """
+  directory = os.path.dirname(os.path.abspath(__file__))
+  with tempfile.TemporaryDirectory() as cache:
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join(
+      filter(None, (directory, os.environ.get('PYTHONPATH')))
+    )
+    _, modules = _import_time(env, _IMPORT_SCRIPT, ('typed_input',))
+    import_us = baseline_us = sys.maxsize
+    for _ in range(repeat):
+      import_us = min(
+        import_us, _import_time(env, _IMPORT_SCRIPT, ('typed_input',))[0]
+      )
+      baseline_us = min(
+        baseline_us,
+        _import_time(env, _BASELINE_IMPORT_SCRIPT, _BASELINE_IMPORTS)[0],
+      )
+  return {
+    'import_us': import_us,
+    'baseline_us': baseline_us,
+    'deferred_modules_loaded': [
+      name for name in _DEFERRED_MODULES if name in modules
+    ],
+  }
+
+
+def run(
+  values: int = _DEFAULT_VALUES_PER_RUN,
+  repeat: int = _DEFAULT_REPEAT,
+  name_filter: str | None = None,
+) -> dict[str, Any]:
+  """Runs every benchmark case and returns the results as a JSON-able dict.
+
+  Args:
+    values: The number of accepted values per timed run.
+    repeat: The number of timed runs per case. The fastest run is reported.
+    name_filter: If provided, only cases whose name contains it are run.
+
+  Returns:
+    dict: The Python version, platform and, for each case, the best time per
+      accepted value in nanoseconds and the matching values per second.
+  """
+  runs: list[tuple[_Case | _BulkCase, float, Callable[..., float]]] = [
+    (case, invalid_rate, _time_case)
+    for case in _CASES
+    for invalid_rate in _INVALID_RATES
+  ]
+  runs.extend(
+    (case, invalid_rate, _time_bulk_case)
+    for case in _BULK_CASES
+    for invalid_rate in case.invalid_rates
+    if case.function is not _array_input or _numpy_installed()
+  )
+  results = {}
+  for case, invalid_rate, time_case in runs:
+    name = f'{case.name}/invalid_{invalid_rate:.0%}'
+    if name_filter and name_filter not in name:
+      continue
+    lines = _scripted_lines(case, invalid_rate, values, seed=0)
+    best = min(time_case(case, lines, values) for _ in range(repeat))
+    results[name] = {
+      'ns_per_value': round(best / values * 1e9, 1),
+      'values_per_second': round(values / best),
+      'lines_per_value': round(len(lines) / values, 3),
+    }
+  return {
+    'python': platform.python_version(),
+    'implementation': platform.python_implementation(),
+    'platform': platform.platform(),
+    'results': results,
+  }
+
+
+def compare(
+  current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+  """Returns a description of every case slower than its baseline.
+
+  A case, or the import measurement, missing from the baseline is reported
+  too, since it would otherwise never be checked. Re-save the baseline with
+  `--save` after adding a case.
+
+  Args:
+    current: Results returned by `run`.
+    baseline: Previously saved results returned by `run`.
+    threshold: The allowed slowdown, e.g. 0.25 allows up to 25% slower.
+
+  Returns:
+    list[str]: One line per regressed or missing case. Empty if there are
+      none.
+  """
+  regressions = []
+  if 'import' in current and 'import' not in baseline:
+    regressions.append('import typed_input: missing from the baseline')
+  for name, result in current['results'].items():
+    if name not in baseline['results']:
+      regressions.append(f'{name}: missing from the baseline')
+      continue
+    before = baseline['results'][name]['ns_per_value']
+    after = result['ns_per_value']
+    if after > before * (1 + threshold):
+      regressions.append(
+        f'{name}: {before} -> {after} ns/value ({after / before - 1:+.0%})'
+      )
+  return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--values', type=int, default=_DEFAULT_VALUES_PER_RUN)
+  parser.add_argument('--repeat', type=int, default=_DEFAULT_REPEAT)
+  parser.add_argument('--filter', help='Only run cases containing this.')
+  parser.add_argument('--save', help='Write the results to this JSON file.')
+  parser.add_argument('--compare', help='Compare against this JSON baseline.')
+  parser.add_argument('--threshold', type=float, default=_DEFAULT_THRESHOLD)
+  parser.add_argument(
+    '--import-budget',
+    type=float,
+    default=_DEFAULT_IMPORT_BUDGET,
+    help='Maximum time for import typed_input, as a multiple of the baseline.',
+  )
+  args = parser.parse_args(argv)
+  current = run(args.values, args.repeat, args.filter)
+  current['import'] = measure_import()
+  for name, result in current['results'].items():
+    print(
+      f'{name:<55} {result["ns_per_value"]:>12,.1f} ns/value '
+      f'{result["values_per_second"]:>12,} values/s'
+    )
+  import_us = current['import']['import_us']
+  baseline_us = current['import']['baseline_us']
+  deferred_modules_loaded = current['import']['deferred_modules_loaded']
+  print(f'{"import typed_input":<55} {import_us:>12,} us')
+  print(
+    f'{"import baseline: " + ", ".join(_BASELINE_IMPORTS):<55} '
+    f'{baseline_us:>12,} us'
+  )
+  status = 0
+  if import_us > baseline_us * args.import_budget:
+    print(
+      f'Regression: import typed_input: {import_us:,} us, budget '
+      f'{args.import_budget:g} x {baseline_us:,} us baseline'
+    )
+    status = 1
+  if deferred_modules_loaded:
+    print(
+      'Regression: import typed_input loads '
+      f'{", ".join(deferred_modules_loaded)}'
+    )
+    status = 1
+  if args.save:
+    with open(args.save, 'w') as f:
+      json.dump(current, f, indent=2)
+      f.write('\n')
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+    for regression in regressions:
+      print(f'Regression: {regression}')
+    if regressions:
+      status = 1
+  return status
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,114 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import typed_input_benchmark
+
+
+class TypedInputBenchmarkTest(unittest.TestCase):
+  def test_run_reports_every_case(self):
+    results = typed_input_benchmark.run(values=5, repeat=1)
+    self.assertIn('python', results)
+    self.assertIn('int_input/small/invalid_50%', results['results'])
+    self.assertIn('iter_datetime_input/invalid_10%', results['results'])
+    for result in results['results'].values():
+      self.assertGreater(result['ns_per_value'], 0)
+      self.assertGreaterEqual(result['lines_per_value'], 1)
+
+  def test_run_filter(self):
+    results = typed_input_benchmark.run(values=5, repeat=1, name_filter='huge')
+    self.assertEqual(
+      sorted(results['results']),
+      [
+        'int_input/huge/invalid_0%',
+        'int_input/huge/invalid_10%',
+        'int_input/huge/invalid_50%',
+      ],
+    )
+
+  def test_compare_reports_regressions_over_threshold(self):
+    baseline = {
+      'results': {'a': {'ns_per_value': 100.0}, 'b': {'ns_per_value': 100.0}}
+    }
+    current = {
+      'results': {
+        'a': {'ns_per_value': 120.0},
+        'b': {'ns_per_value': 150.0},
+        'c': {'ns_per_value': 1.0},
+      }
+    }
+    self.assertEqual(
+      typed_input_benchmark.compare(current, baseline, threshold=0.25),
+      [
+        'b: 100.0 -> 150.0 ns/value (+50%)',
+        'c: missing from the baseline',
+      ],
+    )
+
+  def test_compare_reports_missing_import_measurement(self):
+    baseline = {'results': {'a': {'ns_per_value': 100.0}}}
+    current = {
+      'results': {'a': {'ns_per_value': 100.0}},
+      'import': {
+        'import_us': 1000,
+        'baseline_us': 1000,
+        'deferred_modules_loaded': [],
+      },
+    }
+    self.assertEqual(
+      typed_input_benchmark.compare(current, baseline, threshold=0.25),
+      ['import typed_input: missing from the baseline'],
+    )
+
+  def test_import_loads_no_deferred_modules(self):
+    result = typed_input_benchmark.measure_import(repeat=1)
+    self.assertGreater(result['import_us'], 0)
+    self.assertGreater(result['baseline_us'], 0)
+    self.assertEqual(result['deferred_modules_loaded'], [])
+
+  def test_deferred_modules_are_imported_on_first_use(self):
+    script = (
+      'import sys, uuid, typed_input; '
+      'print(typed_input._spec_for_type(uuid.UUID).parse("0" * 32)); '
+      'print(typed_input.try_parse_int("1").value); '
+      'print(typed_input.DecimalSpec(places=2).parse("1.5")); '
+      'print(typed_input.DateTimeSpec().parse("2024-01-02T03:04Z"))'
+    )
+    process = subprocess.run(
+      [sys.executable, '-c', script],
+      capture_output=True,
+      check=True,
+      cwd=os.path.dirname(os.path.abspath(typed_input_benchmark.__file__)),
+      text=True,
+    )
+    self.assertEqual(
+      process.stdout,
+      '00000000-0000-0000-0000-000000000000\n1\n1.50\n'
+      '2024-01-02 03:04:00+00:00\n',
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_main_save_and_compare(self, mock_stdout):
+    with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'baseline.json')
+      args = ['--values', '5', '--repeat', '1', '--filter', 'float_input/b']
+      self.assertEqual(typed_input_benchmark.main([*args, '--save', path]), 0)
+      with open(path) as f:
+        self.assertEqual(len(json.load(f)['results']), 3)
+      self.assertEqual(
+        typed_input_benchmark.main(
+          [*args, '--compare', path, '--threshold', '1000']
+        ),
+        0,
+      )
+    self.assertIn('float_input/bounded/invalid_0%', mock_stdout.getvalue())
+    self.assertIn('import typed_input', mock_stdout.getvalue())
+
+
+if __name__ == '__main__':
+  unittest.main()
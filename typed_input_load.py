@@ -0,0 +1,402 @@
+"""A concurrent load harness of simulated users filling in typed_input forms.
+
+Each simulated user fills in a form (by default one `int_input`,
+`float_input`, `decimal_input` and `datetime_input` field) a number of times.
+Every attempt is a typo with probability `--typo-rate`, out of bounds with
+probability `--bounds-rate` and valid otherwise, and is preceded by a think
+time drawn from the chosen distribution. Users run as threads prompting
+through in-memory streams, or as asyncio clients of a `serve` socket server.
+
+The report gives the p50 and p99 prompt latency (from a line being entered to
+the program being ready for the next one), the retries per accepted value and
+the total throughput, so capacity can be measured before rollout.
+
+Usage:
+  python typed_input_load.py --users 200 --sessions 10
+  python typed_input_load.py --mode asyncio --users 1000 --think-time 0.5
+  python typed_input_load.py --typo-rate 0.2 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import math
+import random
+import sys
+import time
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import IO, Any, Callable, NamedTuple, cast
+
+import typed_input
+
+_MODES = ('threads', 'asyncio')
+_DISTRIBUTIONS = ('constant', 'exponential', 'uniform')
+_DEFAULT_USERS = 50
+_DEFAULT_SESSIONS = 20
+
+
+class LoadField(NamedTuple):
+  """One field of a load test form and how simulated users fill it in.
+
+  Attributes:
+    field: The prompt and its validation rules.
+    valid: Returns a valid line for the field.
+    out_of_bounds: Returns a line of the right type that violates the bounds,
+      or None if the field has no bounds to violate.
+  """
+
+  field: typed_input.FormField
+  valid: Callable[[random.Random], str]
+  out_of_bounds: Callable[[random.Random], str] | None = None
+
+
+def _price(rng: random.Random) -> str:
+  return f'{rng.randint(0, 9999)}.{rng.randint(1, 99):02d}'
+
+
+def _timestamp(rng: random.Random) -> str:
+  start = datetime(2020, 1, 1)
+  return (start + timedelta(seconds=rng.randint(0, 10**8))).isoformat()
+
+
+DEFAULT_FORM = (
+  LoadField(
+    typed_input.FormField(
+      'quantity', typed_input.IntSpec(min_value=1, max_value=1000), 'Quantity: '
+    ),
+    lambda rng: str(rng.randint(1, 1000)),
+    lambda rng: str(rng.randint(1001, 10**6)),
+  ),
+  LoadField(
+    typed_input.FormField(
+      'weight',
+      typed_input.FloatSpec(min_value=0.0, max_value=500.0),
+      'Weight: ',
+    ),
+    lambda rng: repr(rng.uniform(0.0, 500.0)),
+    lambda rng: repr(rng.uniform(-500.0, -0.001)),
+  ),
+  LoadField(
+    typed_input.FormField(
+      'price', typed_input.DecimalSpec(min_value=Decimal('0.01')), 'Price: '
+    ),
+    _price,
+    lambda rng: f'-{_price(rng)}',
+  ),
+  LoadField(
+    typed_input.FormField(
+      'taken_at',
+      typed_input.DateTimeSpec(min_value=datetime(2020, 1, 1)),
+      'Taken at: ',
+    ),
+    _timestamp,
+    lambda rng: f'19{rng.randint(10, 99)}-01-01',
+  ),
+)
+
+
+def think_time(
+  mean: float, distribution: str = 'exponential'
+) -> Callable[[random.Random], float]:
+  """Returns a function drawing think times, in seconds, from a distribution.
+
+  Args:
+    mean: The mean think time in seconds. Zero disables thinking.
+    distribution: 'constant', 'exponential' or 'uniform' (from 0 to twice
+      the mean).
+
+  Raises:
+    ValueError: If `mean` is negative or `distribution` is unknown.
+  """
+  if mean < 0:
+    raise ValueError(f'({mean=}) must not be negative.')
+  if distribution not in _DISTRIBUTIONS:
+    raise ValueError(f'Unknown think time distribution: {distribution!r}.')
+  if mean == 0:
+    return lambda rng: 0.0
+  if distribution == 'constant':
+    return lambda rng: mean
+  if distribution == 'uniform':
+    return lambda rng: rng.uniform(0.0, 2 * mean)
+  return lambda rng: rng.expovariate(1 / mean)
+
+
+class _User:
+  """The scripted behavior and measurements of one simulated user."""
+
+  def __init__(
+    self,
+    seed: int,
+    typo_rate: float,
+    bounds_rate: float,
+    think: Callable[[random.Random], float],
+  ) -> None:
+    self._rng = random.Random(seed)
+    self._typo_rate = typo_rate
+    self._bounds_rate = bounds_rate
+    self._think = think
+    self.latencies: list[float] = []
+    self.attempts = 0
+    self.accepted = 0
+
+  def think_time(self) -> float:
+    return self._think(self._rng)
+
+  def line(self, field: LoadField) -> str:
+    """Returns the next line the user enters for a field."""
+    self.attempts += 1
+    rng = self._rng
+    roll = rng.random()
+    if roll < self._typo_rate:
+      value = field.valid(rng)
+      index = rng.randint(0, len(value))
+      return f'{value[:index]}q{value[index:]}'
+    if roll < self._typo_rate + self._bounds_rate and field.out_of_bounds:
+      return field.out_of_bounds(rng)
+    return field.valid(rng)
+
+
+class _StreamUser:
+  """A simulated user prompted through its own stdin and stdout stream.
+
+  A latency is measured from a line being returned by `readline` to the
+  prompt reading the next line or returning the accepted value.
+  """
+
+  def __init__(self, user: _User) -> None:
+    self.user = user
+    self.field: LoadField | None = None
+    self._entered_at: float | None = None
+
+  def readline(self) -> str:
+    self._record_latency()
+    delay = self.user.think_time()
+    if delay:
+      time.sleep(delay)
+    assert self.field is not None
+    line = self.user.line(self.field)
+    self._entered_at = time.perf_counter()
+    return f'{line}\n'
+
+  def write(self, s: str) -> int:
+    return len(s)
+
+  def flush(self) -> None:
+    pass
+
+  def accept(self) -> None:
+    self._record_latency()
+    self.user.accepted += 1
+
+  def _record_latency(self) -> None:
+    if self._entered_at is not None:
+      self.user.latencies.append(time.perf_counter() - self._entered_at)
+      self._entered_at = None
+
+
+def _run_thread_user(
+  form: Sequence[LoadField], sessions: int, user: _User
+) -> _User:
+  user_stream = _StreamUser(user)
+  stream = cast(IO[str], user_stream)
+  for _ in range(sessions):
+    for field in form:
+      user_stream.field = field
+      field.field.spec.prompt(field.field.prompt, stdin=stream, stdout=stream)
+      user_stream.accept()
+  return user
+
+
+async def _read_response(
+  reader: asyncio.StreamReader, endings: tuple[bytes, ...]
+) -> bytes:
+  """Reads until the output ends with one of `endings`, or until EOF."""
+  response = b''
+  while not response or not response.endswith(endings):
+    chunk = await reader.read(1 << 12)
+    if not chunk:
+      break
+    response += chunk
+  return response
+
+
+async def _run_socket_user(
+  form: Sequence[LoadField], sessions: int, user: _User, port: int
+) -> _User:
+  prompts = [(field.field.prompt or '').encode() for field in form]
+  for _ in range(sessions):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await _read_response(reader, (prompts[0],))
+    for index, field in enumerate(form):
+      following = prompts[index + 1] if index + 1 < len(form) else b''
+      while True:
+        delay = user.think_time()
+        if delay:
+          await asyncio.sleep(delay)
+        writer.write(f'{user.line(field)}\n'.encode())
+        entered_at = time.perf_counter()
+        endings = (
+          (prompts[index], following) if following else (prompts[index],)
+        )
+        response = await _read_response(reader, endings)
+        user.latencies.append(time.perf_counter() - entered_at)
+        if response == following:
+          user.accepted += 1
+          break
+    writer.close()
+    await writer.wait_closed()
+  return user
+
+
+async def _run_socket_users(
+  form: Sequence[LoadField], sessions: int, users: list[_User]
+) -> None:
+  server = await typed_input.serve([field.field for field in form])
+  port = server.sockets[0].getsockname()[1]
+  async with server:
+    await asyncio.gather(
+      *(_run_socket_user(form, sessions, user, port) for user in users)
+    )
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+  """Returns the nearest-rank percentile of an already sorted list."""
+  if not sorted_values:
+    return 0.0
+  rank = max(math.ceil(fraction * len(sorted_values)), 1)
+  return sorted_values[rank - 1]
+
+
+def run(
+  users: int = _DEFAULT_USERS,
+  sessions: int = _DEFAULT_SESSIONS,
+  mode: str = 'threads',
+  typo_rate: float = 0.05,
+  bounds_rate: float = 0.05,
+  think: Callable[[random.Random], float] | None = None,
+  form: Sequence[LoadField] = DEFAULT_FORM,
+  seed: int = 0,
+) -> dict[str, Any]:
+  """Runs simulated users concurrently and returns the measurements.
+
+  Args:
+    users: The number of concurrent simulated users.
+    sessions: How many times each user fills in the form.
+    mode: 'threads' to run each user on a thread, prompting through in-memory
+      streams, or 'asyncio' to run each user as a client of a `serve` socket
+      server on the local machine.
+    typo_rate: The probability that an attempt is not of the field's type.
+    bounds_rate: The probability that an attempt is out of bounds.
+    think: Draws the think time before each attempt, e.g. from `think_time`.
+      Defaults to no think time, which measures peak throughput.
+    form: The fields of the form.
+    seed: Seeds the users' random choices, so runs are reproducible.
+
+  Returns:
+    dict: The configuration, 'accepted_values', 'attempts',
+      'retries_per_value', 'elapsed' seconds, 'values_per_second' and
+      'latency_ms' with the 'p50', 'p99' and 'max' prompt latency.
+
+  Raises:
+    ValueError: If `mode` is unknown, or the rates are not below 1 together.
+  """
+  if mode not in _MODES:
+    raise ValueError(f'Unknown mode: {mode!r}. Expected one of {_MODES}.')
+  if not 0 <= typo_rate + bounds_rate < 1 or min(typo_rate, bounds_rate) < 0:
+    raise ValueError(
+      f'({typo_rate=}) and ({bounds_rate=}) must be non-negative with a sum '
+      'below 1.'
+    )
+  if think is None:
+    think = think_time(0.0)
+  simulated = [
+    _User(seed + index, typo_rate, bounds_rate, think) for index in range(users)
+  ]
+  start = time.perf_counter()
+  if mode == 'threads':
+    with concurrent.futures.ThreadPoolExecutor(max_workers=users) as executor:
+      list(
+        executor.map(
+          lambda user: _run_thread_user(form, sessions, user), simulated
+        )
+      )
+  else:
+    asyncio.run(_run_socket_users(form, sessions, simulated))
+  elapsed = time.perf_counter() - start
+  latencies = sorted(
+    latency for user in simulated for latency in user.latencies
+  )
+  accepted = sum(user.accepted for user in simulated)
+  attempts = sum(user.attempts for user in simulated)
+  return {
+    'mode': mode,
+    'users': users,
+    'sessions': sessions,
+    'accepted_values': accepted,
+    'attempts': attempts,
+    'retries_per_value': round((attempts - accepted) / accepted, 4)
+    if accepted
+    else 0.0,
+    'elapsed': round(elapsed, 4),
+    'values_per_second': round(accepted / elapsed) if elapsed else 0,
+    'latency_ms': {
+      'p50': round(_percentile(latencies, 0.50) * 1e3, 4),
+      'p99': round(_percentile(latencies, 0.99) * 1e3, 4),
+      'max': round(_percentile(latencies, 1.0) * 1e3, 4),
+    },
+  }
+
+
+def main(argv: list[str] | None = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--users', type=int, default=_DEFAULT_USERS)
+  parser.add_argument('--sessions', type=int, default=_DEFAULT_SESSIONS)
+  parser.add_argument('--mode', choices=_MODES, default='threads')
+  parser.add_argument('--typo-rate', type=float, default=0.05)
+  parser.add_argument('--bounds-rate', type=float, default=0.05)
+  parser.add_argument(
+    '--think-time', type=float, default=0.0, help='Mean seconds per attempt.'
+  )
+  parser.add_argument(
+    '--distribution', choices=_DISTRIBUTIONS, default='exponential'
+  )
+  parser.add_argument('--seed', type=int, default=0)
+  parser.add_argument('--json', action='store_true', help='Print JSON.')
+  args = parser.parse_args(argv)
+  try:
+    report = run(
+      args.users,
+      args.sessions,
+      args.mode,
+      args.typo_rate,
+      args.bounds_rate,
+      think_time(args.think_time, args.distribution),
+      seed=args.seed,
+    )
+  except ValueError as e:
+    parser.error(str(e))
+  if args.json:
+    print(json.dumps(report, indent=2))
+    return 0
+  latency = report['latency_ms']
+  print(
+    f'{report["users"]} users x {report["sessions"]} sessions '
+    f'({report["mode"]}): {report["accepted_values"]:,} values in '
+    f'{report["elapsed"]:.2f}s'
+  )
+  print(f'throughput: {report["values_per_second"]:,} values/s')
+  print(f'retries per value: {report["retries_per_value"]:.3f}')
+  print(
+    f'prompt latency: p50 {latency["p50"]:.3f} ms, '
+    f'p99 {latency["p99"]:.3f} ms, max {latency["max"]:.3f} ms'
+  )
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
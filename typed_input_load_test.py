@@ -0,0 +1,102 @@
+import io
+import json
+import random
+import unittest
+from unittest import mock
+
+import typed_input
+import typed_input_load
+
+_FIELDS = len(typed_input_load.DEFAULT_FORM)
+
+
+class TypedInputLoadTest(unittest.TestCase):
+  def test_threads(self):
+    report = typed_input_load.run(users=4, sessions=3, typo_rate=0.2)
+    self.assertEqual(report['mode'], 'threads')
+    self.assertEqual(report['accepted_values'], 4 * 3 * _FIELDS)
+    self.assertGreater(report['attempts'], report['accepted_values'])
+    self.assertGreater(report['retries_per_value'], 0)
+    self.assertGreater(report['values_per_second'], 0)
+    latency = report['latency_ms']
+    self.assertLessEqual(latency['p50'], latency['p99'])
+    self.assertLessEqual(latency['p99'], latency['max'])
+
+  def test_asyncio_sockets(self):
+    report = typed_input_load.run(
+      users=5, sessions=2, mode='asyncio', bounds_rate=0.3
+    )
+    self.assertEqual(report['accepted_values'], 5 * 2 * _FIELDS)
+    self.assertGreater(report['retries_per_value'], 0)
+    self.assertGreater(report['latency_ms']['p50'], 0)
+
+  def test_no_retries_without_errors(self):
+    for mode in ('threads', 'asyncio'):
+      with self.subTest(mode=mode):
+        report = typed_input_load.run(
+          users=2, sessions=2, mode=mode, typo_rate=0, bounds_rate=0
+        )
+        self.assertEqual(report['attempts'], report['accepted_values'])
+        self.assertEqual(report['retries_per_value'], 0)
+
+  def test_generated_lines(self):
+    user = typed_input_load._User(0, 0.5, 0.5 - 1e-9, lambda rng: 0.0)
+    for field in typed_input_load.DEFAULT_FORM:
+      spec = field.field.spec
+      for _ in range(50):
+        with self.assertRaises(ValueError):
+          spec.parse(user.line(field))
+      rng = random.Random(0)
+      for _ in range(50):
+        spec.parse(field.valid(rng))
+
+  def test_think_time(self):
+    rng = random.Random(0)
+    self.assertEqual(typed_input_load.think_time(0.0)(rng), 0.0)
+    self.assertEqual(typed_input_load.think_time(2.0, 'constant')(rng), 2.0)
+    self.assertTrue(0 <= typed_input_load.think_time(1.0, 'uniform')(rng) <= 2)
+    self.assertGreaterEqual(typed_input_load.think_time(1.0)(rng), 0)
+    with self.assertRaises(ValueError):
+      typed_input_load.think_time(1.0, 'normal')
+    with self.assertRaises(ValueError):
+      typed_input_load.think_time(-1.0)
+
+  def test_think_time_sleeps(self):
+    with mock.patch('time.sleep') as mock_sleep:
+      typed_input_load.run(
+        users=1, sessions=1, think=typed_input_load.think_time(0.5, 'constant')
+      )
+    self.assertEqual(mock_sleep.call_count, _FIELDS)
+
+  def test_invalid_arguments(self):
+    with self.assertRaises(ValueError):
+      typed_input_load.run(mode='processes')
+    with self.assertRaises(ValueError):
+      typed_input_load.run(typo_rate=0.5, bounds_rate=0.5)
+
+  def test_custom_form(self):
+    form = [
+      typed_input_load.LoadField(
+        typed_input.FormField('n', typed_input.IntSpec(), 'N: '),
+        lambda rng: str(rng.randint(0, 9)),
+      )
+    ]
+    report = typed_input_load.run(users=2, sessions=3, form=form)
+    self.assertEqual(report['accepted_values'], 6)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_main(self, mock_stdout):
+    self.assertEqual(
+      typed_input_load.main(['--users', '2', '--sessions', '1', '--json']), 0
+    )
+    self.assertEqual(
+      json.loads(mock_stdout.getvalue())['accepted_values'], 2 * _FIELDS
+    )
+    mock_stdout.seek(0)
+    mock_stdout.truncate()
+    typed_input_load.main(['--users', '2', '--sessions', '1'])
+    self.assertIn('prompt latency: p50', mock_stdout.getvalue())
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,19 +1,63 @@
 import unittest
 
+import allowed_values_test
+import array_input_test
+import async_input_test
+import choice_input_test
+import console_scheduler_test
 import datetime_input_test
+import datetime_parser_test
 import decimal_input_test
+import decimal_places_test
 import float_input_test
+import input_hooks_test
+import input_spec_test
 import int_input_test
+import iter_input_test
+import record_input_test
+import serve_test
+import session_replay_test
+import stream_input_test
+import table_input_test
+import timeout_input_test
+import try_parse_test
+import type_registry_test
+import typed_input_benchmark_test
+import typed_input_load_test
+import validate_file_test
+import validators_test
 
 
 def main() -> None:
   loader = unittest.TestLoader()
   suite = unittest.TestSuite()
   for module in [
+    allowed_values_test,
+    array_input_test,
+    async_input_test,
+    choice_input_test,
+    console_scheduler_test,
     datetime_input_test,
+    datetime_parser_test,
     decimal_input_test,
+    decimal_places_test,
     int_input_test,
     float_input_test,
+    input_hooks_test,
+    input_spec_test,
+    iter_input_test,
+    record_input_test,
+    serve_test,
+    session_replay_test,
+    stream_input_test,
+    table_input_test,
+    timeout_input_test,
+    try_parse_test,
+    type_registry_test,
+    typed_input_benchmark_test,
+    typed_input_load_test,
+    validate_file_test,
+    validators_test,
   ]:
     suite.addTests(loader.loadTestsFromModule(module))
   runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,167 @@
+import io
+import mmap
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+import typed_input
+from typed_input import main, validate_file
+
+
+class ValidateFileTest(unittest.TestCase):
+  def setUp(self):
+    directory = tempfile.TemporaryDirectory()
+    self.addCleanup(directory.cleanup)
+    self.directory = directory.name
+
+  def _write(self, data: bytes) -> str:
+    path = os.path.join(self.directory, 'values.txt')
+    with open(path, 'wb') as f:
+      f.write(data)
+    return path
+
+  def test_valid_file(self):
+    result = validate_file(self._write(b'1\n2\n3\n'), int)
+    self.assertEqual(result.values, [1, 2, 3])
+    self.assertEqual(result.errors, [])
+    self.assertEqual(result.line_count, 3)
+    self.assertTrue(result.ok)
+
+  def test_errors_reported_by_line_number(self):
+    result = validate_file(self._write(b'1\nabc\n-1\r\n4'), int, min_value=0)
+    self.assertEqual(result.values, [1, 4])
+    self.assertEqual(
+      result.errors,
+      [
+        (2, 'Error: You must enter a valid integer.'),
+        (3, 'Error: Value must be at least 0.'),
+      ],
+    )
+    self.assertEqual(result.error_count, 2)
+    self.assertEqual(result.line_count, 4)
+    self.assertFalse(result.ok)
+
+  def test_max_errors_and_keep_values(self):
+    result = validate_file(
+      self._write(b'x\n' * 10 + b'1\n'), float, max_errors=3, keep_values=False
+    )
+    self.assertEqual([line for line, _ in result.errors], [1, 2, 3])
+    self.assertEqual(result.error_count, 10)
+    self.assertEqual(result.values, [])
+
+  def test_default_value_and_other_types(self):
+    path = self._write(b'1.5\n\n')
+    self.assertEqual(
+      validate_file(path, Decimal, default_value=Decimal(0)).values,
+      [Decimal('1.5'), Decimal(0)],
+    )
+    self.assertEqual(
+      validate_file(self._write(b'2023-11-15\n'), datetime).values,
+      [datetime(2023, 11, 15)],
+    )
+
+  def test_int_and_float_lines_parsed_from_bytes(self):
+    path = self._write(b' 7 \r\n\n\xff\n8')
+    result = validate_file(path, int, default_value=0)
+    self.assertEqual(result.values, [7, 0, 8])
+    self.assertEqual(
+      result.errors, [(3, 'Error: You must enter a valid integer.')]
+    )
+    self.assertEqual(validate_file(path, float).error_count, 2)
+
+  def test_undecodable_lines_reported_as_errors(self):
+    path = self._write(b'1.5\n\xff\xfe\n2\n')
+    result = validate_file(path, Decimal)
+    self.assertEqual(result.values, [Decimal('1.5'), Decimal(2)])
+    self.assertEqual(
+      result.errors, [(2, 'Error: You must enter a valid Decimal.')]
+    )
+    result = validate_file(self._write(b'2023-11-15\n\xff\n'), datetime)
+    self.assertEqual(result.values, [datetime(2023, 11, 15)])
+    self.assertEqual([line for line, _ in result.errors], [2])
+
+  @mock.patch.object(typed_input, '_MIN_PARALLEL_CHUNK_SIZE', 64)
+  def test_parallel_matches_serial(self):
+    lines = [str(i) if i % 37 else 'x' for i in range(2000)]
+    lines[500] = '-5'
+    path = self._write('\n'.join(lines).encode())
+    serial = validate_file(path, int, min_value=0, max_errors=None)
+    parallel = validate_file(path, int, min_value=0, max_errors=None, workers=3)
+    self.assertEqual(parallel, serial)
+    self.assertIn((501, 'Error: Value must be at least 0.'), parallel.errors)
+
+  @mock.patch.object(typed_input, '_MIN_PARALLEL_CHUNK_SIZE', 16)
+  def test_parallel_max_errors_and_datetime(self):
+    path = self._write(b'2023-11-15T10:00:00Z\nbad\n' * 50)
+    result = validate_file(path, datetime, max_errors=5, workers=2)
+    self.assertEqual([line for line, _ in result.errors], [2, 4, 6, 8, 10])
+    self.assertEqual(result.error_count, 50)
+    self.assertEqual(result.line_count, 100)
+    self.assertEqual(len(result.values), 50)
+
+  @mock.patch.object(typed_input, '_MIN_PARALLEL_CHUNK_SIZE', 1)
+  def test_newline_aligned_chunks(self):
+    data = b'12\n3456\n7\n89\n'
+    with open(self._write(data), 'rb') as f:
+      mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with mapped:
+      self.assertEqual(
+        typed_input._newline_aligned_chunks(mapped, None), [(0, 13)]
+      )
+      chunks = typed_input._newline_aligned_chunks(mapped, 2)
+    self.assertEqual(chunks, [(0, 3), (3, 8), (8, 10), (10, 13)])
+
+  def test_empty_file(self):
+    result = validate_file(self._write(b''), int)
+    self.assertEqual(result, ([], [], 0, 0))
+
+  def test_unsupported_type(self):
+    with self.assertRaises(TypeError):
+      validate_file(self._write(b'1\n'), str)
+
+  def test_error_raised_when_min_value_greater_than_max_value(self):
+    with self.assertRaises(ValueError):
+      validate_file(self._write(b'1\n'), int, min_value=2, max_value=1)
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_cli_check(self, mock_stdout):
+    path = self._write(b'5\n50\nabc\n')
+    self.assertEqual(main(['check', path, '--type', 'int', '--max', '10']), 1)
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      f'{path}:2: Error: Value must be at most 10.\n'
+      f'{path}:3: Error: You must enter a valid integer.\n'
+      f'{path}: 3 lines, 2 errors.\n',
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_cli_check_undecodable_line(self, mock_stdout):
+    path = self._write(b'1.5\n\xff\n')
+    self.assertEqual(main(['check', path, '--type', 'decimal']), 1)
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      f'{path}:2: Error: You must enter a valid Decimal.\n'
+      f'{path}: 2 lines, 1 errors.\n',
+    )
+
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_cli_check_valid_file(self, mock_stdout):
+    path = self._write(b'2023-11-15\n\n')
+    self.assertEqual(
+      main(['check', path, '--type', 'datetime', '--default', '2023-01-01']),
+      0,
+    )
+    self.assertEqual(mock_stdout.getvalue(), f'{path}: 2 lines, 0 errors.\n')
+
+  @mock.patch('sys.stderr', new_callable=io.StringIO)
+  def test_cli_invalid_bound(self, mock_stderr):
+    with self.assertRaises(SystemExit):
+      main(['check', 'unused', '--min', 'abc'])
+    self.assertIn('You must enter a valid integer', mock_stderr.getvalue())
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,186 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+try:
+  import numpy
+except ImportError:
+  numpy = None  # type: ignore[assignment]
+
+import typed_input
+from typed_input import (
+  DateTimeSpec,
+  DecimalSpec,
+  InputEventKind,
+  IntSpec,
+  Validator,
+  int_array_input,
+  int_input,
+  validate_file,
+)
+
+
+def _is_even(value: int) -> bool:
+  return value % 2 == 0
+
+
+_EVEN = Validator(_is_even, 'Error: Value must be even.')
+
+
+class ValidatorsTest(unittest.TestCase):
+  def setUp(self):
+    self.calls = []
+
+  def _validator(self, name, check, cost, **kwargs):
+    def recorded_check(value):
+      self.calls.append(name)
+      return check(value)
+
+    return Validator(recorded_check, f'Error: Failed {name}.', cost, **kwargs)
+
+  def test_run_cheapest_first_and_stop_at_first_failure(self):
+    spec = IntSpec(
+      validators=[
+        self._validator('expensive', lambda value: value != 15, cost=10),
+        self._validator('cheap', lambda value: value % 5 == 0, cost=1),
+      ]
+    )
+    self.assertEqual([v.cost for v in spec.validators], [1, 10])
+    with self.assertRaises(ValueError) as context:
+      spec.parse('7')
+    self.assertEqual(str(context.exception), 'Error: Failed cheap.')
+    self.assertEqual(self.calls, ['cheap'])
+    with self.assertRaises(ValueError) as context:
+      spec.parse('15')
+    self.assertEqual(str(context.exception), 'Error: Failed expensive.')
+    self.assertEqual(spec.parse('20'), 20)
+    self.assertEqual(
+      self.calls, ['cheap', 'cheap', 'expensive', 'cheap', 'expensive']
+    )
+
+  def test_equal_costs_keep_their_order(self):
+    spec = IntSpec(
+      validators=[
+        self._validator('first', bool, cost=1),
+        self._validator('second', bool, cost=1),
+      ]
+    )
+    spec.parse('1')
+    self.assertEqual(self.calls, ['first', 'second'])
+
+  def test_not_run_for_invalid_or_out_of_bounds_input(self):
+    spec = IntSpec(
+      max_value=10, validators=[self._validator('check', bool, cost=1)]
+    )
+    for user_input in ('abc', '11'):
+      with self.subTest(user_input=user_input), self.assertRaises(ValueError):
+        spec.parse(user_input)
+    self.assertEqual(self.calls, [])
+
+  def test_default_value_must_pass(self):
+    with self.assertRaises(ValueError) as context:
+      IntSpec(default_value=3, validators=[_EVEN])
+    self.assertEqual(
+      str(context.exception),
+      '(default_value=3) fails: Error: Value must be even.',
+    )
+
+  def test_parse_bytes(self):
+    spec = IntSpec(validators=[_EVEN])
+    self.assertEqual(spec.parse_bytes(b'4\n'), 4)
+    with self.assertRaises(ValueError):
+      spec.parse_bytes(b'5\n')
+
+  def test_business_days_and_decimal_scale(self):
+    business_day = Validator(
+      lambda value: value.weekday() < 5, 'Error: Enter a business day.'
+    )
+    with self.assertRaises(ValueError) as context:
+      DateTimeSpec(validators=[business_day]).parse('2024-01-06')
+    self.assertEqual(str(context.exception), 'Error: Enter a business day.')
+    cents = Validator(
+      lambda value: value.as_tuple().exponent >= -2,
+      'Error: Enter at most 2 decimal places.',
+    )
+    spec = DecimalSpec(validators=[cents])
+    self.assertEqual(spec.parse('1.25'), Decimal('1.25'))
+    with self.assertRaises(ValueError):
+      spec.parse('1.255')
+
+  @mock.patch('builtins.input', side_effect=['3', '4'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_int_input(self, mock_stdout, unused_mock_input):
+    self.assertEqual(int_input(validators=[_EVEN]), 4)
+    self.assertEqual(mock_stdout.getvalue(), 'Error: Value must be even.\n')
+
+  def test_typed_input(self):
+    weekday = Validator(lambda value: value.weekday() < 5, 'Error: Weekday.')
+    value = typed_input.typed_input(
+      date,
+      validators=[weekday],
+      stdin=io.StringIO('2024-01-06\n2024-01-08\n'),
+      stdout=io.StringIO(),
+    )
+    self.assertEqual(value, date(2024, 1, 8))
+
+  def test_hooks_report_validator_bound(self):
+    events = []
+    typed_input.add_input_hook(events.append)
+    self.addCleanup(typed_input.remove_input_hook, events.append)
+    int_input(
+      validators=[_EVEN], stdin=io.StringIO('3\n4\n'), stdout=io.StringIO()
+    )
+    bounds_events = [
+      event for event in events if event.kind is InputEventKind.BOUNDS_VIOLATED
+    ]
+    self.assertEqual([event.bound for event in bounds_events], ['validator'])
+
+  def test_validate_file_in_parallel(self):
+    with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'values.txt')
+      with open(path, 'wb') as f:
+        f.write(b'2\n3\n4\n' * 100)
+      with mock.patch.object(typed_input, '_MIN_PARALLEL_CHUNK_SIZE', 64):
+        result = validate_file(path, int, validators=[_EVEN], workers=2)
+    self.assertEqual(result.error_count, 100)
+    self.assertEqual(result.errors[0], (2, 'Error: Value must be even.'))
+    self.assertEqual(len(result.values), 200)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class ArrayValidatorsTest(unittest.TestCase):
+  def test_vectorized_validator_replaces_check(self):
+    check = mock.Mock(return_value=True)
+    multiple_of_5 = Validator(
+      check, 'Error: Not a multiple of 5.', vectorized=lambda a: a % 5 == 0
+    )
+    array = int_array_input(
+      stdin=io.StringIO('5 10\n15\n'), validators=[multiple_of_5]
+    )
+    self.assertEqual(array.tolist(), [5, 10, 15])
+    check.assert_not_called()
+    with self.assertRaises(ValueError) as context:
+      int_array_input(
+        stdin=io.StringIO('5 10\n16\n'), validators=[multiple_of_5]
+      )
+    self.assertEqual(
+      str(context.exception),
+      'Line 2: Error: Value fails: Not a multiple of 5.',
+    )
+
+  @mock.patch('builtins.input', side_effect=['2 3', '2 4'])
+  @mock.patch('sys.stdout', new_callable=io.StringIO)
+  def test_per_element_check(self, mock_stdout, unused_mock_input):
+    self.assertEqual(int_array_input(validators=[_EVEN]).tolist(), [2, 4])
+    self.assertEqual(
+      mock_stdout.getvalue(),
+      'Error: Value at position 2 fails: Value must be even.\n',
+    )
+
+
+if __name__ == '__main__':
+  unittest.main()